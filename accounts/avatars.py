@@ -0,0 +1,163 @@
+"""
+Avatar processing.
+
+Uploads are header-checked in the request, stored as-is and handed to the
+process_avatar task, which decodes them, strips metadata (EXIF, GPS, ICC)
+and renders a fixed set of square WebP and JPEG variants under
+content-hashed names. Once processed, `Profile.avatar` points at the
+largest JPEG variant and the original is deleted. The API only ever links
+to variants, so an unprocessed upload is never served.
+"""
+
+import hashlib
+import io
+import logging
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.db import transaction
+from PIL import Image, ImageOps, UnidentifiedImageError
+from .models import Profile
+
+logger = logging.getLogger(__name__)
+
+AVATAR_SIZES = (64, 128, 256)
+AVATAR_FORMATS = {"webp": "WEBP", "jpeg": "JPEG"}
+AVATAR_QUALITY = 82
+# Pillow formats accepted as uploads
+ACCEPTED_FORMATS = ("JPEG", "PNG", "WEBP", "GIF")
+
+
+class InvalidAvatar(Exception):
+    pass
+
+
+def _open(source):
+    """Parses the image header only; pixels are not decoded."""
+    max_pixels = getattr(settings, "AVATAR_MAX_PIXELS", 40_000_000)
+    try:
+        image = Image.open(source, formats=ACCEPTED_FORMATS)
+    except (UnidentifiedImageError, Image.DecompressionBombError, OSError) as exc:
+        raise InvalidAvatar("Unsupported image.") from exc
+    if image.width * image.height > max_pixels:
+        raise InvalidAvatar("Image is too large.")
+    return image
+
+
+def check_upload(upload):
+    """
+    Cheap request-time check that an upload is an accepted image format.
+    Raises InvalidAvatar otherwise.
+    """
+    try:
+        _open(upload)
+    finally:
+        upload.seek(0)
+
+
+def _decode(source):
+    image = _open(source)
+    try:
+        image.load()
+    except (Image.DecompressionBombError, OSError) as exc:
+        raise InvalidAvatar(str(exc)) from exc
+    # Apply the camera orientation before the EXIF block is dropped
+    return ImageOps.exif_transpose(image)
+
+
+def _encode(image, fmt):
+    if fmt == "JPEG" and image.mode != "RGB":
+        background = Image.new("RGB", image.size, "white")
+        background.paste(image, mask=image.getchannel("A"))
+        image = background
+    buffer = io.BytesIO()
+    # Nothing is copied from the source except pixels, so no metadata survives
+    image.save(buffer, fmt, quality=AVATAR_QUALITY, optimize=True)
+    return buffer.getvalue()
+
+
+def render_variants(source):
+    """
+    Returns {(size, ext): bytes} for every avatar variant of an image file.
+    Raises InvalidAvatar if the file can't be decoded as an image.
+    """
+    image = _decode(source).convert("RGBA")
+    variants = {}
+    for size in AVATAR_SIZES:
+        square = ImageOps.fit(image, (size, size), Image.Resampling.LANCZOS)
+        for ext, fmt in AVATAR_FORMATS.items():
+            variants[size, ext] = _encode(square, fmt)
+    return variants
+
+
+def store_variant(profile_id, data, ext):
+    """
+    Saves a variant under its content hash. Names are scoped to the profile,
+    so a re-upload of the same image reuses the file and no other profile
+    can share it.
+    """
+    name = f"avatars/{profile_id}/{hashlib.sha256(data).hexdigest()[:32]}.{ext}"
+    if not default_storage.exists(name):
+        name = default_storage.save(name, ContentFile(data))
+    return name
+
+
+def process_avatar(profile_id, name):
+    """
+    Renders the variants of the upload `name` for a profile and deletes the
+    ones it replaces. An undecodable upload is discarded and the previous
+    avatar restored. Does nothing if the profile has moved on to another
+    avatar in the meantime.
+    """
+    try:
+        with default_storage.open(name) as source:
+            variants = render_variants(source)
+    except FileNotFoundError:
+        return
+    except InvalidAvatar as exc:
+        logger.warning("Rejected avatar %s of profile %s: %s", name, profile_id, exc)
+        variants = None
+
+    stored = {}
+    for (size, ext), data in (variants or {}).items():
+        stored.setdefault(str(size), {})[ext] = store_variant(profile_id, data, ext)
+
+    with transaction.atomic():
+        profile = Profile.objects.select_for_update().filter(pk=profile_id).first()
+        if profile is None or profile.avatar.name != name:
+            return
+        previous = profile.avatar_variants
+        if variants is not None:
+            profile.avatar_variants = stored
+        profile.avatar = largest_variant(profile.avatar_variants)
+        profile.save(update_fields=["avatar", "avatar_variants"])
+
+    default_storage.delete(name)
+    if variants is not None:
+        for stale in _variant_names(previous) - _variant_names(stored):
+            default_storage.delete(stale)
+
+
+def _variant_names(variants):
+    return {name for names in variants.values() for name in names.values()}
+
+
+def largest_variant(variants):
+    """Name of the largest JPEG variant, or None when there are none."""
+    if not variants:
+        return None
+    return variants[max(variants, key=int)]["jpeg"]
+
+
+def variant_urls(profile, request=None):
+    """Lists a profile's avatar variants as absolute URLs, smallest first."""
+    urls = []
+    for size, names in sorted(
+        profile.avatar_variants.items(), key=lambda item: int(item[0])
+    ):
+        entry = {"size": int(size)}
+        for ext, name in names.items():
+            url = default_storage.url(name)
+            entry[ext] = request.build_absolute_uri(url) if request else url
+        urls.append(entry)
+    return urls
@@ -0,0 +1,37 @@
+from django.conf import settings
+from django.core.cache import cache
+from common.cache import bump_version_on_commit, versioned_key
+
+
+def _user_version_key(user_id):
+    return f"accounts:user-version:{user_id}"
+
+
+def _user_key(user_id):
+    return versioned_key("auth-user", _user_version_key(user_id), user_id)
+
+
+def get_user(user_id):
+    """
+    Returns the user (with profile) for an authenticated request from the
+    shared cache, loading it on a miss. Returns None if it doesn't exist.
+    """
+    from .models import User
+
+    key = _user_key(user_id)
+    user = cache.get(key)
+    if user is None:
+        user = User.objects.select_related("profile").filter(pk=user_id).first()
+        if user is not None:
+            timeout = getattr(settings, "AUTH_USER_CACHE_TIMEOUT", 5 * 60)
+            cache.set(key, user, timeout=timeout)
+    return user
+
+
+def invalidate_user(user_id):
+    """
+    Drops the cached user, e.g. after a password, permission or profile
+    change or a logout. Bumps again on commit, so a request that re-caches
+    the user from pre-commit rows in between doesn't keep them cached.
+    """
+    bump_version_on_commit(_user_version_key(user_id))
@@ -0,0 +1,20 @@
+from django.core.management.base import BaseCommand
+from accounts.models import Profile
+from accounts.tasks import process_avatar
+
+
+class Command(BaseCommand):
+    help = "Queue variant processing for avatars that have none yet"
+
+    def handle(self, *args, **kwargs):
+        pending = (
+            Profile.objects.exclude(avatar="")
+            .exclude(avatar__isnull=True)
+            .filter(avatar_variants={})
+            .values_list("pk", "avatar")
+        )
+        count = 0
+        for pk, name in pending.iterator():
+            process_avatar.delay(pk, name)
+            count += 1
+        self.stdout.write(self.style.SUCCESS(f"Queued {count} avatars."))
@@ -29,6 +29,8 @@ class Profile(UUIDModel):
         "accounts.User", on_delete=models.CASCADE, related_name="profile"
     )
     avatar = models.ImageField(upload_to="avatars/", blank=True, null=True)
+    # {"<size>": {"webp": name, "jpeg": name}}, filled in by accounts.avatars
+    avatar_variants = models.JSONField(default=dict, blank=True, editable=False)
     bio = models.TextField(blank=True, null=True)
 
     def __str__(self):
@@ -1,27 +1,66 @@
-import requests
+import re
 from django.conf import settings
 from django.contrib.auth import get_user_model
 from django.contrib.auth.tokens import PasswordResetTokenGenerator
-from django.core.mail import send_mail
-from django.db import transaction
+from django.db import IntegrityError, transaction
 from django.utils.encoding import force_str, smart_bytes
 from django.utils.http import urlsafe_base64_decode, urlsafe_base64_encode
+from drf_spectacular.utils import extend_schema_field
 from rest_framework import serializers
+from rest_framework_simplejwt import serializers as jwt_serializers
+from notifications.outbox import queue_email
 
 try:
     from google.oauth2 import id_token as google_id_token
 except Exception:  # keep tests patchable even if google lib not installed
     google_id_token = None
 
+from . import services
+from . import avatars
 from .models import Profile
+from .tasks import process_avatar
+from .tokens import CachedRefreshToken
 
 User = get_user_model()
 
 
+def validate_avatar_upload(value):
+    max_size = getattr(settings, "AVATAR_MAX_UPLOAD_SIZE", 10 * 1024 * 1024)
+    if value.size > max_size:
+        raise serializers.ValidationError("Avatar file is too large.")
+    try:
+        avatars.check_upload(value)
+    except avatars.InvalidAvatar as exc:
+        raise serializers.ValidationError(str(exc))
+    return value
+
+
+class AvatarVariantSerializer(serializers.Serializer):
+    size = serializers.IntegerField()
+    webp = serializers.URLField()
+    jpeg = serializers.URLField()
+
+
 class ProfileSerializer(serializers.ModelSerializer):
+    avatar_variants = serializers.SerializerMethodField()
+
     class Meta:
         model = Profile
-        fields = ("avatar", "bio")
+        fields = ("avatar", "avatar_variants", "bio")
+
+    @extend_schema_field(AvatarVariantSerializer(many=True))
+    def get_avatar_variants(self, obj):
+        return avatars.variant_urls(obj, self.context.get("request"))
+
+    def to_representation(self, instance):
+        data = super().to_representation(instance)
+        # Link the processed JPEG, never an upload still awaiting processing
+        variants = data["avatar_variants"]
+        data["avatar"] = variants[-1]["jpeg"] if variants else None
+        return data
+
+    def validate_avatar(self, value):
+        return validate_avatar_upload(value)
 
     def to_internal_value(self, data):
         # If avatar is a string (e.g., a URL from a test or existing data),
@@ -46,7 +85,8 @@ class LoginResponseSerializer(serializers.Serializer):
 
 class UserMeSerializer(serializers.ModelSerializer):
     # --- WRITE FIELDS (Input from React) ---
-    avatar = serializers.ImageField(write_only=True, required=False)
+    # Decoded and validated by the avatar pipeline, not in the request
+    avatar = serializers.FileField(write_only=True, required=False)
     bio = serializers.CharField(write_only=True, required=False)
 
     # --- READ/WRITE FIELDS ---
@@ -66,6 +106,9 @@ class UserMeSerializer(serializers.ModelSerializer):
         )
         read_only_fields = ("email", "username")
 
+    def validate_avatar(self, value):
+        return validate_avatar_upload(value)
+
     @transaction.atomic
     def update(self, instance, validated_data):
         # 1. Pop the manual fields
@@ -80,13 +123,9 @@ class UserMeSerializer(serializers.ModelSerializer):
         profile = instance.profile
 
         # Handle flat fields first (priority)
-        if avatar_file:
-            profile.avatar = avatar_file
-        elif profile_data and "avatar" in profile_data:
-            # If it's a string (like in some tests), we might need to handle it,
-            # but ImageField might have already validated it if it's a file.
-            # For now, let's just assign it if it's there.
-            profile.avatar = profile_data["avatar"]
+        new_avatar = avatar_file or (profile_data or {}).get("avatar")
+        if new_avatar:
+            profile.avatar = new_avatar
 
         if bio_text is not None:
             profile.bio = bio_text
@@ -95,6 +134,10 @@ class UserMeSerializer(serializers.ModelSerializer):
 
         profile.save()
 
+        if new_avatar:
+            name = profile.avatar.name
+            transaction.on_commit(lambda: process_avatar.delay(profile.pk, name))
+
         return instance
 
 
@@ -143,7 +186,7 @@ class ForgotPasswordSerializer(serializers.Serializer):
         )
         from_email = getattr(settings, "DEFAULT_FROM_EMAIL", None)
 
-        send_mail(subject, message, from_email, [email], fail_silently=True)
+        queue_email(email, subject, message, from_email, dedup_key="password-reset")
 
 
 class ResetPasswordSerializer(serializers.Serializer):
@@ -194,18 +237,38 @@ class ChangePasswordSerializer(serializers.Serializer):
 
 def make_username_unique(username):
     """
-    Ensure the username is unique by appending a counter if necessary.
+    Ensure the username is unique by appending the lowest free counter.
+    Looks at every taken `<username><digits>` in one query.
     """
-    if not User.objects.filter(username=username).exists():
+    taken = set(
+        User.objects.filter(
+            username__regex=rf"^{re.escape(username)}[0-9]*$"
+        ).values_list("username", flat=True)
+    )
+    if username not in taken:
         return username
 
-    base_username = username
     counter = 1
-    while True:
-        new_username = f"{base_username}{counter}"
-        if not User.objects.filter(username=new_username).exists():
-            return new_username
+    while f"{username}{counter}" in taken:
         counter += 1
+    return f"{username}{counter}"
+
+
+def create_user_with_unique_username(username, attempts=5, **fields):
+    """
+    Creates a user under the first free variant of `username`. A concurrent
+    signup can claim the same variant between lookup and insert, in which
+    case the unique constraint fires and the next free variant is tried.
+    """
+    for _ in range(attempts - 1):
+        try:
+            with transaction.atomic():
+                return User.objects.create(
+                    username=make_username_unique(username), **fields
+                )
+        except IntegrityError:
+            continue
+    return User.objects.create(username=make_username_unique(username), **fields)
 
 
 class GoogleLoginSerializer(serializers.Serializer):
@@ -213,7 +276,6 @@ class GoogleLoginSerializer(serializers.Serializer):
 
     def validate(self, attrs):
         from google.oauth2 import id_token as google_id_token
-        from google.auth.transport import requests as google_requests
 
         token = attrs.get("id_token")
         client_id = getattr(settings, "GOOGLE_CLIENT_ID", None)
@@ -221,7 +283,7 @@ class GoogleLoginSerializer(serializers.Serializer):
         try:
             idinfo = google_id_token.verify_oauth2_token(
                 token,
-                google_requests.Request(),
+                services.CachingGoogleRequest(),
                 client_id,
             )
         except Exception:
@@ -249,15 +311,11 @@ class GoogleLoginSerializer(serializers.Serializer):
         if user:
             return user
 
-        username = email.split("@")[0]
-        username = make_username_unique(username)
-
         first_name = google_data.get("given_name", "")
         last_name = google_data.get("family_name", "")
 
-        # create() doesn't take "defaults=", only get_or_create() does
-        user = User.objects.create(
-            username=username,
+        user = create_user_with_unique_username(
+            email.split("@")[0],
             email=email,
             first_name=first_name,
             last_name=last_name,
@@ -271,11 +329,7 @@ class GithubLoginSerializer(serializers.Serializer):
     def validate(self, attrs):
         access_token = attrs.get("access_token")
 
-        user_resp = requests.get(
-            "https://api.github.com/user",
-            headers={"Authorization": f"Bearer {access_token}"},
-            timeout=10,
-        )
+        user_resp, emails_resp = services.github_get_user(access_token)
         if user_resp.status_code != 200:
             raise serializers.ValidationError("Invalid GitHub token")
 
@@ -289,11 +343,6 @@ class GithubLoginSerializer(serializers.Serializer):
 
         # get emails
         email = None
-        emails_resp = requests.get(
-            "https://api.github.com/user/emails",
-            headers={"Authorization": f"Bearer {access_token}"},
-            timeout=10,
-        )
         if emails_resp.status_code == 200:
             for item in emails_resp.json():
                 if item.get("primary") and item.get("verified"):
@@ -324,12 +373,16 @@ class GithubLoginSerializer(serializers.Serializer):
         if user:
             return user
 
-        username = make_username_unique(username_guess)
-
-        user = User.objects.create(
-            username=username,
+        user = create_user_with_unique_username(
+            username_guess,
             email=email,
             first_name=first_name,
             last_name=last_name,
         )
         return user
+
+
+class TokenRefreshSerializer(jwt_serializers.TokenRefreshSerializer):
+    """Token refresh with the cache-backed blacklist check."""
+
+    token_class = CachedRefreshToken
@@ -1,6 +1,36 @@
+import re
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlencode
+
 import requests
 from django.conf import settings
-from urllib.parse import urlencode
+from django.core.cache import cache
+from requests.adapters import HTTPAdapter
+
+OAUTH_TIMEOUT = 10
+GITHUB_API = "https://api.github.com"
+
+_MAX_AGE_RE = re.compile(r"max-age=(\d+)")
+
+
+def _build_session():
+    pool_size = getattr(settings, "OAUTH_HTTP_POOL_SIZE", 20)
+    adapter = HTTPAdapter(pool_connections=4, pool_maxsize=pool_size)
+    session = requests.Session()
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+# One keep-alive pool per process for every OAuth provider call, so logins
+# reuse TLS connections instead of opening fresh ones.
+oauth_session = _build_session()
+
+# Runs independent provider calls of a single login side by side.
+_executor = ThreadPoolExecutor(
+    max_workers=getattr(settings, "OAUTH_HTTP_WORKERS", 8),
+    thread_name_prefix="oauth",
+)
 
 
 def get_google_auth_url():
@@ -23,8 +53,8 @@ def google_get_access_token(code):
         "grant_type": "authorization_code",
         "redirect_uri": settings.GOOGLE_REDIRECT_URI,
     }
-    response = requests.post(
-        "https://oauth2.googleapis.com/token", data=data, timeout=10
+    response = oauth_session.post(
+        "https://oauth2.googleapis.com/token", data=data, timeout=OAUTH_TIMEOUT
     )
     response.raise_for_status()
     return response.json()
@@ -46,11 +76,70 @@ def github_get_access_token(code):
         "code": code,
         "redirect_uri": settings.GITHUB_REDIRECT_URI,
     }
-    response = requests.post(
+    response = oauth_session.post(
         "https://github.com/login/oauth/access_token",
         data=data,
         headers={"Accept": "application/json"},
-        timeout=10,
+        timeout=OAUTH_TIMEOUT,
     )
     response.raise_for_status()
     return response.json()
+
+
+def github_get_user(access_token):
+    """
+    Fetches GitHub's /user and /user/emails concurrently.
+    Returns the (user, emails) responses.
+    """
+    headers = {"Authorization": f"Bearer {access_token}"}
+    user, emails = (
+        _executor.submit(
+            oauth_session.get,
+            f"{GITHUB_API}{path}",
+            headers=headers,
+            timeout=OAUTH_TIMEOUT,
+        )
+        for path in ("/user", "/user/emails")
+    )
+    return user.result(), emails.result()
+
+
+class _CachedResponse:
+    """The slice of google.auth.transport.Response that token checks read."""
+
+    def __init__(self, status, headers, data):
+        self.status = status
+        self.headers = headers
+        self.data = data
+
+
+def _max_age(headers):
+    match = _MAX_AGE_RE.search(headers.get("cache-control", ""))
+    return int(match.group(1)) if match else 0
+
+
+class CachingGoogleRequest:
+    """
+    google-auth transport over the shared session that keeps GET responses
+    (Google's signing certificates) in the cache for as long as their
+    Cache-Control max-age allows, instead of refetching them on every login.
+    """
+
+    def __init__(self):
+        from google.auth.transport import requests as google_requests
+
+        self._request = google_requests.Request(session=oauth_session)
+
+    def __call__(self, url, method="GET", body=None, headers=None, **kwargs):
+        if method != "GET":
+            return self._request(url, method, body, headers, **kwargs)
+        cache_key = f"accounts:google-http:{url}"
+        cached = cache.get(cache_key)
+        if cached is not None:
+            return _CachedResponse(*cached)
+        response = self._request(url, method, body, headers, **kwargs)
+        headers = {k.lower(): v for k, v in response.headers.items()}
+        max_age = _max_age(headers)
+        if response.status == 200 and max_age:
+            cache.set(cache_key, (response.status, headers, response.data), max_age)
+        return response
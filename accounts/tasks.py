@@ -0,0 +1,47 @@
+from django.utils import timezone
+from rest_framework_simplejwt.token_blacklist.models import (
+    BlacklistedToken,
+    OutstandingToken,
+)
+from config.celery import app
+from . import avatars
+from .tokens import warm_blacklist
+
+PURGE_CHUNK_SIZE = 1000
+
+
+@app.task
+def purge_expired_tokens(chunk_size=PURGE_CHUNK_SIZE):
+    """
+    Deletes expired blacklisted and outstanding refresh tokens in chunks, so
+    no single statement holds locks on the whole table.
+    """
+    now = timezone.now()
+    deleted = 0
+    for model, expired in (
+        (BlacklistedToken, {"token__expires_at__lte": now}),
+        (OutstandingToken, {"expires_at__lte": now}),
+    ):
+        while True:
+            ids = list(
+                model.objects.filter(**expired).values_list("id", flat=True)[
+                    :chunk_size
+                ]
+            )
+            if not ids:
+                break
+            model.objects.filter(id__in=ids).delete()
+            deleted += len(ids)
+    return deleted
+
+
+@app.task
+def warm_token_blacklist():
+    """Refreshes the cached blacklisted-JTI set. Run periodically."""
+    warm_blacklist()
+
+
+@app.task(acks_late=True)
+def process_avatar(profile_id, name):
+    """Renders the avatar variants of an uploaded image."""
+    avatars.process_avatar(profile_id, name)
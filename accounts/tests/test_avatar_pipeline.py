@@ -0,0 +1,159 @@
+import io
+from unittest.mock import patch
+import pytest
+from django.core.files.storage import default_storage
+from django.core.files.uploadedfile import SimpleUploadedFile
+from PIL import Image
+from accounts.avatars import AVATAR_SIZES, process_avatar
+
+
+@pytest.fixture(autouse=True)
+def media_root(settings, tmp_path):
+    settings.MEDIA_ROOT = tmp_path
+    return tmp_path
+
+
+def _photo(size=(1200, 800), mode="RGB", fmt="JPEG"):
+    image = Image.new(mode, size, "red")
+    exif = Image.Exif()
+    exif[0x010F] = "PhoneMaker"  # Make
+    buffer = io.BytesIO()
+    image.save(buffer, fmt, exif=exif)
+    return buffer.getvalue()
+
+
+def _upload(profile, data, name="photo.jpg"):
+    profile.avatar = SimpleUploadedFile(name, data)
+    profile.save()
+    return profile.avatar.name
+
+
+@pytest.mark.django_db
+def test_process_avatar_renders_stripped_square_variants(user):
+    profile = user.profile
+    original = _upload(profile, _photo())
+
+    process_avatar(profile.pk, original)
+
+    profile.refresh_from_db()
+    assert sorted(profile.avatar_variants) == sorted(str(s) for s in AVATAR_SIZES)
+    for size, names in profile.avatar_variants.items():
+        assert set(names) == {"webp", "jpeg"}
+        for name in names.values():
+            with default_storage.open(name) as f:
+                image = Image.open(f)
+                assert image.size == (int(size), int(size))
+                assert not image.getexif()
+    assert profile.avatar.name == profile.avatar_variants["256"]["jpeg"]
+    assert not default_storage.exists(original)
+
+
+@pytest.mark.django_db
+def test_reupload_reuses_identical_variants(user):
+    profile = user.profile
+    data = _photo(mode="RGBA", fmt="PNG")
+    process_avatar(profile.pk, _upload(profile, data, "a.png"))
+    profile.refresh_from_db()
+    first = profile.avatar_variants
+
+    process_avatar(profile.pk, _upload(profile, data, "b.png"))
+    profile.refresh_from_db()
+
+    assert profile.avatar_variants == first
+    assert all(default_storage.exists(n) for n in first["64"].values())
+
+
+@pytest.mark.django_db
+def test_new_avatar_deletes_replaced_variants(user):
+    profile = user.profile
+    process_avatar(profile.pk, _upload(profile, _photo()))
+    profile.refresh_from_db()
+    old = profile.avatar_variants
+
+    process_avatar(profile.pk, _upload(profile, _photo(mode="L")))
+    profile.refresh_from_db()
+
+    assert profile.avatar_variants != old
+    assert not any(default_storage.exists(n) for n in old["64"].values())
+
+
+@pytest.mark.django_db
+def test_invalid_upload_is_discarded_and_previous_avatar_kept(user):
+    profile = user.profile
+    process_avatar(profile.pk, _upload(profile, _photo()))
+    profile.refresh_from_db()
+    previous = profile.avatar_variants
+    original = _upload(profile, b"not an image", "photo.jpg")
+
+    process_avatar(profile.pk, original)
+
+    profile.refresh_from_db()
+    assert profile.avatar_variants == previous
+    assert profile.avatar.name == previous["256"]["jpeg"]
+    assert not default_storage.exists(original)
+
+
+@pytest.mark.django_db
+def test_me_rejects_non_image_upload(api_client, user):
+    api_client.force_authenticate(user=user)
+    upload = SimpleUploadedFile(
+        "x.jpg", b"<html><script>alert(1)</script></html>", content_type="image/jpeg"
+    )
+
+    with patch("accounts.serializers.process_avatar.delay") as delay:
+        resp = api_client.patch("/api/v1/me/", {"avatar": upload})
+
+    assert resp.status_code == 400
+    assert "avatar" in resp.data
+    delay.assert_not_called()
+
+
+@pytest.mark.django_db
+def test_superseded_upload_is_left_alone(user):
+    profile = user.profile
+    first = _upload(profile, _photo())
+    second = _upload(profile, _photo(size=(300, 300)))
+
+    process_avatar(profile.pk, first)
+
+    profile.refresh_from_db()
+    assert profile.avatar.name == second
+    assert profile.avatar_variants == {}
+
+
+@pytest.mark.django_db
+def test_me_upload_queues_processing_and_returns_variant_urls(
+    api_client, user, django_capture_on_commit_callbacks
+):
+    api_client.force_authenticate(user=user)
+    upload = SimpleUploadedFile("me.jpg", _photo(), content_type="image/jpeg")
+
+    with patch("accounts.serializers.process_avatar.delay") as delay:
+        with django_capture_on_commit_callbacks(execute=True):
+            resp = api_client.patch("/api/v1/me/", {"avatar": upload})
+    assert resp.status_code == 200
+    # The unprocessed upload is never linked
+    assert resp.data["profile"]["avatar"] is None
+    assert resp.data["profile"]["avatar_variants"] == []
+    delay.assert_called_once()
+
+    process_avatar(*delay.call_args.args)
+    user.profile.refresh_from_db()
+
+    variants = api_client.get("/api/v1/me/").data["profile"]["avatar_variants"]
+    assert [v["size"] for v in variants] == list(AVATAR_SIZES)
+    assert variants[0]["webp"].startswith("http://testserver/media/avatars/")
+    profile = api_client.get("/api/v1/me/").data["profile"]
+    assert profile["avatar"] == variants[-1]["jpeg"]
+
+
+@pytest.mark.django_db
+def test_process_avatars_command_queues_unprocessed(user):
+    from django.core.management import call_command
+
+    name = _upload(user.profile, _photo())
+
+    with patch("accounts.tasks.process_avatar.delay") as delay:
+        call_command("process_avatars", stdout=io.StringIO())
+
+    delay.assert_called_once_with(user.profile.pk, name)
@@ -0,0 +1,45 @@
+import pytest
+from rest_framework_simplejwt.tokens import RefreshToken
+
+
+@pytest.fixture
+def bearer(api_client, user):
+    refresh = RefreshToken.for_user(user)
+    api_client.credentials(HTTP_AUTHORIZATION=f"Bearer {refresh.access_token}")
+    return refresh
+
+
+@pytest.mark.django_db
+def test_authenticated_requests_resolve_user_from_cache(
+    api_client, user, bearer, django_assert_num_queries
+):
+    assert api_client.get("/api/v1/me/").status_code == 200
+
+    with django_assert_num_queries(0):
+        resp = api_client.get("/api/v1/me/")
+    assert resp.data["username"] == "dao"
+
+
+@pytest.mark.django_db
+def test_deactivation_takes_effect_immediately(api_client, user, bearer):
+    assert api_client.get("/api/v1/me/").status_code == 200
+
+    user.is_active = False
+    user.save()
+
+    assert api_client.get("/api/v1/me/").status_code == 401
+
+
+@pytest.mark.django_db
+def test_profile_change_and_logout_refresh_cached_user(
+    api_client, user, bearer, django_assert_num_queries
+):
+    api_client.get("/api/v1/me/")
+
+    user.profile.bio = "Hello"
+    user.profile.save()
+    assert api_client.get("/api/v1/me/").data["profile"]["bio"] == "Hello"
+
+    api_client.post("/api/v1/logout/", {"refresh": str(bearer)}, format="json")
+    with django_assert_num_queries(1):
+        api_client.get("/api/v1/me/")
@@ -1,15 +1,48 @@
+import json
+import time
 import pytest
+from common import health as health_probes
 
 
-@pytest.mark.django_db
-def test_health_ok(monkeypatch, api_client):
-    # patch redis.from_url
-    class FakeRedis:
-        def ping(self): ...
+class FakeRedis:
+    def __init__(self, heartbeat=None, depth=3, up=True):
+        self.values = {}
+        if heartbeat is not None:
+            self.values[health_probes.WORKER_HEARTBEAT_KEY] = json.dumps(heartbeat)
+        self.depth = depth
+        self.up = up
+        self.pings = 0
+
+    def ping(self):
+        self.pings += 1
+        if not self.up:
+            raise ConnectionError("down")
+
+    def llen(self, name):
+        return self.depth
+
+    def get(self, key):
+        return self.values.get(key)
+
+    def set(self, key, value, ex=None):
+        self.values[key] = value
+
 
-    import accounts.views as accounts_views
+@pytest.fixture
+def fake_redis(monkeypatch):
+    def install(**kwargs):
+        client = FakeRedis(**kwargs)
+        monkeypatch.setattr(health_probes, "redis_client", lambda: client)
+        return client
 
-    monkeypatch.setattr(accounts_views.redis, "from_url", lambda *a, **k: FakeRedis())
+    health_probes.reset_probe_cache()
+    yield install
+    health_probes.reset_probe_cache()
+
+
+@pytest.mark.django_db
+def test_health_ok(fake_redis, api_client):
+    fake_redis()
 
     resp = api_client.get("/api/v1/health/")
     assert resp.status_code == 200
@@ -17,3 +50,90 @@ def test_health_ok(monkeypatch, api_client):
     # at least both keys present
     assert "db" in resp.data
     assert "redis" in resp.data
+
+
+def test_liveness_touches_no_dependencies(fake_redis, api_client):
+    client = fake_redis()
+
+    resp = api_client.get("/api/v1/health/live/")
+    assert resp.status_code == 200
+    assert client.pings == 0
+
+
+@pytest.mark.django_db
+def test_readiness_reports_workers_and_caches_probes(fake_redis, api_client, user):
+    client = fake_redis()
+    user.is_staff = True
+    user.save()
+    api_client.force_authenticate(user=user)
+    health_probes.record_worker_heartbeat({"codeadventure-python:3.12": True}, client)
+
+    first = api_client.get("/api/v1/health/ready/")
+    second = api_client.get("/api/v1/health/ready/")
+
+    assert first.status_code == 200
+    assert first.data["status"] == "ok"
+    assert first.data["caches"] is True
+    assert first.data["queue_depth"] == 3
+    assert first.data["sandbox_images"] == {"codeadventure-python:3.12": True}
+    assert second.data == first.data
+    assert client.pings == 1
+
+
+@pytest.mark.django_db
+def test_readiness_degraded_on_stale_worker_or_missing_image(fake_redis, api_client):
+    fake_redis(heartbeat={"at": time.time() - 3600, "sandbox_images": {"i": True}})
+    assert api_client.get("/api/v1/health/ready/").data["status"] == "degraded"
+
+    health_probes.reset_probe_cache()
+    fake_redis(heartbeat={"at": time.time(), "sandbox_images": {"i": False}})
+    resp = api_client.get("/api/v1/health/ready/")
+    assert resp.status_code == 200
+    assert resp.data["status"] == "degraded"
+
+
+@pytest.mark.django_db
+def test_readiness_unavailable_without_redis(fake_redis, api_client):
+    fake_redis(up=False)
+
+    resp = api_client.get("/api/v1/health/ready/")
+    assert resp.status_code == 503
+    assert resp.data == {"status": "degraded", "ready": False}
+
+
+@pytest.mark.django_db
+def test_readiness_unavailable_without_caches(fake_redis, api_client, monkeypatch):
+    from django.core.cache import caches
+
+    fake_redis(heartbeat={"at": time.time(), "sandbox_images": {}})
+
+    def unreachable(*args, **kwargs):
+        raise ConnectionError("down")
+
+    monkeypatch.setattr(caches["throttle"], "set", unreachable)
+
+    assert api_client.get("/api/v1/health/ready/").status_code == 503
+
+
+@pytest.mark.django_db
+def test_readiness_details_are_staff_only(fake_redis, api_client, user):
+    fake_redis(heartbeat={"at": time.time(), "sandbox_images": {"i": True}})
+
+    assert api_client.get("/api/v1/health/ready/").data == {
+        "status": "ok",
+        "ready": True,
+    }
+    api_client.force_authenticate(user=user)
+    assert set(api_client.get("/api/v1/health/ready/").data) == {"status", "ready"}
+
+
+@pytest.mark.django_db
+def test_probes_are_not_throttled(fake_redis, api_client, monkeypatch):
+    from common.throttling import AnonRateThrottle
+
+    fake_redis()
+    monkeypatch.setattr(AnonRateThrottle, "THROTTLE_RATES", {"anon": "2/min"})
+
+    for url in ("/api/v1/health/live/", "/api/v1/health/ready/"):
+        codes = {api_client.get(url).status_code for _ in range(5)}
+        assert codes == {200}
@@ -1,5 +1,7 @@
 import pytest
 from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from accounts.cache import _user_key, get_user as get_cached_user
 from accounts.models import Profile
 
 User = get_user_model()
@@ -23,3 +25,20 @@ def test_profile_str():
     u = User.objects.create_user(username="dao3", password="x")
     p = u.profile
     assert "dao3" in str(p)
+
+
+@pytest.mark.django_db
+def test_user_recached_before_commit_is_dropped_on_commit(
+    django_capture_on_commit_callbacks,
+):
+    u = User.objects.create_user(username="dao4", password="x")
+
+    with django_capture_on_commit_callbacks(execute=True):
+        u.is_active = False
+        u.save()
+        # A concurrent request re-caches the user from pre-commit rows
+        stale = get_cached_user(u.pk)
+        stale.is_active = True
+        cache.set(_user_key(u.pk), stale)
+
+    assert get_cached_user(u.pk).is_active is False
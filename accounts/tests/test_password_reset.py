@@ -18,7 +18,7 @@ def test_forgot_password_always_200(api_client, user, settings):
         format="json",
     )
     assert resp.status_code == 200
-    # mail may or may not have been sent (fail_silently=True),
+    # the mail is sent later from the outbox,
     # but at least the view doesn't leak user existence.
 
 
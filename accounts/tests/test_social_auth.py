@@ -1,5 +1,10 @@
 import pytest
 from django.contrib.auth import get_user_model
+from accounts.serializers import (
+    create_user_with_unique_username,
+    make_username_unique,
+)
+from accounts.services import CachingGoogleRequest
 
 User = get_user_model()
 
@@ -66,9 +71,9 @@ def test_github_login_creates_user(monkeypatch, api_client):
 
         return R()
 
-    import accounts.serializers as accounts_serializers
+    from accounts import services
 
-    monkeypatch.setattr(accounts_serializers.requests, "get", fake_get)
+    monkeypatch.setattr(services.oauth_session, "get", fake_get)
 
     resp = api_client.post(
         "/api/v1/github/",
@@ -80,3 +85,67 @@ def test_github_login_creates_user(monkeypatch, api_client):
     assert resp.status_code == 200
     assert resp.data["user"]["email"] == "gh@example.com"
     assert User.objects.filter(email="gh@example.com").exists()
+
+
+def _fake_certs_transport(cache_control):
+    calls = []
+
+    class R:
+        status = 200
+        headers = {"Cache-Control": cache_control}
+        data = b'{"kid": "cert"}'
+
+    def fake_request(url, method="GET", body=None, headers=None, **kwargs):
+        calls.append(url)
+        return R()
+
+    return fake_request, calls
+
+
+def test_google_certs_cached_for_max_age():
+    request = CachingGoogleRequest()
+    request._request, calls = _fake_certs_transport("public, max-age=3600")
+
+    first = request("https://www.googleapis.com/oauth2/v1/certs")
+    second = request("https://www.googleapis.com/oauth2/v1/certs")
+
+    assert len(calls) == 1
+    assert second.status == 200
+    assert second.data == first.data
+
+
+def test_google_certs_refetched_without_max_age():
+    request = CachingGoogleRequest()
+    request._request, calls = _fake_certs_transport("no-cache")
+
+    request("https://www.googleapis.com/oauth2/v1/certs")
+    request("https://www.googleapis.com/oauth2/v1/certs")
+
+    assert len(calls) == 2
+
+
+@pytest.mark.django_db
+def test_make_username_unique_takes_lowest_free_counter(django_assert_num_queries):
+    for name in ("john", "john1", "john3", "johnny", "john.doe"):
+        User.objects.create(username=name)
+
+    with django_assert_num_queries(1):
+        assert make_username_unique("john") == "john2"
+    assert make_username_unique("john.d") == "john.d"
+
+
+@pytest.mark.django_db
+def test_create_user_retries_when_username_claimed_concurrently(monkeypatch):
+    import accounts.serializers as accounts_serializers
+
+    User.objects.create(username="student")
+    stale = iter(["student"])
+
+    def racing(username):
+        # First lookup ran before the competing signup committed
+        return next(stale, None) or make_username_unique(username)
+
+    monkeypatch.setattr(accounts_serializers, "make_username_unique", racing)
+
+    user = create_user_with_unique_username("student", email="s@example.com")
+    assert user.username == "student1"
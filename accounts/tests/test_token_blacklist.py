@@ -0,0 +1,81 @@
+from datetime import timedelta
+
+import pytest
+from django.core.cache import cache
+from django.utils import timezone
+from rest_framework_simplejwt.token_blacklist.models import (
+    BlacklistedToken,
+    OutstandingToken,
+)
+from rest_framework_simplejwt.tokens import RefreshToken
+from accounts.tasks import purge_expired_tokens
+from accounts.tokens import BLACKLIST_KEY, is_blacklisted, warm_blacklist
+
+
+@pytest.mark.django_db
+def test_rotated_refresh_token_is_rejected(api_client, user):
+    refresh = str(RefreshToken.for_user(user))
+
+    first = api_client.post("/api/v1/refresh/", {"refresh": refresh}, format="json")
+    assert first.status_code == 200
+    assert "refresh" in first.data
+
+    again = api_client.post("/api/v1/refresh/", {"refresh": refresh}, format="json")
+    assert again.status_code == 401
+
+
+@pytest.mark.django_db
+def test_warm_blacklist_answers_every_check_from_the_cache(
+    user, django_assert_num_queries, django_capture_on_commit_callbacks
+):
+    blacklisted = RefreshToken.for_user(user)
+    blacklisted.blacklist()
+    warm_blacklist()
+    later = RefreshToken.for_user(user)
+    with django_capture_on_commit_callbacks(execute=True):
+        later.blacklist()
+    fresh = RefreshToken.for_user(user)
+
+    with django_assert_num_queries(0):
+        assert is_blacklisted(blacklisted["jti"])
+        assert is_blacklisted(later["jti"])
+        assert not is_blacklisted(fresh["jti"])
+
+
+@pytest.mark.django_db
+def test_evicted_or_externally_blacklisted_tokens_stay_rejected(
+    user, django_assert_num_queries
+):
+    token = RefreshToken.for_user(user)
+    outstanding = OutstandingToken.objects.get(jti=token["jti"])
+    warm_blacklist()
+    # Blacklisted outside the token API, then the whole set is evicted.
+    BlacklistedToken.objects.create(token=outstanding)
+    cache.clear()
+
+    # Without the completeness marker the database decides.
+    with django_assert_num_queries(1):
+        assert is_blacklisted(token["jti"])
+    cache.set_add(BLACKLIST_KEY, "unrelated")
+    with django_assert_num_queries(1):
+        assert is_blacklisted(token["jti"])
+
+    warm_blacklist()
+    with django_assert_num_queries(0):
+        assert is_blacklisted(token["jti"])
+
+
+@pytest.mark.django_db
+def test_purge_expired_tokens_deletes_only_expired_rows(user):
+    now = timezone.now()
+    for i in range(5):
+        RefreshToken.for_user(user).blacklist()
+    live = RefreshToken.for_user(user)
+    OutstandingToken.objects.exclude(jti=live["jti"]).update(
+        expires_at=now - timedelta(minutes=1)
+    )
+
+    assert purge_expired_tokens(chunk_size=2) == 10
+
+    assert list(OutstandingToken.objects.values_list("jti", flat=True)) == [live["jti"]]
+    assert not BlacklistedToken.objects.exists()
@@ -0,0 +1,71 @@
+import datetime
+from django.core.cache import cache
+from django.db import transaction
+from django.utils import timezone
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.exceptions import TokenError
+from rest_framework_simplejwt.settings import api_settings
+from common.cache import cache_is_shared
+from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken
+from rest_framework_simplejwt.tokens import RefreshToken
+
+
+# Every blacklisted JTI, as one set in the shared cache. warm_blacklist()
+# builds it complete with the _COMPLETE member; the whole set is evicted as
+# one key, so while that member is present the set is authoritative.
+BLACKLIST_KEY = "jwt-blacklist"
+_COMPLETE = "*"
+# Allowed clock skew between the processes stamping blacklisted_at
+_WARM_OVERLAP = datetime.timedelta(minutes=1)
+
+
+def cache_blacklisted(jti):
+    """Adds a blacklisted JTI to the cached set once its row is committed."""
+    if cache_is_shared():
+        transaction.on_commit(lambda: cache.set_add(BLACKLIST_KEY, jti))
+
+
+def warm_blacklist():
+    """
+    Rebuilds the cached blacklist from the database and marks it complete,
+    dropping JTIs whose tokens have expired.
+    """
+    if not cache_is_shared():
+        return
+    started = timezone.now()
+    jtis = BlacklistedToken.objects.filter(token__expires_at__gt=started).values_list(
+        "token__jti", flat=True
+    )
+    cache.set_replace(BLACKLIST_KEY, [_COMPLETE, *jtis.iterator(chunk_size=2000)])
+    # JTIs committed during the rebuild may have been added to the set it
+    # replaced; add them again.
+    recent = BlacklistedToken.objects.filter(
+        blacklisted_at__gte=started - _WARM_OVERLAP
+    ).values_list("token__jti", flat=True)
+    if recent := list(recent):
+        cache.set_add(BLACKLIST_KEY, *recent)
+
+
+def is_blacklisted(jti):
+    """
+    Answers from the cached blacklist while it is complete, so the check
+    costs one cache round trip. Falls back to the database until
+    warm_blacklist() has rebuilt an evicted set.
+    """
+    if cache_is_shared():
+        listed, complete = cache.set_contains(BLACKLIST_KEY, jti, _COMPLETE)
+        if listed or complete:
+            return listed
+    return BlacklistedToken.objects.filter(token__jti=jti).exists()
+
+
+class CachedRefreshToken(RefreshToken):
+    """
+    A refresh token whose blacklist membership is checked against the cache
+    first. Blacklisting from any code path records the JTI in the cache via
+    the BlacklistedToken post_save signal.
+    """
+
+    def check_blacklist(self):
+        if is_blacklisted(self.payload[api_settings.JTI_CLAIM]):
+            raise TokenError(_("Token is blacklisted"))
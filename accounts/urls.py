@@ -3,6 +3,8 @@ from rest_framework_simplejwt.views import TokenRefreshView
 from .views import (
     MeView,
     health,
+    health_live,
+    health_ready,
     SafeLogoutView,
     ForgotPasswordView,
     ResetPasswordView,
@@ -20,6 +22,8 @@ urlpatterns = [
     path("refresh/", TokenRefreshView.as_view(), name="token_refresh"),
     path("me/", MeView.as_view(), name="me"),
     path("health/", health, name="health"),
+    path("health/live/", health_live, name="health_live"),
+    path("health/ready/", health_ready, name="health_ready"),
     path("password/change/", ChangePasswordView.as_view(), name="change_password"),
     path("password/forgot/", ForgotPasswordView.as_view(), name="forgot_password"),
     path("password/reset/", ResetPasswordView.as_view(), name="reset_password"),
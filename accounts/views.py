@@ -1,7 +1,8 @@
-import os
-import redis
-from django.db import connection
 from django.http import HttpResponseRedirect
+from common.health import readiness
+from common.throttling import UserRateThrottle
+from .cache import invalidate_user
+from .tokens import CachedRefreshToken
 from .serializers import (
     UserMeSerializer,
     RegisterSerializer,
@@ -12,12 +13,18 @@ from .serializers import (
     GithubLoginSerializer,
     LoginResponseSerializer,
 )
-from rest_framework import generics, status, throttling, serializers
+from rest_framework import generics, status, serializers
 from rest_framework.parsers import MultiPartParser, FormParser, JSONParser
 from rest_framework.views import APIView
 from rest_framework.response import Response
-from rest_framework.decorators import api_view, permission_classes
+from rest_framework.decorators import (
+    api_view,
+    authentication_classes,
+    permission_classes,
+    throttle_classes,
+)
 from rest_framework.permissions import AllowAny, IsAuthenticated
+from rest_framework_simplejwt.settings import api_settings
 from rest_framework_simplejwt.tokens import RefreshToken
 from rest_framework_simplejwt.exceptions import TokenError, InvalidToken
 from rest_framework_simplejwt.views import TokenObtainPairView
@@ -27,7 +34,7 @@ from drf_spectacular.types import OpenApiTypes
 
 
 # Throttle for login attempts
-class LoginRateThrottle(throttling.UserRateThrottle):
+class LoginRateThrottle(UserRateThrottle):
     scope = "login"
 
 
@@ -84,29 +91,52 @@ class LoginView(TokenObtainPairView):
 @api_view(["GET"])
 @permission_classes([AllowAny])
 def health(request):
-    ok_db = ok_redis = True
-    try:
-        with connection.cursor() as c:
-            c.execute("SELECT 1")
-    except Exception:
-        ok_db = False
-    try:
-        r = redis.from_url(
-            os.getenv("REDIS_URL", "redis://localhost:6379/0"), socket_timeout=1.5
-        )
-        r.ping()
-    except Exception:
-        ok_redis = False
+    report = readiness()
     data = {
-        "status": "ok" if (ok_db and ok_redis) else "degraded",
-        "db": ok_db,
-        "redis": ok_redis,
+        "status": "ok" if report["ready"] else "degraded",
+        "db": report["db"],
+        "redis": report["redis"],
     }
     resp = Response(data, status=status.HTTP_200_OK)
     resp["Cache-Control"] = "public, max-age=5"
     return resp
 
 
+@extend_schema(
+    tags=["Auth"],
+    responses={200: OpenApiTypes.OBJECT},
+    summary="Liveness check",
+    description="Returns 200 as long as the process can serve requests. Touches no dependencies.",
+)
+@api_view(["GET"])
+@permission_classes([AllowAny])
+@authentication_classes([])
+@throttle_classes([])
+def health_live(request):
+    return Response({"status": "ok"})
+
+
+@extend_schema(
+    tags=["Auth"],
+    responses={200: OpenApiTypes.OBJECT, 503: OpenApiTypes.OBJECT},
+    summary="Readiness check",
+    description="Checks Database, Redis and cache connectivity, Celery queue depth, worker heartbeat age and sandbox image availability. Returns 503 when the Database, Redis or a cache is unreachable; 'status' is 'degraded' when anything else looks wrong. Only staff users get the full report; everyone else gets 'status' and 'ready'. Results are cached for a few seconds.",
+)
+@api_view(["GET"])
+@permission_classes([AllowAny])
+@throttle_classes([])
+def health_ready(request):
+    report = readiness()
+    code = (
+        status.HTTP_200_OK if report["ready"] else status.HTTP_503_SERVICE_UNAVAILABLE
+    )
+    if not request.user.is_staff:
+        report = {"status": report["status"], "ready": report["ready"]}
+    resp = Response(report, status=code)
+    resp["Cache-Control"] = "no-store"
+    return resp
+
+
 class RegisterView(generics.CreateAPIView):
     serializer_class = RegisterSerializer
     permission_classes = [AllowAny]
@@ -184,9 +214,10 @@ class SafeLogoutView(APIView):
                 {"detail": "Missing 'refresh'."}, status=status.HTTP_400_BAD_REQUEST
             )
         try:
-            token = RefreshToken(refresh)
+            token = CachedRefreshToken(refresh)
             token.blacklist()
-        except (InvalidToken, TokenError):
+            invalidate_user(token[api_settings.USER_ID_CLAIM])
+        except (InvalidToken, TokenError, KeyError):
             # Treat as already logged out / invalid -> still succeed
             pass
         return Response(status=status.HTTP_205_RESET_CONTENT)
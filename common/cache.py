@@ -0,0 +1,200 @@
+import threading
+import time
+import weakref
+from collections import OrderedDict
+from django.conf import settings
+from django.core.cache import cache, caches
+from django.core.exceptions import ImproperlyConfigured
+from django.db import transaction
+from django.utils.connection import ConnectionProxy
+
+# Named caches (see CACHES). Version counters stay in the default cache, so
+# bumping one invalidates entries stored under its versions in any cache.
+content_cache = ConnectionProxy(caches, "content")
+throttle_cache = ConnectionProxy(caches, "throttle")
+
+
+def _initial_version():
+    """
+    Seed versions from the clock so a flushed cache never reissues a version
+    number that clients (or other processes) may still hold.
+    """
+    return int(time.time() * 1000)
+
+
+def get_version(key):
+    """Returns the current value of a shared version counter."""
+    version = cache.get(key)
+    if version is None:
+        cache.add(key, _initial_version(), timeout=None)
+        version = cache.get(key)
+    return version
+
+
+def bump_version(key):
+    """
+    Increments a shared version counter, invalidating every cache entry
+    that embeds it in its key.
+    """
+    try:
+        return cache.incr(key)
+    except ValueError:
+        # Key missing (first bump or evicted): start a fresh counter.
+        cache.add(key, _initial_version(), timeout=None)
+        return cache.incr(key)
+
+
+def bump_version_on_commit(key):
+    """
+    Bumps a version counter now and again once the current transaction
+    commits, so an entry re-cached from pre-commit rows by a concurrent
+    reader doesn't survive under the new version.
+    """
+    bump_version(key)
+    transaction.on_commit(lambda: bump_version(key))
+
+
+def cache_is_shared():
+    """
+    Whether the default cache is shared by every web and worker process.
+    Single-process runs such as the tests may vouch for a process-local cache
+    with REQUIRE_SHARED_CACHE = False.
+    """
+    if getattr(cache, "shared", False):
+        return True
+    return not getattr(settings, "REQUIRE_SHARED_CACHE", True)
+
+
+def versioned_key(prefix, version_key, *parts):
+    """Builds a cache key of the form '<prefix>:<parts...>:v<version>'."""
+    version = get_version(version_key)
+    return ":".join([prefix, *map(str, parts), f"v{version}"])
+
+
+# Every VersionedLRUCache in this process, for clear_local_caches().
+_local_caches = weakref.WeakSet()
+
+
+def clear_local_caches():
+    """Empties every process-local cache (used between tests)."""
+    for local_cache in list(_local_caches):
+        local_cache.clear()
+
+
+class VersionedLRUCache:
+    """
+    A small process-local LRU cache with per-entry TTL.
+
+    Entries are tagged with the shared version counter `version_key` at the
+    time they were stored and are discarded once that counter moves on, so a
+    bump_version() anywhere invalidates every process's copy.
+    """
+
+    def __init__(self, version_key, maxsize=1024, ttl=300):
+        self.version_key = version_key
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+        _local_caches.add(self)
+
+    def get_or_set(self, key, loader):
+        """
+        Returns the cached value for `key`, calling `loader()` on a miss.
+        A None result is returned but not cached.
+        """
+        # Read the version before loading so a concurrent bump can't get a
+        # stale value tagged with the new version.
+        version = get_version(self.version_key)
+        now = time.monotonic()
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is not None:
+                value, entry_version, expires_at = entry
+                if entry_version == version and expires_at > now:
+                    self._data.move_to_end(key)
+                    return value
+                del self._data[key]
+
+        value = loader()
+        if value is not None:
+            with self._lock:
+                self._data[key] = (value, version, now + self.ttl)
+                self._data.move_to_end(key)
+                while len(self._data) > self.maxsize:
+                    self._data.popitem(last=False)
+        return value
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+
+class WriteBehindBuffer:
+    """
+    An ordered buffer of picklable items kept in the shared cache, for work
+    that can be persisted in batches after the request has returned.
+
+    append() is one atomic push, so an item is never visible half-written.
+    drain() hands buffered items to a handler in order and releases them once
+    it returns; the handler must be idempotent, since a crash between the two
+    redelivers the batch.
+
+    The default cache must be shared by every web and worker process (see
+    check_backend()); a process-local cache would strand items in the process
+    that appended them.
+    """
+
+    def __init__(self, name, timeout=7 * 24 * 60 * 60, lock_timeout=5 * 60):
+        self.name = name
+        self.timeout = timeout
+        self.lock_timeout = lock_timeout
+
+    def _key(self, suffix):
+        return f"{self.name}:{suffix}"
+
+    def check_backend(self):
+        """
+        Raises ImproperlyConfigured unless the default cache supports the list
+        operations and is shared between processes (see cache_is_shared()).
+        """
+        if not hasattr(cache, "push"):
+            raise ImproperlyConfigured(
+                f"{self.name}: the default cache backend has no list operations; "
+                "use a backend from common.cache_backends."
+            )
+        if not cache_is_shared():
+            raise ImproperlyConfigured(
+                f"{self.name}: the default cache is process-local, so web and "
+                "worker processes would not see each other's buffered items. "
+                "Configure a shared cache such as Redis."
+            )
+
+    def append(self, item):
+        """Buffers `item`. Returns the number of items now pending."""
+        return cache.push(self._key("items"), item, timeout=self.timeout)
+
+    def drain(self, handler, batch_size=500):
+        """
+        Passes buffered items to `handler(items)` in batches of at most
+        `batch_size`. Returns the number of items drained, or 0 when another
+        drain is already running.
+        """
+        lock_key = self._key("lock")
+        if not cache.add(lock_key, 1, timeout=self.lock_timeout):
+            return 0
+        try:
+            return self._drain(handler, batch_size)
+        finally:
+            cache.delete(lock_key)
+
+    def _drain(self, handler, batch_size):
+        # Appends only grow the tail and the lock keeps this the only drain,
+        # so trimming len(items) removes exactly the items handled.
+        key = self._key("items")
+        drained = 0
+        while items := cache.peek(key, batch_size):
+            handler(items)
+            cache.trim(key, len(items))
+            drained += len(items)
+        return drained
@@ -0,0 +1,178 @@
+"""
+Cache backends that count hits and misses per cache.
+
+Counters are per process. cache_metrics() reports them, keyed by each
+cache's METRICS_NAME (defaulting to its KEY_PREFIX).
+
+The backends also offer atomic list operations (push, peek, trim) for
+common.cache.WriteBehindBuffer and set operations (set_add, set_contains,
+set_replace) on sets of strings. `shared` tells whether the stored data is
+visible to other processes.
+"""
+
+import threading
+from collections import defaultdict
+from contextlib import contextmanager
+from django.core.cache.backends import locmem, redis
+from django.core.cache.backends.base import DEFAULT_TIMEOUT
+
+_lock = threading.Lock()
+_counters = defaultdict(lambda: {"hits": 0, "misses": 0})
+_missing = object()
+
+
+def _record(name, hits, misses):
+    with _lock:
+        counter = _counters[name]
+        counter["hits"] += hits
+        counter["misses"] += misses
+
+
+def cache_metrics():
+    """Returns {cache name: {"hits", "misses", "hit_rate"}} for this process."""
+    with _lock:
+        snapshot = {name: dict(counter) for name, counter in _counters.items()}
+    for counter in snapshot.values():
+        lookups = counter["hits"] + counter["misses"]
+        counter["hit_rate"] = round(counter["hits"] / lookups, 3) if lookups else None
+    return snapshot
+
+
+def reset_cache_metrics():
+    with _lock:
+        _counters.clear()
+
+
+class CacheMetricsMixin:
+    # Backend instances are per thread, so plain attributes are safe here.
+    _uncounted = 0
+
+    def __init__(self, location, params):
+        super().__init__(location, params)
+        self.metrics_name = params.get("METRICS_NAME") or self.key_prefix or "default"
+
+    @contextmanager
+    def _without_counting(self):
+        # Base implementations of the bulk methods call get() internally
+        self._uncounted += 1
+        try:
+            yield
+        finally:
+            self._uncounted -= 1
+
+    def _count(self, hits, misses):
+        if not self._uncounted:
+            _record(self.metrics_name, hits, misses)
+
+    def get(self, key, default=None, version=None):
+        value = super().get(key, _missing, version)
+        hit = value is not _missing
+        self._count(int(hit), int(not hit))
+        return value if hit else default
+
+    def get_many(self, keys, version=None):
+        keys = list(keys)
+        with self._without_counting():
+            found = super().get_many(keys, version)
+        self._count(len(found), len(keys) - len(found))
+        return found
+
+    def get_or_set(self, key, default, timeout=DEFAULT_TIMEOUT, version=None):
+        value = self.get(key, _missing, version)
+        if value is not _missing:
+            return value
+        with self._without_counting():
+            return super().get_or_set(key, default, timeout, version)
+
+
+class RedisCache(CacheMetricsMixin, redis.RedisCache):
+    shared = True
+
+    def _raw_client(self, key, version):
+        # Always the primary: a replica may lag behind the writes
+        key = self.make_and_validate_key(key, version=version)
+        return key, self._cache.get_client(key, write=True)
+
+    def push(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        """Appends `value` to the list at `key`. Returns the new length."""
+        key, client = self._raw_client(key, version)
+        timeout = self.get_backend_timeout(timeout)
+        pipe = client.pipeline()
+        pipe.rpush(key, self._cache._serializer.dumps(value))
+        if timeout is not None:
+            pipe.expire(key, timeout)
+        return pipe.execute()[0]
+
+    def peek(self, key, count, version=None):
+        """Returns up to `count` values from the head of the list at `key`."""
+        key, client = self._raw_client(key, version)
+        values = client.lrange(key, 0, count - 1)
+        return [self._cache._serializer.loads(value) for value in values]
+
+    def trim(self, key, count, version=None):
+        """Removes `count` values from the head of the list at `key`."""
+        key, client = self._raw_client(key, version)
+        client.ltrim(key, count, -1)
+
+    def set_add(self, key, *members, version=None):
+        """Adds string `members` to the set at `key`, creating it if needed."""
+        key, client = self._raw_client(key, version)
+        client.sadd(key, *members)
+
+    def set_contains(self, key, *members, version=None):
+        """Returns a membership flag per member of the set at `key`."""
+        key, client = self._raw_client(key, version)
+        return [bool(flag) for flag in client.smismember(key, members)]
+
+    def set_replace(self, key, members, version=None):
+        """Atomically replaces the set at `key` with `members`."""
+        key, client = self._raw_client(key, version)
+        members = list(members)
+        pipe = client.pipeline(transaction=True)
+        pipe.delete(key)
+        for start in range(0, len(members), 1000):
+            pipe.sadd(key, *members[start : start + 1000])
+        pipe.execute()
+
+
+# Serializes the read-modify-write of LocMemCache's list and set operations
+_list_lock = threading.Lock()
+
+
+class LocMemCache(CacheMetricsMixin, locmem.LocMemCache):
+    # Per process: for tests and single-process development only
+    shared = False
+
+    def push(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        with _list_lock, self._without_counting():
+            values = self.get(key, [], version)
+            values.append(value)
+            self.set(key, values, timeout, version)
+            return len(values)
+
+    def peek(self, key, count, version=None):
+        with self._without_counting():
+            return self.get(key, [], version)[:count]
+
+    def trim(self, key, count, version=None):
+        with _list_lock, self._without_counting():
+            values = self.get(key, [], version)[count:]
+            if values:
+                self.set(key, values, self.default_timeout, version)
+            else:
+                self.delete(key, version)
+
+    def set_add(self, key, *members, version=None):
+        with _list_lock, self._without_counting():
+            values = self.get(key, set(), version)
+            values.update(members)
+            self.set(key, values, None, version)
+
+    def set_contains(self, key, *members, version=None):
+        with self._without_counting():
+            values = self.get(key, set(), version)
+        return [member in values for member in members]
+
+    def set_replace(self, key, members, version=None):
+        with _list_lock:
+            self.set(key, set(members), None, version)
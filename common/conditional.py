@@ -0,0 +1,36 @@
+import hashlib
+from django.utils.cache import (
+    get_conditional_response,
+    patch_cache_control,
+    patch_vary_headers,
+)
+from django.utils.http import http_date, quote_etag
+
+
+def make_etag(*parts):
+    """Builds a strong ETag from cheap version stamps."""
+    digest = hashlib.sha1(":".join(map(str, parts)).encode()).hexdigest()
+    return quote_etag(digest)
+
+
+def not_modified(request, etag, last_modified):
+    """
+    Evaluates If-None-Match / If-Modified-Since against the given validators.
+    Returns a 304 response when the client's copy is still fresh, else None.
+    """
+    response = get_conditional_response(
+        request, etag=etag, last_modified=int(last_modified)
+    )
+    if response is not None:
+        set_validators(response, etag, last_modified)
+    return response
+
+
+def set_validators(response, etag, last_modified):
+    response["ETag"] = etag
+    response["Last-Modified"] = http_date(int(last_modified))
+    # Payloads may include the caller's progress, so shared caches must not
+    # reuse them and clients must revalidate before each use.
+    patch_vary_headers(response, ["Authorization"])
+    patch_cache_control(response, private=True, no_cache=True)
+    return response
@@ -37,3 +37,14 @@ class QuestionType(models.TextChoices):
 
     SINGLE = "single", "Single"
     MULTI = "multi", "Multi"
+
+
+class EmailStatus(models.TextChoices):
+    """
+    Delivery states of notifications.OutboxEmail.
+    """
+
+    PENDING = "pending", "Pending"
+    SENDING = "sending", "Sending"
+    SENT = "sent", "Sent"
+    FAILED = "failed", "Failed"
@@ -0,0 +1,150 @@
+"""
+Dependency probes behind the health endpoints.
+
+Liveness does no I/O. Readiness checks the database, the broker Redis and a
+write/read round trip through every configured cache over pooled
+connections, reads the Celery queue depth plus the heartbeat that workers
+publish (see judge.tasks.worker_heartbeat), and carries this process's
+cache hit/miss counters. Results are kept in process for
+HEALTH_PROBE_CACHE_SECONDS, so frequent load balancer checks don't turn
+into a stream of dependency round trips.
+"""
+
+import json
+import threading
+import time
+import uuid
+import redis
+from django.conf import settings
+from django.core.cache import caches
+from django.db import connection
+from .cache_backends import cache_metrics
+
+WORKER_HEARTBEAT_KEY = "health:worker-heartbeat"
+
+_redis_pool = None
+_probe_lock = threading.Lock()
+_probe_result = None  # (expires_at, result)
+
+
+def redis_client():
+    """A Redis client over this process's shared connection pool."""
+    global _redis_pool
+    if _redis_pool is None:
+        _redis_pool = redis.ConnectionPool.from_url(
+            settings.CELERY_BROKER_URL, socket_timeout=1.5, socket_connect_timeout=1.5
+        )
+    return redis.Redis(connection_pool=_redis_pool)
+
+
+def check_db():
+    try:
+        with connection.cursor() as c:
+            c.execute("SELECT 1")
+    except Exception:
+        return False
+    return True
+
+
+def check_redis(client):
+    try:
+        client.ping()
+    except Exception:
+        return False
+    return True
+
+
+def check_caches():
+    """
+    Writes, reads back and deletes a value in every configured cache; auth,
+    throttling and sessions all depend on them.
+    """
+    token = uuid.uuid4().hex
+    try:
+        for alias in settings.CACHES:
+            cache = caches[alias]
+            cache.set("health:probe", token, timeout=10)
+            if cache.get("health:probe") != token:
+                return False
+            cache.delete("health:probe")
+    except Exception:
+        return False
+    return True
+
+
+def queue_depth(client):
+    """Messages waiting in the default Celery queue, or None if unknown."""
+    queue = getattr(settings, "CELERY_TASK_DEFAULT_QUEUE", "celery")
+    try:
+        return client.llen(queue)
+    except Exception:
+        return None
+
+
+def record_worker_heartbeat(sandbox_images, client=None):
+    """Publishes a worker heartbeat with the sandbox images it can see."""
+    client = client or redis_client()
+    payload = {"at": time.time(), "sandbox_images": sandbox_images}
+    max_age = getattr(settings, "WORKER_HEARTBEAT_MAX_AGE", 120)
+    client.set(WORKER_HEARTBEAT_KEY, json.dumps(payload), ex=max_age * 10)
+
+
+def worker_status(client):
+    """Returns (heartbeat age in seconds or None, {image: available})."""
+    try:
+        raw = client.get(WORKER_HEARTBEAT_KEY)
+    except Exception:
+        raw = None
+    if not raw:
+        return None, {}
+    payload = json.loads(raw)
+    return round(time.time() - payload["at"], 1), payload["sandbox_images"]
+
+
+def probe():
+    """Runs every readiness probe and returns the report."""
+    client = redis_client()
+    ok_db = check_db()
+    ok_redis = check_redis(client)
+    ok_caches = check_caches()
+    depth = queue_depth(client) if ok_redis else None
+    heartbeat_age, images = worker_status(client) if ok_redis else (None, {})
+
+    max_age = getattr(settings, "WORKER_HEARTBEAT_MAX_AGE", 120)
+    max_depth = getattr(settings, "HEALTH_MAX_QUEUE_DEPTH", 1000)
+    ready = ok_db and ok_redis and ok_caches
+    healthy = (
+        ready
+        and heartbeat_age is not None
+        and heartbeat_age <= max_age
+        and all(images.values())
+        and depth is not None
+        and depth <= max_depth
+    )
+    return {
+        "status": "ok" if healthy else "degraded",
+        "ready": ready,
+        "db": ok_db,
+        "redis": ok_redis,
+        "caches": ok_caches,
+        "queue_depth": depth,
+        "worker_heartbeat_age": heartbeat_age,
+        "sandbox_images": images,
+        "cache": cache_metrics(),
+    }
+
+
+def readiness():
+    """The readiness report, reused for HEALTH_PROBE_CACHE_SECONDS."""
+    global _probe_result
+    ttl = getattr(settings, "HEALTH_PROBE_CACHE_SECONDS", 5)
+    with _probe_lock:
+        if _probe_result is None or _probe_result[0] <= time.monotonic():
+            _probe_result = (time.monotonic() + ttl, probe())
+        return _probe_result[1]
+
+
+def reset_probe_cache():
+    global _probe_result
+    with _probe_lock:
+        _probe_result = None
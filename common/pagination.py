@@ -1,6 +1,256 @@
-from rest_framework.pagination import LimitOffsetPagination
+import base64
+import datetime
+import json
+from django.core.exceptions import FieldDoesNotExist, ValidationError
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import Q
+from django.utils import timezone
+from rest_framework.exceptions import NotFound
+from rest_framework.filters import OrderingFilter
+from rest_framework.pagination import BasePagination, LimitOffsetPagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
 
 
 class DefaultPagination(LimitOffsetPagination):
     default_limit = 20
     max_limit = 100
+
+
+class KeysetPagination(BasePagination):
+    """
+    Cursor pagination keyed on a stable (ordering field, id) tuple.
+
+    Each page is fetched with an indexed range condition instead of
+    COUNT(*) + OFFSET, so deep pages cost the same as the first one.
+    Use DefaultPagination where a total count is actually needed.
+
+    The ordering comes from the view's OrderingFilter (first field only),
+    then `view.keyset_ordering`, then `ordering` below. The ordering field
+    must be a non-nullable field of the model itself. Cursors record the
+    field they were built for and are rejected under any other ordering.
+    """
+
+    page_size = 20
+    max_page_size = 100
+    page_size_query_param = "limit"
+    cursor_query_param = "cursor"
+    ordering = "-created_at"
+    invalid_cursor_message = "Invalid cursor."
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.base_url = request.build_absolute_uri()
+        self.page_size = self.get_page_size(request)
+        self.field = self.get_ordering(request, queryset, view)
+        cursor = self.decode_cursor(request)
+        if cursor is not None:
+            cursor = self.validate_cursor(cursor, queryset.model)
+
+        descending = self.field.startswith("-")
+        name = self.field.lstrip("-")
+        sign = "-" if descending else ""
+        queryset = queryset.order_by(f"{sign}{name}", f"{sign}id")
+
+        forward = cursor is None or not cursor["reverse"]
+        if cursor is not None:
+            # Rows after the cursor in sort order, or before it when paging back.
+            op = "lt" if descending == forward else "gt"
+            if not forward:
+                queryset = queryset.reverse()
+            queryset = queryset.filter(
+                Q(**{f"{name}__{op}": cursor["value"]})
+                | Q(**{name: cursor["value"], f"id__{op}": cursor["id"]})
+            )
+
+        rows = list(queryset[: self.page_size + 1])
+        has_more = len(rows) > self.page_size
+        rows = rows[: self.page_size]
+        if not forward:
+            rows.reverse()
+
+        self.has_next = has_more if forward else True
+        self.has_previous = cursor is not None if forward else has_more
+        self.page = rows
+        return rows
+
+    def get_paginated_response(self, data):
+        return Response(
+            {
+                "next": self.get_next_link(),
+                "previous": self.get_previous_link(),
+                "results": data,
+            }
+        )
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            "type": "object",
+            "required": ["results"],
+            "properties": {
+                "next": {"type": "string", "nullable": True, "format": "uri"},
+                "previous": {"type": "string", "nullable": True, "format": "uri"},
+                "results": schema,
+            },
+        }
+
+    def get_schema_operation_parameters(self, view):
+        return [
+            {
+                "name": self.cursor_query_param,
+                "required": False,
+                "in": "query",
+                "description": "The pagination cursor value.",
+                "schema": {"type": "string"},
+            },
+            {
+                "name": self.page_size_query_param,
+                "required": False,
+                "in": "query",
+                "description": "Number of results to return per page.",
+                "schema": {"type": "integer"},
+            },
+        ]
+
+    def get_page_size(self, request):
+        try:
+            size = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+        return max(1, min(size, self.max_page_size))
+
+    def get_ordering(self, request, queryset, view):
+        default = getattr(view, "keyset_ordering", self.ordering)
+        for backend in getattr(view, "filter_backends", []):
+            if issubclass(backend, OrderingFilter):
+                ordering = backend().get_ordering(request, queryset, view)
+                if ordering and self.is_keyset_field(
+                    ordering[0], queryset.model, view, default
+                ):
+                    return ordering[0]
+        return default
+
+    def is_keyset_field(self, ordering, model, view, default):
+        """
+        Whether `ordering` may key the pages: one of the view's explicit
+        `ordering_fields` (or its default ordering) naming a concrete,
+        non-nullable, non-relation field that isn't the primary key.
+        """
+        name = ordering.lstrip("-")
+        allowed = getattr(view, "ordering_fields", None)
+        if not isinstance(allowed, (list, tuple)):
+            allowed = ()
+        if name not in {*allowed, default.lstrip("-")}:
+            return False
+        try:
+            field = model._meta.get_field(name)
+        except FieldDoesNotExist:
+            return False
+        return (
+            field.concrete
+            and not field.is_relation
+            and not field.primary_key
+            and not field.null
+        )
+
+    # Cursors
+
+    def get_next_link(self):
+        if not self.has_next or not self.page:
+            return None
+        return self.encode_cursor(self.page[-1], reverse=False)
+
+    def get_previous_link(self):
+        if not self.has_previous:
+            return None
+        if not self.page:
+            # Back to the first page; an empty cursor keeps keyset paging on.
+            return replace_query_param(self.base_url, self.cursor_query_param, "")
+        return self.encode_cursor(self.page[0], reverse=True)
+
+    def encode_cursor(self, obj, reverse):
+        value = getattr(obj, self.field.lstrip("-"))
+        if isinstance(value, (datetime.date, datetime.datetime)):
+            # Full precision: DjangoJSONEncoder truncates to milliseconds
+            value = value.isoformat()
+        payload = json.dumps(
+            {"f": self.field, "v": value, "id": str(obj.pk), "r": reverse},
+            cls=DjangoJSONEncoder,
+        )
+        token = base64.urlsafe_b64encode(payload.encode()).decode()
+        return replace_query_param(self.base_url, self.cursor_query_param, token)
+
+    def decode_cursor(self, request):
+        token = request.query_params.get(self.cursor_query_param)
+        if not token:
+            return None
+        try:
+            payload = json.loads(base64.urlsafe_b64decode(token.encode()))
+            return {
+                "field": payload["f"],
+                "value": payload["v"],
+                "id": payload["id"],
+                "reverse": bool(payload["r"]),
+            }
+        except (TypeError, ValueError, KeyError):
+            raise NotFound(self.invalid_cursor_message)
+
+    def validate_cursor(self, cursor, model):
+        """
+        Converts the cursor's value and id to the model's field types.
+        Raises NotFound for cursors built for another ordering or holding
+        values that don't fit the fields.
+        """
+        if cursor["field"] != self.field:
+            raise NotFound(self.invalid_cursor_message)
+        try:
+            field = model._meta.get_field(self.field.lstrip("-"))
+            value = field.to_python(cursor["value"])
+            pk = model._meta.pk.to_python(cursor["id"])
+        except (FieldDoesNotExist, ValidationError, TypeError, ValueError):
+            raise NotFound(self.invalid_cursor_message)
+        if value is None or pk is None:
+            raise NotFound(self.invalid_cursor_message)
+        if isinstance(value, datetime.datetime) and timezone.is_naive(value):
+            raise NotFound(self.invalid_cursor_message)
+        return {**cursor, "value": value, "id": pk}
+
+
+class OptionalKeysetPagination(DefaultPagination):
+    """
+    Limit/offset pagination with a total count, switching to KeysetPagination
+    for requests that carry a `cursor` parameter (empty for the first page).
+    """
+
+    keyset_class = KeysetPagination
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.keyset = None
+        if self.keyset_class.cursor_query_param in request.query_params:
+            self.keyset = self.keyset_class()
+            return self.keyset.paginate_queryset(queryset, request, view)
+        return super().paginate_queryset(queryset, request, view)
+
+    def get_paginated_response(self, data):
+        if self.keyset is not None:
+            return self.keyset.get_paginated_response(data)
+        return super().get_paginated_response(data)
+
+    def get_paginated_response_schema(self, schema):
+        response_schema = super().get_paginated_response_schema(schema)
+        # `count` is omitted in keyset mode
+        response_schema["required"] = ["results"]
+        return response_schema
+
+    def get_schema_operation_parameters(self, view):
+        return [
+            *super().get_schema_operation_parameters(view),
+            {
+                "name": self.keyset_class.cursor_query_param,
+                "required": False,
+                "in": "query",
+                "description": "Switches to keyset pagination without a count; "
+                "pass an empty value for the first page.",
+                "schema": {"type": "string"},
+            },
+        ]
@@ -0,0 +1,69 @@
+import pytest
+from django.core.cache import cache, caches
+from django.core.exceptions import ImproperlyConfigured
+from common.cache import WriteBehindBuffer, content_cache
+from common.cache_backends import cache_metrics, reset_cache_metrics
+
+
+@pytest.fixture(autouse=True)
+def fresh_metrics():
+    reset_cache_metrics()
+    yield
+    reset_cache_metrics()
+
+
+def test_named_caches_are_separate():
+    cache.set("key", "default")
+    content_cache.set("key", "content")
+
+    assert cache.get("key") == "default"
+    assert content_cache.get("key") == "content"
+    assert caches["throttle"].get("key") is None
+
+
+def test_hits_and_misses_are_counted_per_cache():
+    content_cache.get("missing")
+    content_cache.set("present", 1)
+    content_cache.get("present")
+    content_cache.get_many(["present", "missing"])
+    content_cache.get_or_set("computed", lambda: 2)
+
+    metrics = cache_metrics()
+    assert metrics["content"] == {"hits": 2, "misses": 3, "hit_rate": 0.4}
+    assert "throttle" not in metrics
+
+
+@pytest.mark.django_db
+def test_login_throttle_uses_shared_throttle_cache(api_client, monkeypatch):
+    from accounts.views import LoginRateThrottle
+
+    monkeypatch.setattr(LoginRateThrottle, "THROTTLE_RATES", {"login": "2/min"})
+    payload = {"username": "nobody", "password": "wrong"}
+
+    codes = [
+        api_client.post("/api/v1/login/", payload, format="json").status_code
+        for _ in range(3)
+    ]
+
+    assert codes[-1] == 429
+    assert cache_metrics()["throttle"]["misses"] >= 1
+    assert not cache_metrics().get("default", {}).get("hits")
+
+
+def test_write_behind_buffer_drains_in_order_and_batches():
+    buffer = WriteBehindBuffer("test:buffer")
+    assert [buffer.append(i) for i in range(5)] == [1, 2, 3, 4, 5]
+
+    batches = []
+    assert buffer.drain(batches.append, batch_size=2) == 5
+    assert batches == [[0, 1], [2, 3], [4]]
+    assert buffer.drain(batches.append) == 0
+
+
+def test_write_behind_buffer_requires_shared_cache(settings):
+    buffer = WriteBehindBuffer("test:buffer")
+    buffer.check_backend()
+
+    settings.REQUIRE_SHARED_CACHE = True
+    with pytest.raises(ImproperlyConfigured, match="process-local"):
+        buffer.check_backend()
@@ -0,0 +1,14 @@
+from rest_framework import throttling
+from .cache import throttle_cache
+
+
+class UserRateThrottle(throttling.UserRateThrottle):
+    cache = throttle_cache
+
+
+class AnonRateThrottle(throttling.AnonRateThrottle):
+    cache = throttle_cache
+
+
+class ScopedRateThrottle(throttling.ScopedRateThrottle):
+    cache = throttle_cache
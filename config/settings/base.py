@@ -1,6 +1,7 @@
 from pathlib import Path
 import os
 from datetime import timedelta
+from urllib.parse import urlsplit
 
 BASE_DIR = Path(__file__).resolve().parents[2]
 
@@ -26,6 +27,7 @@ INSTALLED_APPS = [
     "courses",
     "quizzes",
     "judge",
+    "notifications",
 ]
 
 TEMPLATES = [
@@ -87,7 +89,7 @@ DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 REST_FRAMEWORK = {
     "DEFAULT_SCHEMA_CLASS": "drf_spectacular.openapi.AutoSchema",
     "DEFAULT_AUTHENTICATION_CLASSES": (
-        "rest_framework_simplejwt.authentication.JWTAuthentication",
+        "accounts.authentication.CachedJWTAuthentication",
     ),
     "DEFAULT_PERMISSION_CLASSES": ("rest_framework.permissions.IsAuthenticated",),
     "DEFAULT_FILTER_BACKENDS": [
@@ -98,8 +100,8 @@ REST_FRAMEWORK = {
     "DEFAULT_PAGINATION_CLASS": "common.pagination.DefaultPagination",
     "PAGE_SIZE": 20,
     "DEFAULT_THROTTLE_CLASSES": [
-        "rest_framework.throttling.UserRateThrottle",
-        "rest_framework.throttling.AnonRateThrottle",
+        "common.throttling.UserRateThrottle",
+        "common.throttling.AnonRateThrottle",
     ],
     "DEFAULT_THROTTLE_RATES": {
         "user": "200/min",
@@ -124,6 +126,7 @@ SPECTACULAR_SETTINGS = {
     "ENUM_NAME_OVERRIDES": {
         "ProgressStatusEnum": "common.enums.ProgressStatus",
         "SubmissionStatusEnum": "common.enums.SubmissionStatus",
+        "LessonTypeEnum": "common.enums.LessonType",
     },
 }
 
@@ -133,13 +136,79 @@ SIMPLE_JWT = {
     "ROTATE_REFRESH_TOKENS": True,
     "BLACKLIST_AFTER_ROTATION": True,
     "AUTH_HEADER_TYPES": ("Bearer",),
+    "TOKEN_REFRESH_SERIALIZER": "accounts.serializers.TokenRefreshSerializer",
 }
 
+# Caches
+# Shared across processes: throttle counters, sessions and cached content are
+# seen by every worker. Each named cache has its own key prefix and metrics.
+# Defaults to database 1 of the REDIS_URL server (Celery uses database 0).
+REDIS_CACHE_URL = (
+    os.getenv("REDIS_CACHE_URL")
+    or urlsplit(os.getenv("REDIS_URL", "redis://localhost:6379/0"))
+    ._replace(path="/1")
+    .geturl()
+)
+
+
+def _redis_cache(name, timeout=300):
+    return {
+        "BACKEND": "common.cache_backends.RedisCache",
+        "LOCATION": REDIS_CACHE_URL,
+        "KEY_PREFIX": name,
+        "TIMEOUT": timeout,
+    }
+
+
+CACHES = {
+    # Versions, auth lookups, buffers and anything not listed below
+    "default": _redis_cache("default"),
+    # DRF throttle history
+    "throttle": _redis_cache("throttle"),
+    # Rendered, user-independent read payloads (courses, quizzes, judge)
+    "content": _redis_cache("content", timeout=60 * 60),
+    # Backs the cached_db session engine
+    "session": _redis_cache("session", timeout=2 * 7 * 24 * 60 * 60),
+}
+
+SESSION_ENGINE = "django.contrib.sessions.backends.cached_db"
+SESSION_CACHE_ALIAS = "session"
+
 # Celery
 CELERY_BROKER_URL = os.getenv("REDIS_URL", "redis://localhost:6379/0")
 CELERY_RESULT_BACKEND = CELERY_BROKER_URL
 CELERY_TASK_TIME_LIMIT = 60
 CELERY_TASK_SOFT_TIME_LIMIT = 55
+CELERY_BEAT_SCHEDULE = {
+    "flush-quiz-attempts": {
+        "task": "quizzes.tasks.flush_quiz_attempts",
+        "schedule": 10.0,
+    },
+    "purge-expired-tokens": {
+        "task": "accounts.tasks.purge_expired_tokens",
+        "schedule": 60 * 60,
+    },
+    "warm-token-blacklist": {
+        "task": "accounts.tasks.warm_token_blacklist",
+        "schedule": 30 * 60,
+    },
+    "worker-heartbeat": {
+        "task": "judge.tasks.worker_heartbeat",
+        "schedule": 30.0,
+    },
+    "send-outbox-emails": {
+        "task": "notifications.tasks.send_outbox_emails",
+        "schedule": 30.0,
+    },
+    "purge-outbox-emails": {
+        "task": "notifications.tasks.purge_outbox_emails",
+        "schedule": 24 * 60 * 60,
+    },
+    "purge-progress-tombstones": {
+        "task": "courses.tasks.purge_progress_tombstones",
+        "schedule": 24 * 60 * 60,
+    },
+}
 
 CORS_ALLOW_ALL_ORIGINS = False
 
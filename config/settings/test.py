@@ -3,3 +3,15 @@ from .base import *  # noqa: F403, F405
 DEBUG = False
 EMAIL_BACKEND = "django.core.mail.backends.locmem.EmailBackend"
 PASSWORD_HASHERS = ["django.contrib.auth.hashers.MD5PasswordHasher"]
+
+CACHES = {
+    name: {
+        "BACKEND": "common.cache_backends.LocMemCache",
+        "LOCATION": name,
+        "KEY_PREFIX": name,
+    }
+    for name in ("default", "throttle", "content", "session")
+}
+
+# Tests run in one process, so the process-local cache is shared enough
+REQUIRE_SHARED_CACHE = False
@@ -28,6 +28,8 @@ urlpatterns = [
                 path("signup/", RegisterView.as_view(), name="signup"),
                 path("login/", LoginView.as_view(), name="login"),
                 path("", include("accounts.urls")),
+                # Before courses: its "<slug:slug>/" route would shadow these
+                path("", include("judge.urls")),
                 path("", include("courses.urls")),
             ],
         ),
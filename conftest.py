@@ -17,3 +17,34 @@ def api_client():
     from rest_framework.test import APIClient
 
     return APIClient()
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    from django.core.cache import caches
+    from common.cache import clear_local_caches
+
+    for named_cache in caches.all():
+        named_cache.clear()
+    clear_local_caches()
+
+
+# Maximum number of SQL queries an endpoint may issue, regardless of how much
+# content it serves. Only raise a budget together with the change that needs it.
+QUERY_BUDGETS = {
+    "course-detail": 11,
+    "lesson-detail": 3,
+}
+
+
+@pytest.fixture
+def query_budget(django_assert_max_num_queries):
+    """
+    Usage: `with query_budget("course-detail"): client.get(...)`.
+    Fails the test, listing the captured SQL, when the budget is exceeded.
+    """
+
+    def within(endpoint):
+        return django_assert_max_num_queries(QUERY_BUDGETS[endpoint])
+
+    return within
@@ -0,0 +1,111 @@
+import time
+from typing import NamedTuple
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.http import Http404
+from common.cache import (
+    VersionedLRUCache,
+    bump_version_on_commit,
+    content_cache,
+    get_version,
+    versioned_key,
+)
+
+# Bumped whenever anything rendered into a course detail payload changes.
+CONTENT_VERSION_KEY = "courses:content-version"
+# Unix time of the latest content change, used for Last-Modified.
+CONTENT_MODIFIED_KEY = "courses:content-modified"
+# Bumped whenever a course or lesson slug may have changed.
+ROUTE_VERSION_KEY = "courses:route-version"
+
+
+def course_detail_key(slug):
+    """
+    Returns the cache key of a course detail payload under the current
+    content version. Read it before loading the course and store the payload
+    under that same key, so rows read before a commit can't land under the
+    version the commit bumped to.
+    """
+    return versioned_key("course-detail", CONTENT_VERSION_KEY, slug)
+
+
+def get_course_detail(key):
+    """Returns the cached, user-independent course detail payload (or None)."""
+    return content_cache.get(key)
+
+
+def set_course_detail(key, data):
+    timeout = getattr(settings, "COURSE_DETAIL_CACHE_TIMEOUT", 60 * 60)
+    content_cache.set(key, data, timeout=timeout)
+
+
+def get_content_stamp():
+    """
+    Returns (version, modified_at) describing the current course content.
+    Both come from the shared cache, so computing them costs no queries.
+    """
+    version = get_version(CONTENT_VERSION_KEY)
+    modified_at = cache.get(CONTENT_MODIFIED_KEY)
+    if modified_at is None:
+        # Unknown after a cache flush: assume it just changed.
+        cache.add(CONTENT_MODIFIED_KEY, time.time(), timeout=None)
+        modified_at = cache.get(CONTENT_MODIFIED_KEY)
+    return version, modified_at
+
+
+def _touch_content_modified():
+    cache.set(CONTENT_MODIFIED_KEY, time.time(), timeout=None)
+
+
+def invalidate_course_content():
+    """Invalidates every cached course detail payload, now and on commit."""
+    bump_version_on_commit(CONTENT_VERSION_KEY)
+    _touch_content_modified()
+    transaction.on_commit(_touch_content_modified)
+
+
+# Lesson URL resolution
+
+
+class LessonRoute(NamedTuple):
+    course_id: object
+    lesson_id: object
+    type: str
+
+
+_lesson_routes = VersionedLRUCache(
+    ROUTE_VERSION_KEY,
+    maxsize=getattr(settings, "LESSON_ROUTE_CACHE_SIZE", 4096),
+    ttl=getattr(settings, "LESSON_ROUTE_CACHE_TIMEOUT", 5 * 60),
+)
+
+
+def _load_lesson_route(course_slug, lesson_slug):
+    from .models import Lesson
+
+    row = (
+        Lesson.objects.filter(course__slug=course_slug, slug=lesson_slug)
+        .values_list("course_id", "id", "type")
+        .first()
+    )
+    return LessonRoute(*row) if row else None
+
+
+def resolve_lesson(course_slug, lesson_slug):
+    """
+    Maps a lesson URL to its (course_id, lesson_id, type) without touching the
+    database once warm. Raises Http404 for unknown slugs.
+    """
+    route = _lesson_routes.get_or_set(
+        (course_slug, lesson_slug),
+        lambda: _load_lesson_route(course_slug, lesson_slug),
+    )
+    if route is None:
+        raise Http404("No Lesson matches the given query.")
+    return route
+
+
+def invalidate_lesson_routes():
+    """Drops every process's cached lesson routes."""
+    bump_version_on_commit(ROUTE_VERSION_KEY)
@@ -1,4 +1,6 @@
 import django_filters
+from rest_framework import filters
+from . import search
 from .models import Course, Lesson
 
 
@@ -32,3 +34,16 @@ class LessonFilter(django_filters.FilterSet):
     class Meta:
         model = Lesson
         fields = ["course", "type"]
+
+
+class FullTextSearchFilter(filters.SearchFilter):
+    """
+    Drop-in replacement for SearchFilter on courses that queries the
+    full-text index (see courses.search) instead of ILIKE scans.
+    """
+
+    def filter_queryset(self, request, queryset, view):
+        query = request.query_params.get(self.search_param, "").strip()
+        if not query:
+            return queryset
+        return search.filter_courses(queryset, query)
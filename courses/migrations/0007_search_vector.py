@@ -0,0 +1,95 @@
+# Generated by Django 5.2.18 on 2026-10-19 11:23
+
+import django.contrib.postgres.search
+from django.db import migrations
+
+FTS_TABLE = "courses_search_fts"
+
+
+def create_search_index(apps, schema_editor):
+    if schema_editor.connection.vendor == "postgresql":
+        schema_editor.execute(
+            "CREATE INDEX courses_course_search_gin "
+            "ON courses_course USING gin (search_vector)"
+        )
+        schema_editor.execute(
+            "CREATE INDEX courses_lesson_search_gin "
+            "ON courses_lesson USING gin (search_vector)"
+        )
+    else:
+        schema_editor.execute(
+            f"CREATE VIRTUAL TABLE {FTS_TABLE} USING fts5("
+            "kind UNINDEXED, object_id UNINDEXED, title, body, "
+            "tokenize = 'unicode61 remove_diacritics 2')"
+        )
+
+    index_existing_rows(apps, schema_editor)
+
+
+def index_existing_rows(apps, schema_editor):
+    # A frozen copy of courses.search indexing, so later changes there can't
+    # break this migration.
+    from django.contrib.postgres.search import SearchVector
+    from django.db.models import TextField, Value
+
+    Course = apps.get_model("courses", "Course")
+    Lesson = apps.get_model("courses", "Lesson")
+    postgres = schema_editor.connection.vendor == "postgresql"
+
+    def fts_insert(kind, pk, title, body):
+        schema_editor.execute(
+            f"INSERT INTO {FTS_TABLE} (kind, object_id, title, body) "
+            "VALUES (%s, %s, %s, %s)",
+            [kind, str(pk), title, body],
+        )
+
+    for course in Course.objects.prefetch_related("tags"):
+        tags = " ".join(tag.name for tag in course.tags.all())
+        body = f"{course.description}\n{tags}"
+        if postgres:
+            Course.objects.filter(pk=course.pk).update(
+                search_vector=SearchVector("title", weight="A", config="simple")
+                + SearchVector(
+                    Value(body, output_field=TextField()), weight="B", config="simple"
+                )
+            )
+        else:
+            fts_insert("course", course.pk, course.title, body)
+
+    for lesson in Lesson.objects.all():
+        if postgres:
+            Lesson.objects.filter(pk=lesson.pk).update(
+                search_vector=SearchVector("title", weight="A", config="simple")
+                + SearchVector("content_md", weight="C", config="simple")
+            )
+        else:
+            fts_insert("lesson", lesson.pk, lesson.title, lesson.content_md)
+
+
+def drop_search_index(apps, schema_editor):
+    if schema_editor.connection.vendor == "postgresql":
+        schema_editor.execute("DROP INDEX courses_course_search_gin")
+        schema_editor.execute("DROP INDEX courses_lesson_search_gin")
+    else:
+        schema_editor.execute(f"DROP TABLE {FTS_TABLE}")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('courses', '0006_alter_lesson_slug'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='course',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='lesson',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, null=True),
+        ),
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 5.2.18 on 2026-10-19 11:24
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('courses', '0007_search_vector'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='progress',
+            index=models.Index(fields=['user', 'created_at', 'id'], name='courses_pro_user_id_ca37bd_idx'),
+        ),
+    ]
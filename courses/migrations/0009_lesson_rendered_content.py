@@ -0,0 +1,69 @@
+# Generated by Django 5.2.18 on 2026-10-19 11:27
+
+from django.db import migrations, models
+
+
+def render_existing_lessons(apps, schema_editor):
+    # A frozen copy of courses.rendering as of this migration, so later
+    # changes to the renderer can't change or break it.
+    import hashlib
+    import html
+    import re
+
+    import markdown
+    import nh3
+
+    attributes = {**nh3.ALLOWED_ATTRIBUTES, "code": {"class"}}
+
+    def render_markdown(content_md):
+        raw_html = markdown.markdown(
+            content_md, extensions=["fenced_code", "tables", "sane_lists"]
+        )
+        return nh3.clean(raw_html, attributes=attributes)
+
+    def make_excerpt(content_html, length=200):
+        text = html.unescape(nh3.clean(content_html, tags=set()))
+        text = re.sub(r"\s+", " ", text).strip()
+        if len(text) <= length:
+            return text
+        return text[:length].rsplit(" ", 1)[0] + "…"
+
+    Lesson = apps.get_model("courses", "Lesson")
+    lessons = []
+    for lesson in Lesson.objects.all():
+        digest = hashlib.sha256(lesson.content_md.encode("utf-8")).hexdigest()
+        if lesson.content_hash == digest:
+            continue
+        lesson.content_html = render_markdown(lesson.content_md)
+        lesson.content_excerpt = make_excerpt(lesson.content_html)
+        lesson.content_hash = digest
+        lessons.append(lesson)
+    Lesson.objects.bulk_update(
+        lessons, ["content_html", "content_excerpt", "content_hash"], batch_size=200
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('courses', '0008_progress_keyset_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='lesson',
+            name='content_excerpt',
+            field=models.CharField(blank=True, editable=False, max_length=255),
+        ),
+        migrations.AddField(
+            model_name='lesson',
+            name='content_hash',
+            field=models.CharField(blank=True, editable=False, max_length=64),
+        ),
+        migrations.AddField(
+            model_name='lesson',
+            name='content_html',
+            field=models.TextField(blank=True, editable=False),
+        ),
+        migrations.RunPython(render_existing_lessons, migrations.RunPython.noop),
+    ]
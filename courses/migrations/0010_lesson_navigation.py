@@ -0,0 +1,43 @@
+# Generated by Django 5.2.18 on 2026-10-19 11:29
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def link_existing_lessons(apps, schema_editor):
+    Lesson = apps.get_model("courses", "Lesson")
+    by_course = {}
+    for lesson in Lesson.objects.order_by("course_id", "order", "created_at"):
+        by_course.setdefault(lesson.course_id, []).append(lesson)
+    for lessons in by_course.values():
+        for i, lesson in enumerate(lessons):
+            lesson.prev_lesson_id = lessons[i - 1].id if i > 0 else None
+            lesson.next_lesson_id = lessons[i + 1].id if i + 1 < len(lessons) else None
+        Lesson.objects.bulk_update(lessons, ["prev_lesson", "next_lesson"])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('courses', '0009_lesson_rendered_content'),
+        ('judge', '0007_remove_language_version'),
+        ('quizzes', '0008_choice_unique_answer_per_question'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='lesson',
+            name='next_lesson',
+            field=models.ForeignKey(blank=True, editable=False, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='courses.lesson'),
+        ),
+        migrations.AddField(
+            model_name='lesson',
+            name='prev_lesson',
+            field=models.ForeignKey(blank=True, editable=False, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='courses.lesson'),
+        ),
+        migrations.AddIndex(
+            model_name='lesson',
+            index=models.Index(fields=['course', 'order'], name='courses_les_course__dc0bc6_idx'),
+        ),
+        migrations.RunPython(link_existing_lessons, migrations.RunPython.noop),
+    ]
@@ -1,8 +1,11 @@
-from django.db import models
+from django.contrib.postgres.search import SearchVectorField
+from django.db import models, transaction
+from django.utils import timezone
 from django.utils.text import slugify
 from django.core.exceptions import ValidationError
 from common.models import UUIDModel, TimeStamped
 from common.enums import ProgressStatus, LessonType
+from .rendering import render_lesson
 
 
 class Tag(UUIDModel, TimeStamped):
@@ -30,6 +33,9 @@ class Course(UUIDModel, TimeStamped):
     # Add ManyToManyField to link Courses and Tags
     tags = models.ManyToManyField(Tag, blank=True, related_name="courses")
 
+    # Full-text document maintained by courses.search (PostgreSQL only)
+    search_vector = SearchVectorField(null=True, editable=False)
+
     def __str__(self):
         return self.title
 
@@ -38,6 +44,7 @@ class Lesson(UUIDModel, TimeStamped):
     class Meta:
         ordering = ["order", "created_at"]
         unique_together = ("course", "slug")
+        indexes = [models.Index(fields=("course", "order"))]
 
     course = models.ForeignKey(Course, on_delete=models.CASCADE, related_name="lessons")
     title = models.CharField(max_length=200)
@@ -45,6 +52,11 @@ class Lesson(UUIDModel, TimeStamped):
     order = models.PositiveIntegerField(default=0)
     content_md = models.TextField(blank=True)
 
+    # Pre-rendered from content_md on save (see courses.rendering)
+    content_html = models.TextField(blank=True, editable=False)
+    content_excerpt = models.CharField(max_length=255, blank=True, editable=False)
+    content_hash = models.CharField(max_length=64, blank=True, editable=False)
+
     # New fields for lesson type
     type = models.CharField(
         max_length=10, choices=LessonType.choices, default=LessonType.JUDGE
@@ -60,23 +72,103 @@ class Lesson(UUIDModel, TimeStamped):
         related_name="lesson_for_quiz",
     )
 
-    def get_next_lesson(self):
-        return (
-            Lesson.objects.filter(course=self.course, order__gt=self.order)
-            .order_by("order")
-            .first()
+    # Full-text document maintained by courses.search (PostgreSQL only)
+    search_vector = SearchVectorField(null=True, editable=False)
+
+    # Neighbours in course order, maintained by refresh_navigation()
+    prev_lesson = models.ForeignKey(
+        "self",
+        null=True,
+        blank=True,
+        editable=False,
+        on_delete=models.SET_NULL,
+        related_name="+",
+    )
+    next_lesson = models.ForeignKey(
+        "self",
+        null=True,
+        blank=True,
+        editable=False,
+        on_delete=models.SET_NULL,
+        related_name="+",
+    )
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Remember where the lesson sat so save() can tell if navigation moved
+        loaded = dict(zip(field_names, values))
+        instance._loaded_position = (loaded.get("course_id"), loaded.get("order"))
+        return instance
+
+    @staticmethod
+    def slug_for_order(order):
+        return f"{int(order):02d}"
+
+    @staticmethod
+    def link_navigation(lessons):
+        """
+        Points each lesson of an ordered list at its neighbours.
+        Returns the lessons whose links changed.
+        """
+        changed = []
+        for i, lesson in enumerate(lessons):
+            prev_id = lessons[i - 1].id if i > 0 else None
+            next_id = lessons[i + 1].id if i + 1 < len(lessons) else None
+            if (lesson.prev_lesson_id, lesson.next_lesson_id) != (prev_id, next_id):
+                lesson.prev_lesson_id = prev_id
+                lesson.next_lesson_id = next_id
+                changed.append(lesson)
+        return changed
+
+    @classmethod
+    def refresh_navigation(cls, course_id):
+        """Recomputes prev/next links of a course's lessons with one bulk update."""
+        lessons = list(
+            cls.objects.filter(course_id=course_id).only(
+                "id", "course_id", "order", "prev_lesson_id", "next_lesson_id"
+            )
         )
+        cls.objects.bulk_update(
+            cls.link_navigation(lessons), ["prev_lesson", "next_lesson"]
+        )
+        return lessons
+
+    def get_next_lesson(self):
+        return self.next_lesson
 
     def save(self, *args, **kwargs):
-        if self._state.adding and int(self.order or 0) == 0:
-            max_order = Lesson.objects.filter(course=self.course).aggregate(
-                models.Max("order")
-            )["order__max"]
-            self.order = (max_order or 0) + 1
-
-        # Always update slug based on order
-        self.slug = f"{int(self.order):02d}"
-        super().save(*args, **kwargs)
+        loaded_position = getattr(self, "_loaded_position", None)
+        with transaction.atomic():
+            if self._state.adding and int(self.order or 0) == 0:
+                # Lock the course so concurrent appends can't pick the same order
+                Course.objects.select_for_update().filter(pk=self.course_id).first()
+                max_order = Lesson.objects.filter(course_id=self.course_id).aggregate(
+                    models.Max("order")
+                )["order__max"]
+                self.order = (max_order or 0) + 1
+
+            # Always update slug based on order
+            self.slug = self.slug_for_order(self.order)
+
+            if render_lesson(self) and kwargs.get("update_fields") is not None:
+                kwargs["update_fields"] = {
+                    *kwargs["update_fields"],
+                    "content_html",
+                    "content_excerpt",
+                    "content_hash",
+                }
+            super().save(*args, **kwargs)
+
+            position = (self.course_id, self.order)
+            if position != loaded_position:
+                self._loaded_position = position
+                for lesson in Lesson.refresh_navigation(self.course_id):
+                    if lesson.pk == self.pk:
+                        self.prev_lesson_id = lesson.prev_lesson_id
+                        self.next_lesson_id = lesson.next_lesson_id
+                if loaded_position and loaded_position[0] != self.course_id:
+                    Lesson.refresh_navigation(loaded_position[0])
 
     def clean(self):
         # Ensure that only one of problem or quiz is set, matching the type
@@ -103,3 +195,29 @@ class Progress(UUIDModel, TimeStamped):
 
     class Meta:
         unique_together = ("user", "lesson")
+        indexes = [
+            # Backs keyset pagination of a user's progress list
+            models.Index(fields=("user", "created_at", "id")),
+            # Backs delta sync of a user's progress changes
+            models.Index(fields=("user", "updated_at", "id")),
+        ]
+
+
+class ProgressTombstone(UUIDModel):
+    """
+    Records a deleted Progress row so sync clients can drop it. `id` is the
+    deleted row's id. Pruned after PROGRESS_TOMBSTONE_RETENTION_DAYS.
+    """
+
+    # No FK constraint: tombstones are written while users are being deleted.
+    user = models.ForeignKey(
+        "accounts.User",
+        on_delete=models.DO_NOTHING,
+        db_constraint=False,
+        related_name="+",
+    )
+    lesson_id = models.UUIDField()
+    deleted_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        indexes = [models.Index(fields=("user", "deleted_at", "id"))]
@@ -0,0 +1,55 @@
+"""
+Server-side rendering of lesson markdown to sanitized HTML.
+
+Lessons store the rendered HTML and a plain-text excerpt together with a
+hash of the markdown they were rendered from, so content is only rendered
+again when it actually changes.
+"""
+
+import hashlib
+import html
+import re
+import markdown
+import nh3
+
+MARKDOWN_EXTENSIONS = ["fenced_code", "tables", "sane_lists"]
+EXCERPT_LENGTH = 200
+
+# Keep nh3's safe defaults, plus language hints on code blocks.
+ALLOWED_ATTRIBUTES = {
+    **nh3.ALLOWED_ATTRIBUTES,
+    "code": {"class"},
+}
+
+
+def content_hash(content_md):
+    return hashlib.sha256(content_md.encode("utf-8")).hexdigest()
+
+
+def render_markdown(content_md):
+    """Renders markdown to HTML that is safe to inject into the page."""
+    raw_html = markdown.markdown(content_md, extensions=MARKDOWN_EXTENSIONS)
+    return nh3.clean(raw_html, attributes=ALLOWED_ATTRIBUTES)
+
+
+def make_excerpt(content_html, length=EXCERPT_LENGTH):
+    """Returns the first `length` characters of text, cut at a word boundary."""
+    text = html.unescape(nh3.clean(content_html, tags=set()))
+    text = re.sub(r"\s+", " ", text).strip()
+    if len(text) <= length:
+        return text
+    return text[:length].rsplit(" ", 1)[0] + "…"
+
+
+def render_lesson(lesson):
+    """
+    Refreshes a lesson's pre-rendered fields in memory (without saving).
+    Returns True if the lesson content changed since its last render.
+    """
+    digest = content_hash(lesson.content_md)
+    if lesson.content_hash == digest:
+        return False
+    lesson.content_html = render_markdown(lesson.content_md)
+    lesson.content_excerpt = make_excerpt(lesson.content_html)
+    lesson.content_hash = digest
+    return True
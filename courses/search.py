@@ -0,0 +1,213 @@
+"""
+Full-text search over course titles, descriptions, tags and lesson content.
+
+On PostgreSQL every Course and Lesson keeps a weighted `search_vector`
+(GIN-indexed) that is refreshed on save. Other databases (SQLite in dev and
+tests) use an FTS5 virtual table holding the same documents instead.
+"""
+
+import html
+import re
+import uuid
+from django.contrib.postgres.search import (
+    SearchHeadline,
+    SearchQuery,
+    SearchRank,
+    SearchVector,
+)
+from django.db import connection
+from django.db.models import F, TextField, Value
+from .models import Course, Lesson
+
+FTS_TABLE = "courses_search_fts"
+# Highlights come back from the database as control characters, which
+# can't appear in HTML and survive escaping, and are swapped for <mark>
+# tags only after the text has been escaped.
+SNIPPET_START = "\x02"
+SNIPPET_STOP = "\x03"
+SNIPPET_WORDS = 16
+
+
+def _is_postgres():
+    return connection.vendor == "postgresql"
+
+
+def _course_document(course):
+    tags = " ".join(tag.name for tag in course.tags.all())
+    return course.title, f"{course.description}\n{tags}"
+
+
+# Indexing
+
+
+def index_course(course):
+    if _is_postgres():
+        _, body = _course_document(course)
+        type(course).objects.filter(pk=course.pk).update(
+            search_vector=SearchVector("title", weight="A", config="simple")
+            + SearchVector(
+                Value(body, output_field=TextField()), weight="B", config="simple"
+            )
+        )
+    else:
+        _fts_replace("course", course.pk, *_course_document(course))
+
+
+def index_lesson(lesson):
+    if _is_postgres():
+        type(lesson).objects.filter(pk=lesson.pk).update(
+            search_vector=SearchVector("title", weight="A", config="simple")
+            + SearchVector("content_md", weight="C", config="simple")
+        )
+    else:
+        _fts_replace("lesson", lesson.pk, lesson.title, lesson.content_md)
+
+
+def remove_from_index(kind, pk):
+    # PostgreSQL vectors live on the deleted row itself.
+    if not _is_postgres():
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"DELETE FROM {FTS_TABLE} WHERE kind = %s AND object_id = %s",
+                [kind, str(pk)],
+            )
+
+
+def rebuild_index():
+    """Reindexes every course and lesson."""
+    for course in Course.objects.prefetch_related("tags"):
+        index_course(course)
+    for lesson in Lesson.objects.all():
+        index_lesson(lesson)
+
+
+def _fts_replace(kind, pk, title, body):
+    remove_from_index(kind, pk)
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"INSERT INTO {FTS_TABLE} (kind, object_id, title, body) "
+            "VALUES (%s, %s, %s, %s)",
+            [kind, str(pk), title, body],
+        )
+
+
+# Querying
+
+
+def _fts_match_expression(query):
+    # Quote every term so user input can't inject FTS5 query syntax;
+    # a trailing '*' makes each term a prefix match.
+    terms = re.findall(r"\w+", query)
+    return " ".join(f'"{term}"*' for term in terms)
+
+
+def _fts_search(query, kind, limit):
+    expression = _fts_match_expression(query)
+    if not expression:
+        return []
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"SELECT object_id, bm25({FTS_TABLE}, 0, 0, 10.0, 1.0), "
+            f"snippet({FTS_TABLE}, -1, %s, %s, '…', %s) "
+            f"FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s AND kind = %s "
+            "ORDER BY 2 LIMIT %s",
+            [SNIPPET_START, SNIPPET_STOP, SNIPPET_WORDS, expression, kind, limit],
+        )
+        # bm25() is lower-is-better; flip it so higher rank is better everywhere.
+        return [(uuid.UUID(pk), -score, snippet) for pk, score, snippet in cursor]
+
+
+def _pg_query(query):
+    return SearchQuery(query, search_type="websearch", config="simple")
+
+
+def _headline(field, query):
+    return SearchHeadline(
+        field,
+        query,
+        config="simple",
+        start_sel=SNIPPET_START,
+        stop_sel=SNIPPET_STOP,
+        max_words=SNIPPET_WORDS,
+        min_words=SNIPPET_WORDS // 2,
+    )
+
+
+def render_snippet(snippet):
+    """Escapes a raw snippet and turns its highlight markers into <mark> tags."""
+    if snippet is None:
+        return None
+    return (
+        html.escape(snippet)
+        .replace(SNIPPET_START, "<mark>")
+        .replace(SNIPPET_STOP, "</mark>")
+    )
+
+
+def _search_model(model, query, limit, snippet_field):
+    """Returns [(obj, rank, snippet)] for one model, best match first."""
+    if _is_postgres():
+        pg_query = _pg_query(query)
+        qs = (
+            model.objects.filter(search_vector=pg_query)
+            .annotate(
+                rank=SearchRank(F("search_vector"), pg_query),
+                snippet=_headline(snippet_field, pg_query),
+            )
+            .order_by("-rank")
+        )
+        if model is Lesson:
+            qs = qs.select_related("course")
+        return [(obj, obj.rank, render_snippet(obj.snippet)) for obj in qs[:limit]]
+
+    hits = _fts_search(query, model.__name__.lower(), limit)
+    qs = model.objects.filter(pk__in=[pk for pk, _, _ in hits])
+    if model is Lesson:
+        qs = qs.select_related("course")
+    objects = qs.in_bulk()
+    return [
+        (objects[pk], rank, render_snippet(snippet))
+        for pk, rank, snippet in hits
+        if pk in objects
+    ]
+
+
+def search(query, limit=20):
+    """
+    Searches courses and lessons, returning up to `limit` result dicts
+    ordered by relevance, each with a highlighted snippet.
+    """
+    results = [
+        {
+            "type": "course",
+            "id": course.id,
+            "title": course.title,
+            "course_slug": course.slug,
+            "lesson_slug": None,
+            "snippet": snippet,
+            "rank": rank,
+        }
+        for course, rank, snippet in _search_model(Course, query, limit, "description")
+    ]
+    results += [
+        {
+            "type": "lesson",
+            "id": lesson.id,
+            "title": lesson.title,
+            "course_slug": lesson.course.slug,
+            "lesson_slug": lesson.slug,
+            "snippet": snippet,
+            "rank": rank,
+        }
+        for lesson, rank, snippet in _search_model(Lesson, query, limit, "content_md")
+    ]
+    results.sort(key=lambda result: result["rank"], reverse=True)
+    return results[:limit]
+
+
+def filter_courses(queryset, query):
+    """Restricts a Course queryset to full-text matches of `query`."""
+    if _is_postgres():
+        return queryset.filter(search_vector=_pg_query(query))
+    hits = _fts_search(query, "course", limit=-1)
+    return queryset.filter(pk__in=[pk for pk, _, _ in hits])
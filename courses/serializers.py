@@ -1,13 +1,37 @@
+from django.db.models import Prefetch
 from drf_spectacular.utils import extend_schema_field
 from rest_framework import serializers
-from .models import Course, Lesson, Progress, Tag
+from .models import Course, Lesson, Progress, ProgressTombstone, Tag
+from . import services
 from common.enums import LessonType
-from judge.models import Problem, Submission
+from judge.models import Problem, Submission, TestCase
 from judge.serializers import LanguageSer, TestCaseSer
+from quizzes.models import Question
 from quizzes.serializers import QuizSer
 from typing import Any, Dict, Optional
 
 
+def lesson_content_prefetches(prefix=""):
+    """
+    Prefetches everything LessonLiteSer renders for a lesson's problem or quiz,
+    so serializing any number of lessons costs a fixed number of queries.
+
+    `prefix` is the lookup path to the lessons, e.g. "lessons__" from a course.
+    """
+    return [
+        Prefetch(
+            f"{prefix}problem__testcases",
+            queryset=TestCase.objects.filter(hidden=False),
+            to_attr="sample_testcase_list",
+        ),
+        f"{prefix}problem__allowed_languages",
+        Prefetch(
+            f"{prefix}quiz__questions",
+            queryset=Question.objects.prefetch_related("choices"),
+        ),
+    ]
+
+
 class ProblemLiteSer(serializers.ModelSerializer):
     allowed_languages = LanguageSer(many=True, read_only=True)
     sample_testcases = serializers.SerializerMethodField()
@@ -19,7 +43,9 @@ class ProblemLiteSer(serializers.ModelSerializer):
     @extend_schema_field(TestCaseSer(many=True))
     def get_sample_testcases(self, obj):
         # Only return test cases that are NOT hidden
-        samples = obj.testcases.filter(hidden=False)
+        samples = getattr(obj, "sample_testcase_list", None)
+        if samples is None:
+            samples = obj.testcases.filter(hidden=False)
         return TestCaseSer(samples, many=True).data
 
 
@@ -80,11 +106,34 @@ class LessonSerializer(serializers.ModelSerializer):
         return data
 
 
+# Lesson content representations, selected with ?content=
+LESSON_CONTENT_FIELDS = {
+    "html": "content_html",
+    "md": "content_md",
+    "excerpt": "excerpt",
+}
+
+
+class LessonContentQuerySer(serializers.Serializer):
+    content = serializers.ChoiceField(
+        choices=tuple(LESSON_CONTENT_FIELDS),
+        # Markdown stays the default for clients predating pre-rendering
+        default="md",
+        help_text="Which representation of the lesson content to return.",
+    )
+
+
 class LessonLiteSer(serializers.ModelSerializer):
+    """
+    A lesson with one content representation: the one named by the
+    `content` context entry (see LESSON_CONTENT_FIELDS).
+    """
+
     progress = serializers.SerializerMethodField()
     problem = ProblemLiteSer(read_only=True)
     quiz = serializers.SerializerMethodField()
     latest_submission = serializers.SerializerMethodField()
+    excerpt = serializers.CharField(source="content_excerpt", read_only=True)
 
     class Meta:
         model = Lesson
@@ -97,10 +146,21 @@ class LessonLiteSer(serializers.ModelSerializer):
             "problem",
             "quiz",
             "content_md",
+            "content_html",
+            "excerpt",
             "progress",
             "latest_submission",
         )
 
+    def get_fields(self):
+        fields = super().get_fields()
+        content = self.context.get("content")
+        if content:
+            for name in LESSON_CONTENT_FIELDS.values():
+                if name != LESSON_CONTENT_FIELDS[content]:
+                    fields.pop(name, None)
+        return fields
+
     @extend_schema_field(ProgressLiteSer)
     def get_progress(self, obj):
         progress_map = self.context.get("progress_map", {})
@@ -124,6 +184,27 @@ class LessonLiteSer(serializers.ModelSerializer):
         return None
 
 
+class CourseLessonSer(LessonLiteSer):
+    """
+    A lesson inside the course detail: carries a short excerpt instead of the
+    full content, which clients fetch from the lesson detail when opened.
+    """
+
+    class Meta(LessonLiteSer.Meta):
+        fields = (
+            "id",
+            "title",
+            "slug",
+            "type",
+            "order",
+            "problem",
+            "quiz",
+            "excerpt",
+            "progress",
+            "latest_submission",
+        )
+
+
 class CourseListSer(serializers.ModelSerializer):
     tags = serializers.SlugRelatedField(
         many=True,
@@ -138,7 +219,7 @@ class CourseListSer(serializers.ModelSerializer):
 
 
 class CourseDetailSer(serializers.ModelSerializer):
-    lessons = LessonLiteSer(many=True, read_only=True)
+    lessons = CourseLessonSer(many=True, read_only=True)
     tags = serializers.SlugRelatedField(
         many=True,
         slug_field="name",
@@ -165,6 +246,75 @@ class ProgressSer(serializers.ModelSerializer):
         fields = ("id", "lesson", "status")
 
 
+class ProgressBatchQuerySer(serializers.Serializer):
+    lesson_ids = serializers.ListField(
+        child=serializers.UUIDField(),
+        required=False,
+        max_length=200,
+        help_text="Lesson IDs to read; repeat the parameter for each lesson.",
+    )
+    course = serializers.SlugField(
+        required=False, help_text="Read progress on every lesson of this course."
+    )
+
+    def validate(self, attrs):
+        if ("lesson_ids" in attrs) == ("course" in attrs):
+            raise serializers.ValidationError(
+                "Provide exactly one of lesson_ids or course."
+            )
+        return attrs
+
+
+class ProgressBatchCompleteSer(serializers.Serializer):
+    lesson_ids = serializers.ListField(
+        child=serializers.UUIDField(), allow_empty=False, max_length=200
+    )
+
+    def validate_lesson_ids(self, value):
+        existing = set(Lesson.objects.filter(id__in=value).values_list("id", flat=True))
+        missing = [str(lesson_id) for lesson_id in value if lesson_id not in existing]
+        if missing:
+            raise serializers.ValidationError(f"Unknown lessons: {', '.join(missing)}")
+        return value
+
+
+class ProgressSyncQuerySer(serializers.Serializer):
+    cursor = serializers.CharField(
+        required=False,
+        help_text="Cursor returned by the previous sync; omit for a full download.",
+    )
+    limit = serializers.IntegerField(min_value=1, max_value=1000, default=500)
+
+    def validate_cursor(self, value):
+        try:
+            return services.decode_sync_cursor(value)
+        except ValueError as exc:
+            raise serializers.ValidationError(str(exc))
+
+
+class ProgressChangeSer(serializers.ModelSerializer):
+    class Meta:
+        model = Progress
+        fields = ("id", "lesson", "status", "updated_at")
+
+
+class ProgressTombstoneSer(serializers.ModelSerializer):
+    lesson = serializers.UUIDField(source="lesson_id")
+
+    class Meta:
+        model = ProgressTombstone
+        fields = ("id", "lesson", "deleted_at")
+
+
+class ProgressSyncSer(serializers.Serializer):
+    changes = ProgressChangeSer(many=True)
+    deleted = ProgressTombstoneSer(
+        many=True, help_text="Progress rows (by id) deleted since the cursor."
+    )
+    cursor = serializers.CharField()
+    has_more = serializers.BooleanField()
+
+
 class MyCourseSerializer(serializers.ModelSerializer):
     completion_percentage = serializers.IntegerField()
     is_completed = serializers.BooleanField()
@@ -172,3 +322,43 @@ class MyCourseSerializer(serializers.ModelSerializer):
     class Meta:
         model = Course
         fields = ("id", "title", "slug", "completion_percentage", "is_completed")
+
+
+class SearchQuerySer(serializers.Serializer):
+    q = serializers.CharField(min_length=2, max_length=200)
+    limit = serializers.IntegerField(min_value=1, max_value=50, default=20)
+
+
+class SearchResultSer(serializers.Serializer):
+    type = serializers.ChoiceField(choices=("course", "lesson"))
+    id = serializers.UUIDField()
+    title = serializers.CharField()
+    course_slug = serializers.SlugField()
+    lesson_slug = serializers.CharField(allow_null=True)
+    snippet = serializers.CharField(
+        help_text="HTML-escaped matching excerpt with terms wrapped in <mark> tags."
+    )
+    rank = serializers.FloatField()
+
+
+class LessonOrderSer(serializers.ModelSerializer):
+    class Meta:
+        model = Lesson
+        fields = ("id", "title", "slug", "order")
+
+
+class ReorderLessonsSer(serializers.Serializer):
+    lessons = serializers.ListField(
+        child=serializers.UUIDField(),
+        allow_empty=False,
+        help_text="IDs of all lessons of the course, in the new order.",
+    )
+
+    def validate_lessons(self, value):
+        course = self.context["course"]
+        existing = set(course.lessons.values_list("id", flat=True))
+        if len(value) != len(set(value)) or set(value) != existing:
+            raise serializers.ValidationError(
+                "Must list every lesson of the course exactly once."
+            )
+        return value
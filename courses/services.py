@@ -1,6 +1,24 @@
+import base64
+import datetime
+import json
 import logging
-from .models import Progress
+import uuid
+from django.conf import settings
+from django.db import connections, transaction
+from django.db.models import (
+    Count,
+    F,
+    FilteredRelation,
+    Max,
+    OuterRef,
+    Q,
+    Subquery,
+)
+from django.utils import timezone
+from .cache import invalidate_course_content, invalidate_lesson_routes
+from .models import Course, Lesson, Progress, ProgressTombstone
 from accounts.models import User
+from judge.models import Submission
 from common.enums import ProgressStatus
 
 logger = logging.getLogger(__name__)
@@ -8,6 +26,79 @@ logger = logging.getLogger(__name__)
 # Lesson Progress Services
 
 
+def _upsert_progress(
+    user: User, lesson_ids: list[str], status: str, update_status: bool
+) -> list[tuple[Progress, bool]]:
+    """
+    Creates the user's progress rows for `lesson_ids` or returns the existing
+    ones.
+
+    With `update_status` this is a single INSERT ... ON CONFLICT DO UPDATE ...
+    RETURNING statement: existing rows take `status`, and their updated_at
+    moves only if the status actually changed. Otherwise the insert skips
+    conflicting rows (ON CONFLICT DO NOTHING) and the existing ones are read
+    back with a plain SELECT, so they are never written. Returns
+    (Progress, created) tuples in no particular order.
+    """
+    connection = connections[Progress.objects.db]
+    qn = connection.ops.quote_name
+    meta = Progress._meta
+    now = timezone.now()
+    rows = [
+        Progress(
+            user=user,
+            lesson_id=lesson_id,
+            status=status,
+            created_at=now,
+            updated_at=now,
+        )
+        for lesson_id in lesson_ids
+    ]
+    fields = [
+        meta.get_field(name)
+        for name in ("id", "user", "lesson", "status", "created_at", "updated_at")
+    ]
+    columns = ", ".join(qn(field.column) for field in fields)
+    placeholders = ", ".join(["(" + ", ".join(["%s"] * len(fields)) + ")"] * len(rows))
+    params = [
+        field.get_db_prep_save(getattr(row, field.attname), connection)
+        for row in rows
+        for field in fields
+    ]
+    table = qn(meta.db_table)
+    status_col = qn(meta.get_field("status").column)
+    updated_col = qn(meta.get_field("updated_at").column)
+    conflict = ", ".join(qn(meta.get_field(name).column) for name in ("user", "lesson"))
+    if update_status:
+        action = (
+            f"DO UPDATE SET {status_col} = EXCLUDED.{status_col}, "
+            f"{updated_col} = CASE WHEN {table}.{status_col} = EXCLUDED.{status_col} "
+            f"THEN {table}.{updated_col} ELSE EXCLUDED.{updated_col} END"
+        )
+    else:
+        action = "DO NOTHING"
+    sql = (
+        f"INSERT INTO {table} ({columns}) VALUES {placeholders} "
+        f"ON CONFLICT ({conflict}) {action} RETURNING {columns}"
+    )
+    new_ids = {row.pk for row in rows}
+    results = []
+    for progress in Progress.objects.raw(sql, params):
+        progress.user = user
+        results.append((progress, progress.pk in new_ids))
+    if len(results) < len(rows):
+        # DO NOTHING returns only the inserted rows; the rest already existed.
+        inserted = {progress.pk for progress, _ in results}
+        existing = Progress.objects.filter(
+            user=user,
+            lesson_id__in=[row.lesson_id for row in rows if row.pk not in inserted],
+        )
+        for progress in existing:
+            progress.user = user
+            results.append((progress, False))
+    return results
+
+
 def get_or_create_progress(user: User, lesson_id: str) -> tuple[Progress, bool]:
     """
     Gets or creates a progress tracker for a user and a lesson.
@@ -15,24 +106,256 @@ def get_or_create_progress(user: User, lesson_id: str) -> tuple[Progress, bool]:
 
     Returns the (Progress, created) tuple.
     """
-    return Progress.objects.get_or_create(
-        user=user,
-        lesson_id=lesson_id,
-        defaults={"status": ProgressStatus.INCOMPLETE},
+    [result] = _upsert_progress(
+        user, [lesson_id], ProgressStatus.INCOMPLETE, update_status=False
     )
+    return result
 
 
 def complete_lesson_for_user(user: User, lesson_id: str) -> Progress:
     """
     Marks a lesson as 'completed' for a user.
     """
-    progress, _ = get_or_create_progress(user, lesson_id)
+    logger.info(f"Marking lesson {lesson_id} as COMPLETED for user {user.id}")
+    [(progress, _)] = _upsert_progress(
+        user, [lesson_id], ProgressStatus.COMPLETED, update_status=True
+    )
+    return progress
+
+
+def complete_lessons_for_user(user: User, lesson_ids: list[str]) -> list[Progress]:
+    """
+    Marks many lessons as 'completed' for a user with one bulk upsert.
+    """
+    lesson_ids = list(dict.fromkeys(lesson_ids))
+    if not lesson_ids:
+        return []
+    logger.info(f"Marking {len(lesson_ids)} lessons as COMPLETED for user {user.id}")
+    return [
+        progress
+        for progress, _ in _upsert_progress(
+            user, lesson_ids, ProgressStatus.COMPLETED, update_status=True
+        )
+    ]
+
+
+def get_course_status_map(user: User, course_id: str) -> dict[str, str]:
+    """
+    Returns {lesson_id: status} for every lesson of a course the user has
+    progress on, as a single query without instantiating models.
+    """
+    rows = Progress.objects.filter(user=user, lesson__course_id=course_id).values_list(
+        "lesson_id", "status"
+    )
+    return {str(lesson_id): status for lesson_id, status in rows}
+
+
+def get_progress_stamp(user: User, **lesson_filters) -> tuple[int, float]:
+    """
+    Returns a cheap (row count, latest update as unix time) version stamp for
+    the user's progress on lessons matching `lesson_filters`,
+    e.g. get_progress_stamp(user, course__slug="python").
+    """
+    filters = {f"lesson__{key}": value for key, value in lesson_filters.items()}
+    stamp = Progress.objects.filter(user=user, **filters).aggregate(
+        count=Count("id"), last=Max("updated_at")
+    )
+    last = stamp["last"].timestamp() if stamp["last"] else 0
+    return stamp["count"], last
+
+
+def annotate_user_state(lessons, user: User):
+    """
+    Annotates a Lesson queryset with the user's progress and latest submission
+    so they load in the same query as the lessons. Both rows are LEFT JOINed;
+    only the latest submission's id needs a correlated subquery. Read them
+    back with user_state_from_annotations().
+    """
+    latest = Submission.objects.filter(
+        user=user, problem=OuterRef("problem_id")
+    ).order_by("-created_at")
+    return lessons.annotate(
+        user_progress=FilteredRelation("progress", condition=Q(progress__user=user)),
+        latest_submission=FilteredRelation(
+            "problem__submission",
+            condition=Q(problem__submission__id=Subquery(latest.values("id")[:1])),
+        ),
+    ).annotate(
+        progress_status=F("user_progress__status"),
+        progress_updated_at=F("user_progress__updated_at"),
+        **{
+            f"submission_{field}": F(f"latest_submission__{field}")
+            for field in ("id", "status", "summary", "created_at", "updated_at")
+        },
+    )
+
+
+def user_state_from_annotations(lesson: Lesson):
+    """
+    Returns (progress, latest_submission) for a lesson loaded through
+    annotate_user_state(), as unsaved model instances (or None).
+    """
+    progress = None
+    if lesson.progress_status is not None:
+        progress = Progress(
+            lesson=lesson,
+            status=lesson.progress_status,
+            updated_at=lesson.progress_updated_at,
+        )
+    submission = None
+    if lesson.submission_id is not None:
+        submission = Submission(
+            id=lesson.submission_id,
+            status=lesson.submission_status,
+            summary=lesson.submission_summary,
+            created_at=lesson.submission_created_at,
+            updated_at=lesson.submission_updated_at,
+        )
+    return progress, submission
+
+
+def user_state_stamps(lesson: Lesson) -> list[tuple]:
+    """
+    Returns (identity, latest update as unix time) version stamps for the
+    user state annotated by annotate_user_state().
+    """
+
+    def ts(value):
+        return value.timestamp() if value else 0
+
+    return [
+        (lesson.progress_status, ts(lesson.progress_updated_at)),
+        (lesson.submission_id, ts(lesson.submission_updated_at)),
+    ]
+
+
+# Progress Sync
+#
+# A sync cursor holds two keyset positions, (updated_at, id) into the user's
+# progress rows and (deleted_at, id) into their tombstones, so each page only
+# reads rows changed since the client's last sync.
+
+
+def tombstone_horizon() -> datetime.datetime:
+    """Tombstones older than this are pruned; cursors before it are stale."""
+    days = getattr(settings, "PROGRESS_TOMBSTONE_RETENTION_DAYS", 90)
+    return timezone.now() - datetime.timedelta(days=days)
+
+
+def encode_sync_cursor(progress_after, tombstones_after) -> str:
+    def dump(position):
+        if position is None:
+            return None
+        ts, pk = position
+        return [ts.isoformat(), str(pk) if pk is not None else None]
+
+    payload = json.dumps({"p": dump(progress_after), "t": dump(tombstones_after)})
+    return base64.urlsafe_b64encode(payload.encode()).decode()
+
+
+def decode_sync_cursor(token: str):
+    """
+    Returns (progress_after, tombstones_after) positions; progress_after is
+    None before the first progress row. Raises ValueError for a malformed
+    cursor, including naive timestamps and ids that aren't UUIDs.
+    """
+
+    def load(position):
+        if not isinstance(position, list) or len(position) != 2:
+            raise ValueError("Cursor position must be a [timestamp, id] pair.")
+        ts, pk = position
+        ts = datetime.datetime.fromisoformat(ts)
+        if timezone.is_naive(ts):
+            raise ValueError("Cursor timestamp must be timezone-aware.")
+        return ts, uuid.UUID(pk) if pk is not None else None
 
-    if progress.status != ProgressStatus.COMPLETED:
-        logger.info(f"Marking lesson {lesson_id} as COMPLETED for user {user.id}")
-        progress.status = ProgressStatus.COMPLETED
-        progress.save(update_fields=["status"])
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(token.encode()))
+        progress_after = payload["p"]
+        return (
+            load(progress_after) if progress_after is not None else None,
+            load(payload["t"]),
+        )
+    except (TypeError, KeyError, ValueError, AttributeError) as exc:
+        raise ValueError("Invalid sync cursor.") from exc
+
+
+def _rows_after(queryset, field, position):
+    queryset = queryset.order_by(field, "id")
+    if position is None:
+        return queryset
+    ts, pk = position
+    if pk is None:
+        return queryset.filter(**{f"{field}__gt": ts})
+    return queryset.filter(Q(**{f"{field}__gt": ts}) | Q(**{field: ts, "id__gt": pk}))
+
+
+def sync_progress(user: User, cursor=None, limit: int = 500) -> dict:
+    """
+    Returns the user's progress rows changed and deleted since a decoded
+    `cursor` (everything when None), at most `limit` of each, with the
+    encoded cursor for the next call. Keep calling while `has_more` is true.
+    """
+    if cursor is None:
+        # A full download; only deletions from now on are of interest.
+        progress_after, tombstones_after = None, (timezone.now(), None)
+        deleted = []
     else:
-        logger.info(f"Lesson {lesson_id} already COMPLETED for user {user.id}")
+        progress_after, tombstones_after = cursor
+        deleted = list(
+            _rows_after(
+                ProgressTombstone.objects.filter(user=user),
+                "deleted_at",
+                tombstones_after,
+            )[: limit + 1]
+        )
+    changes = list(
+        _rows_after(Progress.objects.filter(user=user), "updated_at", progress_after)[
+            : limit + 1
+        ]
+    )
+    has_more = len(changes) > limit or len(deleted) > limit
+    changes, deleted = changes[:limit], deleted[:limit]
+    if changes:
+        progress_after = (changes[-1].updated_at, changes[-1].id)
+    if deleted:
+        tombstones_after = (deleted[-1].deleted_at, deleted[-1].id)
+    return {
+        "changes": changes,
+        "deleted": deleted,
+        "cursor": encode_sync_cursor(progress_after, tombstones_after),
+        "has_more": has_more,
+    }
 
-    return progress
+
+# Course Structure Services
+
+
+@transaction.atomic
+def reorder_lessons(course: Course, lesson_ids: list) -> list[Lesson]:
+    """
+    Renumbers a course's lessons to follow `lesson_ids` (every lesson of the
+    course, in the new order) and relinks prev/next in one bulk update.
+    """
+    lessons = {
+        lesson.id: lesson
+        for lesson in Lesson.objects.select_for_update().filter(course=course)
+    }
+    ordered = [lessons[lesson_id] for lesson_id in lesson_ids]
+
+    now = timezone.now()
+    for position, lesson in enumerate(ordered, start=1):
+        lesson.order = position
+        lesson.slug = Lesson.slug_for_order(position)
+        lesson.updated_at = now
+    Lesson.link_navigation(ordered)
+
+    # Slugs are unique per course and derived from order; clear them first so
+    # lessons can swap positions without tripping the constraint mid-update.
+    Lesson.objects.filter(course=course).update(slug=None)
+    Lesson.objects.bulk_update(
+        ordered, ["order", "slug", "prev_lesson", "next_lesson", "updated_at"]
+    )
+    invalidate_course_content()
+    invalidate_lesson_routes()
+    return ordered
@@ -0,0 +1,121 @@
+from django.db.models import QuerySet
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_delete
+from django.dispatch import receiver
+from accounts.models import User
+from judge.models import Language, Problem, TestCase
+from quizzes.models import Choice, Question, Quiz
+from . import search
+from .cache import invalidate_course_content, invalidate_lesson_routes
+from .models import Course, Lesson, Progress, ProgressTombstone, Tag
+
+# Models whose fields end up in the cached course detail payload.
+COURSE_CONTENT_MODELS = (
+    Course,
+    Lesson,
+    Tag,
+    Problem,
+    TestCase,
+    Language,
+    Quiz,
+    Question,
+    Choice,
+)
+
+
+def invalidate_on_content_change(sender, **kwargs):
+    invalidate_course_content()
+
+
+for model in COURSE_CONTENT_MODELS:
+    post_save.connect(invalidate_on_content_change, sender=model)
+    post_delete.connect(invalidate_on_content_change, sender=model)
+
+
+@receiver(m2m_changed, sender=Course.tags.through)
+@receiver(m2m_changed, sender=Problem.allowed_languages.through)
+def invalidate_on_relation_change(sender, action, **kwargs):
+    if action in ("post_add", "post_remove", "post_clear"):
+        invalidate_course_content()
+
+
+@receiver(post_save, sender=Course)
+@receiver(post_save, sender=Lesson)
+@receiver(post_delete, sender=Course)
+@receiver(post_delete, sender=Lesson)
+def invalidate_routes_on_change(sender, **kwargs):
+    invalidate_lesson_routes()
+
+
+# Full-text search index maintenance
+
+
+@receiver(post_save, sender=Course)
+def index_course_on_save(sender, instance, raw=False, **kwargs):
+    if not raw:
+        search.index_course(instance)
+
+
+@receiver(post_save, sender=Lesson)
+def index_lesson_on_save(sender, instance, raw=False, **kwargs):
+    if not raw:
+        search.index_lesson(instance)
+
+
+@receiver(post_save, sender=Tag)
+def reindex_tagged_courses(sender, instance, raw=False, **kwargs):
+    if not raw:
+        for course in instance.courses.prefetch_related("tags"):
+            search.index_course(course)
+
+
+@receiver(m2m_changed, sender=Course.tags.through)
+def reindex_course_on_tags_change(sender, instance, action, reverse, **kwargs):
+    if action not in ("post_add", "post_remove", "post_clear"):
+        return
+    courses = instance.courses.all() if reverse else [instance]
+    for course in courses:
+        search.index_course(course)
+
+
+@receiver(post_delete, sender=Course)
+@receiver(post_delete, sender=Lesson)
+def remove_from_search_index(sender, instance, **kwargs):
+    search.remove_from_index(sender.__name__.lower(), instance.pk)
+
+
+@receiver(post_delete, sender=Lesson)
+def relink_lessons_on_delete(sender, instance, **kwargs):
+    Lesson.refresh_navigation(instance.course_id)
+
+
+# Progress tombstones
+#
+# Deleting a user or lesson cascades to its progress rows; their tombstones
+# are written in bulk from the parent's pre_delete, so the per-row receiver
+# only handles deletions of progress rows themselves.
+
+
+@receiver(pre_delete, sender=User)
+@receiver(pre_delete, sender=Lesson)
+def record_cascaded_progress_tombstones(sender, instance, **kwargs):
+    field = "user" if sender is User else "lesson"
+    rows = Progress.objects.filter(**{field: instance}).values_list(
+        "id", "user_id", "lesson_id"
+    )
+    ProgressTombstone.objects.bulk_create(
+        [
+            ProgressTombstone(id=pk, user_id=user_id, lesson_id=lesson_id)
+            for pk, user_id, lesson_id in rows.iterator()
+        ],
+        batch_size=1000,
+    )
+
+
+@receiver(post_delete, sender=Progress)
+def record_progress_tombstone(sender, instance, origin=None, **kwargs):
+    origin_model = origin.model if isinstance(origin, QuerySet) else type(origin)
+    if origin_model is not Progress:
+        return
+    ProgressTombstone.objects.create(
+        id=instance.pk, user_id=instance.user_id, lesson_id=instance.lesson_id
+    )
@@ -0,0 +1,46 @@
+from config.celery import app
+from .cache import invalidate_course_content
+from .models import Lesson, ProgressTombstone
+from .rendering import render_lesson
+from .services import tombstone_horizon
+
+RENDER_BATCH_SIZE = 200
+RENDERED_FIELDS = ["content_html", "content_excerpt", "content_hash"]
+
+
+@app.task(acks_late=True)
+def render_lessons(lesson_ids=None):
+    """
+    Renders the markdown of the given lessons (or all lessons) whose
+    pre-rendered HTML is stale. Meant for bulk imports, which bypass
+    Lesson.save and therefore the render-on-save.
+    """
+    lessons = Lesson.objects.only("id", "content_md", *RENDERED_FIELDS)
+    if lesson_ids is not None:
+        lessons = lessons.filter(id__in=lesson_ids)
+
+    stale = []
+    rendered = 0
+    for lesson in lessons.iterator(chunk_size=RENDER_BATCH_SIZE):
+        if render_lesson(lesson):
+            stale.append(lesson)
+        if len(stale) >= RENDER_BATCH_SIZE:
+            Lesson.objects.bulk_update(stale, RENDERED_FIELDS)
+            rendered += len(stale)
+            stale = []
+    if stale:
+        Lesson.objects.bulk_update(stale, RENDERED_FIELDS)
+        rendered += len(stale)
+    # bulk_update sends no signals, so cached payloads must be dropped here
+    if rendered:
+        invalidate_course_content()
+    return rendered
+
+
+@app.task
+def purge_progress_tombstones():
+    """Deletes progress tombstones older than the sync retention window."""
+    deleted, _ = ProgressTombstone.objects.filter(
+        deleted_at__lt=tombstone_horizon()
+    ).delete()
+    return deleted
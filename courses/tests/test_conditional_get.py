@@ -0,0 +1,79 @@
+import pytest
+from common.enums import ProgressStatus
+from courses.models import Progress
+
+
+@pytest.mark.django_db
+def test_course_list_revalidates_with_etag(
+    api_client, course_python, django_assert_num_queries
+):
+    url = "/api/v1/courses/"
+    resp = api_client.get(url)
+    assert resp.status_code == 200
+    assert resp["ETag"]
+    assert resp["Last-Modified"]
+
+    with django_assert_num_queries(0):
+        resp = api_client.get(url, HTTP_IF_NONE_MATCH=resp["ETag"])
+    assert resp.status_code == 304
+
+    course_python.title = "Renamed"
+    course_python.save()
+    resp = api_client.get(url, HTTP_IF_NONE_MATCH=resp["ETag"])
+    assert resp.status_code == 200
+
+
+@pytest.mark.django_db
+def test_course_list_etag_depends_on_query(api_client, course_python):
+    etag = api_client.get("/api/v1/courses/")["ETag"]
+    resp = api_client.get("/api/v1/courses/?is_published=true", HTTP_IF_NONE_MATCH=etag)
+    assert resp.status_code == 200
+
+
+@pytest.mark.django_db
+def test_course_detail_not_modified_until_progress_changes(
+    api_client, user_alice, course_python, lesson_decorators
+):
+    api_client.force_authenticate(user=user_alice)
+    url = f"/api/v1/{course_python.slug}/"
+    etag = api_client.get(url)["ETag"]
+
+    assert api_client.get(url, HTTP_IF_NONE_MATCH=etag).status_code == 304
+
+    Progress.objects.create(
+        user=user_alice, lesson=lesson_decorators, status=ProgressStatus.COMPLETED
+    )
+    resp = api_client.get(url, HTTP_IF_NONE_MATCH=etag)
+    assert resp.status_code == 200
+    assert resp.data["lessons"][0]["progress"]["status"] == ProgressStatus.COMPLETED
+
+
+@pytest.mark.django_db
+def test_course_detail_etag_is_per_user(
+    api_client, user_alice, user_bob, course_python, lesson_decorators
+):
+    url = f"/api/v1/{course_python.slug}/"
+    api_client.force_authenticate(user=user_alice)
+    etag = api_client.get(url)["ETag"]
+
+    api_client.force_authenticate(user=user_bob)
+    assert api_client.get(url, HTTP_IF_NONE_MATCH=etag).status_code == 200
+
+
+@pytest.mark.django_db
+def test_lesson_detail_not_modified_until_content_changes(
+    api_client, course_python, lesson_decorators
+):
+    url = f"/api/v1/{course_python.slug}/{lesson_decorators.slug}/"
+    resp = api_client.get(url)
+    etag = resp["ETag"]
+
+    assert api_client.get(url, HTTP_IF_NONE_MATCH=etag).status_code == 304
+    assert (
+        api_client.get(url, HTTP_IF_MODIFIED_SINCE=resp["Last-Modified"]).status_code
+        == 304
+    )
+
+    lesson_decorators.content_md = "# Decorators, revisited"
+    lesson_decorators.save()
+    assert api_client.get(url, HTTP_IF_NONE_MATCH=etag).status_code == 200
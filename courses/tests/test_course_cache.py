@@ -0,0 +1,99 @@
+import pytest
+from common.enums import LessonType, ProgressStatus
+from courses.models import Lesson, Progress
+from quizzes.models import Question
+
+
+@pytest.mark.django_db
+def test_course_detail_served_from_cache(
+    api_client, course_python, lesson_decorators, django_assert_num_queries
+):
+    url = f"/api/v1/{course_python.slug}/"
+    first = api_client.get(url)
+    assert first.status_code == 200
+
+    # Anonymous repeat requests never touch the database.
+    with django_assert_num_queries(0):
+        second = api_client.get(url)
+    assert second.data == first.data
+
+
+@pytest.mark.django_db
+def test_course_detail_cache_invalidated_on_lesson_save(
+    api_client, course_python, lesson_decorators
+):
+    url = f"/api/v1/{course_python.slug}/"
+    api_client.get(url)
+
+    lesson_decorators.title = "Decorators, revisited"
+    lesson_decorators.save()
+
+    resp = api_client.get(url)
+    assert resp.data["lessons"][0]["title"] == "Decorators, revisited"
+
+
+@pytest.mark.django_db
+def test_course_detail_cache_invalidated_on_nested_content_save(
+    api_client, course_python, quiz_python
+):
+    Lesson.objects.create(
+        course=course_python, title="Quiz", type=LessonType.QUIZ, quiz=quiz_python
+    )
+    url = f"/api/v1/{course_python.slug}/"
+    assert api_client.get(url).data["lessons"][0]["quiz"]["questions"] == []
+
+    Question.objects.create(quiz=quiz_python, text="What is 1+1?")
+
+    questions = api_client.get(url).data["lessons"][0]["quiz"]["questions"]
+    assert [q["text"] for q in questions] == ["What is 1+1?"]
+
+
+@pytest.mark.django_db
+def test_cached_course_detail_overlays_user_progress(
+    api_client, user_alice, user_bob, course_python, lesson_decorators
+):
+    url = f"/api/v1/{course_python.slug}/"
+    api_client.get(url)  # warm the shared cache anonymously
+
+    Progress.objects.create(
+        user=user_alice, lesson=lesson_decorators, status=ProgressStatus.COMPLETED
+    )
+
+    api_client.force_authenticate(user=user_alice)
+    lesson = api_client.get(url).data["lessons"][0]
+    assert lesson["progress"] == {"status": ProgressStatus.COMPLETED}
+
+    api_client.force_authenticate(user=user_bob)
+    assert api_client.get(url).data["lessons"][0]["progress"] is None
+
+
+@pytest.mark.django_db
+def test_payload_recached_before_commit_is_dropped_on_commit(
+    course_python, lesson_decorators, django_capture_on_commit_callbacks
+):
+    from courses.cache import course_detail_key, get_course_detail, set_course_detail
+
+    with django_capture_on_commit_callbacks(execute=True):
+        lesson_decorators.title = "Decorators, revisited"
+        lesson_decorators.save()
+        # A concurrent reader re-caches the pre-commit payload
+        set_course_detail(course_detail_key(course_python.slug), {"stale": True})
+
+    assert get_course_detail(course_detail_key(course_python.slug)) is None
+
+
+@pytest.mark.django_db
+def test_payload_loaded_before_commit_is_stored_under_its_old_version(
+    course_python, lesson_decorators, django_capture_on_commit_callbacks
+):
+    from courses.cache import course_detail_key, get_course_detail, set_course_detail
+
+    # A reader takes the key and loads the course, then a change commits
+    # before the reader stores its payload.
+    key = course_detail_key(course_python.slug)
+    with django_capture_on_commit_callbacks(execute=True):
+        lesson_decorators.title = "Decorators, revisited"
+        lesson_decorators.save()
+    set_course_detail(key, {"stale": True})
+
+    assert get_course_detail(course_detail_key(course_python.slug)) is None
@@ -0,0 +1,95 @@
+import pytest
+from courses.models import Lesson
+
+
+@pytest.fixture
+def three_lessons(course_python):
+    return [
+        Lesson.objects.create(course=course_python, title=f"L{i}") for i in range(3)
+    ]
+
+
+def _chain(course):
+    lessons = {lesson.id: lesson for lesson in course.lessons.all()}
+    first = next(lesson for lesson in lessons.values() if not lesson.prev_lesson_id)
+    chain = [first]
+    while chain[-1].next_lesson_id:
+        chain.append(lessons[chain[-1].next_lesson_id])
+    return [lesson.title for lesson in chain]
+
+
+@pytest.mark.django_db
+def test_lessons_appended_in_order_with_navigation(course_python, three_lessons):
+    assert [lesson.order for lesson in three_lessons] == [1, 2, 3]
+    assert _chain(course_python) == ["L0", "L1", "L2"]
+    three_lessons[0].refresh_from_db()
+    assert three_lessons[0].get_next_lesson() == three_lessons[1]
+    assert three_lessons[2].get_next_lesson() is None
+
+
+@pytest.mark.django_db
+def test_navigation_follows_order_change_and_delete(course_python, three_lessons):
+    first, middle, last = three_lessons
+    first.order = 10
+    first.save()
+    assert _chain(course_python) == ["L1", "L2", "L0"]
+
+    last.delete()
+    assert _chain(course_python) == ["L1", "L0"]
+
+
+@pytest.mark.django_db
+def test_reorder_endpoint_renumbers_lessons(
+    api_client,
+    user_teacher,
+    course_python,
+    three_lessons,
+    django_assert_max_num_queries,
+):
+    api_client.force_authenticate(user=user_teacher)
+    new_order = [three_lessons[2], three_lessons[0], three_lessons[1]]
+
+    with django_assert_max_num_queries(10):
+        resp = api_client.post(
+            f"/api/v1/{course_python.slug}/reorder/",
+            {"lessons": [str(lesson.id) for lesson in new_order]},
+            format="json",
+        )
+
+    assert resp.status_code == 200
+    assert [(r["title"], r["slug"]) for r in resp.data] == [
+        ("L2", "01"),
+        ("L0", "02"),
+        ("L1", "03"),
+    ]
+    assert _chain(course_python) == ["L2", "L0", "L1"]
+    detail = api_client.get(f"/api/v1/{course_python.slug}/")
+    assert [lesson["title"] for lesson in detail.data["lessons"]] == ["L2", "L0", "L1"]
+
+
+@pytest.mark.django_db
+def test_reorder_requires_every_lesson_once(
+    api_client, user_teacher, course_python, three_lessons
+):
+    api_client.force_authenticate(user=user_teacher)
+    url = f"/api/v1/{course_python.slug}/reorder/"
+    ids = [str(lesson.id) for lesson in three_lessons]
+
+    assert api_client.post(url, {"lessons": ids[:2]}, format="json").status_code == 400
+    assert (
+        api_client.post(url, {"lessons": [*ids, ids[0]]}, format="json").status_code
+        == 400
+    )
+
+
+@pytest.mark.django_db
+def test_reorder_restricted_to_staff(
+    api_client, user_alice, course_python, three_lessons
+):
+    api_client.force_authenticate(user=user_alice)
+    resp = api_client.post(
+        f"/api/v1/{course_python.slug}/reorder/",
+        {"lessons": [str(lesson.id) for lesson in three_lessons]},
+        format="json",
+    )
+    assert resp.status_code == 403
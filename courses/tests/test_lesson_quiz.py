@@ -1,7 +1,8 @@
 import pytest
-from common.enums import LessonType, ProgressStatus
+from common.enums import LessonType, ProgressStatus, QuestionType
 from courses.models import Lesson, Progress
-from quizzes.models import Quiz, Question, Choice
+from quizzes.attempts import attempt_buffer, flush_attempts, save_attempts
+from quizzes.models import Quiz, Question, Choice, QuizAnswer, QuizAttempt
 
 
 @pytest.fixture
@@ -89,3 +90,215 @@ def test_quiz_submission_failure(api_client, user_alice, course_python, quiz_les
     if prog_exists:
         prog = Progress.objects.get(user=user_alice, lesson=lesson)
         assert prog.status != ProgressStatus.COMPLETED
+
+
+@pytest.mark.django_db
+def test_quiz_grading_query_count_is_independent_of_size(
+    api_client, user_alice, course_python, django_assert_max_num_queries
+):
+    quiz = Quiz.objects.create(title="Long Quiz")
+    answers = []
+    for i in range(50):
+        question = Question.objects.create(quiz=quiz, text=f"Q{i}")
+        right = Choice.objects.create(question=question, text="yes", is_answer=True)
+        Choice.objects.create(question=question, text="no")
+        answers.append(
+            {"question": str(question.id), "selected_choice_id": str(right.id)}
+        )
+    lesson = Lesson.objects.create(
+        course=course_python, title="Long", order=30, type=LessonType.QUIZ, quiz=quiz
+    )
+    api_client.force_authenticate(user=user_alice)
+    url = f"/api/v1/{course_python.slug}/{lesson.slug}/"
+    api_client.post(url, {"answers": answers[:1]}, format="json")  # warm caches
+
+    with django_assert_max_num_queries(4):
+        resp = api_client.post(url, {"answers": answers}, format="json")
+    assert resp.data["passed"] is True
+
+
+@pytest.mark.django_db
+def test_quiz_answer_key_follows_choice_changes(
+    api_client, user_alice, course_python, quiz_lesson
+):
+    lesson, q1, c1, c2 = quiz_lesson
+    api_client.force_authenticate(user=user_alice)
+    url = f"/api/v1/{course_python.slug}/{lesson.slug}/"
+    data = {"answers": [{"question": str(q1.id), "selected_choice_id": str(c2.id)}]}
+    assert api_client.post(url, data, format="json").data["passed"] is False
+
+    c2.is_answer = True
+    c2.save()
+
+    assert api_client.post(url, data, format="json").data["passed"] is True
+
+
+@pytest.mark.django_db
+def test_answer_key_rebuilt_before_commit_is_dropped_on_commit(
+    quiz_lesson, django_capture_on_commit_callbacks
+):
+    from quizzes.grading import _answer_key_cache_key
+    from common.cache import content_cache
+
+    lesson, q1, c1, c2 = quiz_lesson
+    with django_capture_on_commit_callbacks(execute=True):
+        c2.is_answer = True
+        c2.save()
+        # A concurrent grader caches the key built from pre-commit rows
+        content_cache.set(_answer_key_cache_key(lesson.quiz_id), {"stale": True})
+
+    assert content_cache.get(_answer_key_cache_key(lesson.quiz_id)) is None
+
+
+@pytest.mark.django_db
+def test_answer_key_built_before_commit_is_stored_under_old_version(
+    quiz_lesson, django_capture_on_commit_callbacks
+):
+    from quizzes.grading import _answer_key_cache_key
+    from common.cache import content_cache
+
+    lesson, q1, c1, c2 = quiz_lesson
+    # A grader versions its key and reads the rows, then an edit commits
+    # before the grader stores what it built.
+    cache_key = _answer_key_cache_key(lesson.quiz_id)
+    with django_capture_on_commit_callbacks(execute=True):
+        c2.is_answer = True
+        c2.save()
+    content_cache.set(cache_key, {"stale": True})
+
+    assert content_cache.get(_answer_key_cache_key(lesson.quiz_id)) is None
+
+
+@pytest.mark.django_db
+def test_quiz_attempt_is_persisted_on_flush(
+    api_client, user_alice, course_python, quiz_lesson
+):
+    lesson, q1, c1, c2 = quiz_lesson
+    api_client.force_authenticate(user=user_alice)
+    url = f"/api/v1/{course_python.slug}/{lesson.slug}/"
+    data = {"answers": [{"question": str(q1.id), "selected_choice_id": str(c2.id)}]}
+
+    resp = api_client.post(url, data, format="json")
+    assert not QuizAttempt.objects.exists()
+
+    assert flush_attempts() == 1
+    attempt = QuizAttempt.objects.get(pk=resp.data["attempt_id"])
+    assert (attempt.user, attempt.lesson, attempt.passed) == (user_alice, lesson, False)
+    assert (attempt.correct_count, attempt.total_questions) == (0, 1)
+    answer = attempt.answers.get()
+    assert (answer.question, answer.is_correct) == (q1, False)
+    assert list(answer.selected_choices.all()) == [c2]
+    assert flush_attempts() == 0
+
+
+@pytest.mark.django_db
+def test_quiz_attempt_redelivery_is_idempotent(
+    api_client, user_alice, course_python, quiz_lesson
+):
+    lesson, q1, c1, c2 = quiz_lesson
+    api_client.force_authenticate(user=user_alice)
+    url = f"/api/v1/{course_python.slug}/{lesson.slug}/"
+    data = {"answers": [{"question": str(q1.id), "selected_choice_id": str(c1.id)}]}
+    api_client.post(url, data, format="json")
+
+    batches = []
+    attempt_buffer.drain(batches.append)
+    save_attempts(batches[0])
+    save_attempts(batches[0])
+
+    assert QuizAttempt.objects.count() == 1
+    assert QuizAnswer.objects.count() == 1
+
+
+@pytest.fixture
+def multi_quiz_lesson(db, course_python):
+    quiz = Quiz.objects.create(title="Pick all that apply")
+    question = Question.objects.create(
+        quiz=quiz, text="Which are immutable?", type=QuestionType.MULTI
+    )
+    choices = [
+        Choice.objects.create(question=question, text=text, is_answer=is_answer)
+        for text, is_answer in [("tuple", True), ("str", True), ("list", False)]
+    ]
+    lesson = Lesson.objects.create(
+        course=course_python, title="Multi", order=40, type=LessonType.QUIZ, quiz=quiz
+    )
+    return lesson, question, choices
+
+
+def _submit_multi(api_client, course, lesson, question, choices):
+    data = {
+        "answers": [
+            {
+                "question": str(question.id),
+                "selected_choice_ids": [str(c.id) for c in choices],
+            }
+        ]
+    }
+    return api_client.post(f"/api/v1/{course.slug}/{lesson.slug}/", data, format="json")
+
+
+@pytest.mark.django_db
+def test_multi_select_question_keeps_every_answer(multi_quiz_lesson):
+    lesson, question, choices = multi_quiz_lesson
+    assert question.choices.filter(is_answer=True).count() == 2
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize(
+    "picked, passed",
+    [([0, 1], True), ([0], False), ([0, 1, 2], False), ([], False)],
+)
+def test_multi_select_grading_requires_exact_set(
+    api_client, user_alice, course_python, multi_quiz_lesson, picked, passed
+):
+    lesson, question, choices = multi_quiz_lesson
+    api_client.force_authenticate(user=user_alice)
+
+    resp = _submit_multi(
+        api_client, course_python, lesson, question, [choices[i] for i in picked]
+    )
+
+    assert resp.status_code == 201
+    assert resp.data["passed"] is passed
+    assert resp.data["score"] == (1.0 if passed else 0.0)
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("picked, score", [([0], 0.5), ([0, 2], 0.0), ([0, 1], 1.0)])
+def test_multi_select_partial_credit(
+    api_client, user_alice, course_python, multi_quiz_lesson, picked, score
+):
+    lesson, question, choices = multi_quiz_lesson
+    lesson.quiz.partial_credit = True
+    lesson.quiz.save()
+    api_client.force_authenticate(user=user_alice)
+
+    resp = _submit_multi(
+        api_client, course_python, lesson, question, [choices[i] for i in picked]
+    )
+
+    assert resp.data["score"] == score
+    assert resp.data["passed"] is (score == 1.0)
+
+
+@pytest.mark.django_db
+def test_quiz_answer_requires_one_selection_field(
+    api_client, user_alice, course_python, quiz_lesson
+):
+    lesson, q1, c1, c2 = quiz_lesson
+    api_client.force_authenticate(user=user_alice)
+    data = {
+        "answers": [
+            {
+                "question": str(q1.id),
+                "selected_choice_id": str(c1.id),
+                "selected_choice_ids": [str(c1.id)],
+            }
+        ]
+    }
+
+    resp = api_client.post(
+        f"/api/v1/{course_python.slug}/{lesson.slug}/", data, format="json"
+    )
+    assert resp.status_code == 400
@@ -0,0 +1,48 @@
+import pytest
+from django.http import Http404
+from courses.cache import resolve_lesson
+from courses.models import Lesson
+from courses.services import reorder_lessons
+
+
+@pytest.mark.django_db
+def test_resolve_lesson_is_served_from_memory_once_warm(
+    course_python, lesson_decorators, django_assert_num_queries
+):
+    route = resolve_lesson(course_python.slug, lesson_decorators.slug)
+    assert route == (course_python.id, lesson_decorators.id, lesson_decorators.type)
+
+    with django_assert_num_queries(0):
+        assert resolve_lesson(course_python.slug, lesson_decorators.slug) == route
+
+
+@pytest.mark.django_db
+def test_resolve_lesson_unknown_slug_raises_404(course_python):
+    with pytest.raises(Http404):
+        resolve_lesson(course_python.slug, "99")
+
+
+@pytest.mark.django_db
+def test_resolve_lesson_follows_reorder(course_python):
+    first = Lesson.objects.create(course=course_python, title="First")
+    second = Lesson.objects.create(course=course_python, title="Second")
+    assert resolve_lesson(course_python.slug, "01").lesson_id == first.id
+
+    reorder_lessons(course_python, [second.id, first.id])
+
+    assert resolve_lesson(course_python.slug, "01").lesson_id == second.id
+
+
+@pytest.mark.django_db
+def test_resolve_lesson_follows_course_slug_change(course_python, lesson_decorators):
+    resolve_lesson(course_python.slug, lesson_decorators.slug)
+    old_slug = course_python.slug
+
+    course_python.slug = "python-3"
+    course_python.save()
+
+    with pytest.raises(Http404):
+        resolve_lesson(old_slug, lesson_decorators.slug)
+    assert resolve_lesson("python-3", lesson_decorators.slug).lesson_id == (
+        lesson_decorators.id
+    )
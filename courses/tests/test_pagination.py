@@ -0,0 +1,130 @@
+import base64
+import json
+
+import pytest
+from common.enums import ProgressStatus
+from courses.models import Course, Lesson, Progress
+
+
+@pytest.fixture
+def many_courses(db):
+    # Duplicate titles exercise the id tiebreaker.
+    return [
+        Course.objects.create(title=f"Course {i // 2:02d}", slug=f"course-{i:02d}")
+        for i in range(25)
+    ]
+
+
+def _walk(api_client, url):
+    slugs = []
+    while url:
+        resp = api_client.get(url)
+        assert resp.status_code == 200
+        assert "count" not in resp.data
+        slugs += [c["slug"] for c in resp.data["results"]]
+        url = resp.data["next"]
+    return slugs
+
+
+@pytest.mark.django_db
+def test_course_list_keyset_pages_cover_all_rows_once(api_client, many_courses):
+    slugs = _walk(api_client, "/api/v1/courses/?limit=7&cursor=")
+
+    expected = sorted(many_courses, key=lambda c: (c.title, c.id.hex))
+    assert slugs == [c.slug for c in expected]
+
+
+@pytest.mark.django_db
+def test_course_list_keyset_respects_ordering_param(api_client, many_courses):
+    slugs = _walk(api_client, "/api/v1/courses/?limit=10&ordering=-created_at&cursor=")
+
+    expected = sorted(
+        many_courses, key=lambda c: (c.created_at, c.id.hex), reverse=True
+    )
+    assert slugs == [c.slug for c in expected]
+
+
+@pytest.mark.django_db
+def test_course_list_previous_link_returns_prior_page(api_client, many_courses):
+    first = api_client.get("/api/v1/courses/?limit=5&cursor=")
+    second = api_client.get(first.data["next"])
+    back = api_client.get(second.data["previous"])
+
+    assert back.data["results"] == first.data["results"]
+    assert first.data["previous"] is None
+
+
+@pytest.mark.django_db
+def test_course_list_defaults_to_counted_offset_pages(api_client, many_courses):
+    resp = api_client.get("/api/v1/courses/?limit=10&offset=20")
+
+    assert resp.status_code == 200
+    assert resp.data["count"] == 25
+    assert len(resp.data["results"]) == 5
+
+
+def _cursor(**payload):
+    payload = {"f": "title", "v": "Course 01", "id": "x", "r": False, **payload}
+    return base64.urlsafe_b64encode(json.dumps(payload).encode()).decode()
+
+
+@pytest.mark.django_db
+def test_course_list_rejects_invalid_cursor(api_client, many_courses):
+    assert api_client.get("/api/v1/courses/?cursor=garbage").status_code == 404
+    bad_id = _cursor(id="not-a-uuid")
+    assert api_client.get(f"/api/v1/courses/?cursor={bad_id}").status_code == 404
+
+
+@pytest.mark.django_db
+def test_course_list_rejects_cursor_from_other_ordering(api_client, many_courses):
+    first = api_client.get("/api/v1/courses/?limit=5&cursor=")
+    cursor = first.data["next"].split("cursor=")[1].split("&")[0]
+
+    resp = api_client.get(f"/api/v1/courses/?ordering=-created_at&cursor={cursor}")
+
+    assert resp.status_code == 404
+    forged = _cursor(f="-created_at", v="yesterday", id=str(many_courses[0].id))
+    url = f"/api/v1/courses/?ordering=-created_at&cursor={forged}"
+    assert api_client.get(url).status_code == 404
+
+
+@pytest.mark.django_db
+def test_progress_list_keyset_pagination(api_client, user_alice, course_python):
+    for i in range(1, 6):
+        lesson = Lesson.objects.create(course=course_python, title=f"L{i}", order=i)
+        Progress.objects.create(
+            user=user_alice, lesson=lesson, status=ProgressStatus.COMPLETED
+        )
+    api_client.force_authenticate(user=user_alice)
+
+    resp = api_client.get("/api/v1/lessons/progress/?limit=2&cursor=")
+    seen = []
+    while True:
+        seen += [p["id"] for p in resp.data["results"]]
+        if not resp.data["next"]:
+            break
+        resp = api_client.get(resp.data["next"])
+
+    assert len(seen) == len(set(seen)) == 5
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("ordering", ["lesson", "id", "-status", "updated_at"])
+def test_progress_keyset_ordering_is_limited_to_plain_fields(
+    api_client, user_alice, course_python, ordering
+):
+    for i in range(1, 4):
+        lesson = Lesson.objects.create(course=course_python, title=f"L{i}", order=i)
+        Progress.objects.create(user=user_alice, lesson=lesson)
+    api_client.force_authenticate(user=user_alice)
+
+    resp = api_client.get(
+        f"/api/v1/lessons/progress/?limit=2&cursor=&ordering={ordering}"
+    )
+    assert resp.status_code == 200
+    seen = [p["id"] for p in resp.data["results"]]
+    resp = api_client.get(resp.data["next"])
+    assert resp.status_code == 200
+    seen += [p["id"] for p in resp.data["results"]]
+
+    assert len(seen) == len(set(seen)) == 3
@@ -1,6 +1,12 @@
+import base64
+import json
+
 import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from common.enums import ProgressStatus
-from courses.models import Progress
+from courses import services
+from courses.models import Lesson, Progress, ProgressTombstone
 
 
 @pytest.mark.django_db
@@ -91,3 +97,144 @@ def test_get_progress_by_lesson_id(api_client, user_alice, lesson_decorators):
 
     assert response.status_code == 200
     assert response.data["status"] == ProgressStatus.COMPLETED
+
+
+@pytest.fixture
+def syllabus(course_python):
+    return [
+        Lesson.objects.create(course=course_python, title=f"Lesson {i}", order=i)
+        for i in range(1, 6)
+    ]
+
+
+@pytest.mark.django_db
+def test_batch_complete_and_read_progress(
+    api_client, user_alice, course_python, syllabus, django_assert_num_queries
+):
+    api_client.force_authenticate(user=user_alice)
+    Progress.objects.create(
+        user=user_alice, lesson=syllabus[0], status=ProgressStatus.COMPLETED
+    )
+
+    resp = api_client.post(
+        "/api/v1/lessons/progress/complete/",
+        {"lesson_ids": [str(lesson.id) for lesson in syllabus[:3]]},
+        format="json",
+    )
+    assert resp.status_code == 200
+    assert len(resp.data) == 3
+    assert (
+        Progress.objects.filter(
+            user=user_alice, status=ProgressStatus.COMPLETED
+        ).count()
+        == 3
+    )
+
+    with django_assert_num_queries(1):
+        resp = api_client.get(
+            f"/api/v1/lessons/progress/batch/?course={course_python.slug}"
+        )
+    assert {p["lesson"] for p in resp.data} == {lesson.id for lesson in syllabus[:3]}
+
+    ids = "&".join(f"lesson_ids={lesson.id}" for lesson in syllabus[2:])
+    resp = api_client.get(f"/api/v1/lessons/progress/batch/?{ids}")
+    assert [p["lesson"] for p in resp.data] == [syllabus[2].id]
+    assert Progress.objects.filter(user=user_alice).count() == 3
+
+
+@pytest.mark.django_db
+def test_batch_progress_validation(api_client, user_alice, syllabus):
+    api_client.force_authenticate(user=user_alice)
+
+    assert api_client.get("/api/v1/lessons/progress/batch/").status_code == 400
+    resp = api_client.post(
+        "/api/v1/lessons/progress/complete/",
+        {"lesson_ids": [str(syllabus[0].id), "00000000-0000-0000-0000-000000000000"]},
+        format="json",
+    )
+    assert resp.status_code == 400
+    assert not Progress.objects.exists()
+
+
+def _sync(api_client, cursor=None, limit=None):
+    params = {}
+    if cursor:
+        params["cursor"] = cursor
+    if limit:
+        params["limit"] = limit
+    return api_client.get("/api/v1/lessons/progress/sync/", params)
+
+
+@pytest.mark.django_db
+def test_progress_sync_returns_only_changes_since_cursor(
+    api_client, user_alice, user_bob, syllabus
+):
+    api_client.force_authenticate(user=user_alice)
+    for lesson in syllabus[:3]:
+        Progress.objects.create(user=user_alice, lesson=lesson)
+    Progress.objects.create(user=user_bob, lesson=syllabus[0])
+
+    # Initial download, two pages
+    first = _sync(api_client, limit=2)
+    assert first.data["has_more"] is True
+    second = _sync(api_client, first.data["cursor"], limit=2)
+    assert second.data["has_more"] is False
+    synced = first.data["changes"] + second.data["changes"]
+    assert {p["lesson"] for p in synced} == {lesson.id for lesson in syllabus[:3]}
+
+    cursor = second.data["cursor"]
+    assert _sync(api_client, cursor).data["changes"] == []
+
+    services.complete_lesson_for_user(user_alice, syllabus[1].id)
+    removed = Progress.objects.get(user=user_alice, lesson=syllabus[2])
+    removed_id = str(removed.id)
+    removed.delete()
+
+    delta = _sync(api_client, cursor).data
+    assert [p["lesson"] for p in delta["changes"]] == [syllabus[1].id]
+    assert delta["changes"][0]["status"] == ProgressStatus.COMPLETED
+    assert [t["id"] for t in delta["deleted"]] == [removed_id]
+    assert _sync(api_client, delta["cursor"]).data["deleted"] == []
+
+
+@pytest.mark.django_db
+def test_progress_sync_rejects_bad_and_expired_cursors(
+    api_client, user_alice, settings
+):
+    api_client.force_authenticate(user=user_alice)
+    assert _sync(api_client, "garbage").status_code == 400
+    ts = "2026-01-01T00:00:00+00:00"
+    for payload in (
+        {"p": None, "t": ["2026-01-01T00:00:00", None]},  # naive timestamp
+        {"p": None, "t": 5},
+        {"p": "abc", "t": [ts, None]},
+        {"p": [ts, "not-a-uuid"], "t": [ts, None]},
+        {"p": None, "t": None},
+    ):
+        token = base64.urlsafe_b64encode(json.dumps(payload).encode()).decode()
+        assert _sync(api_client, token).status_code == 400, payload
+
+    cursor = _sync(api_client).data["cursor"]
+    settings.PROGRESS_TOMBSTONE_RETENTION_DAYS = -1
+    assert _sync(api_client, cursor).status_code == 410
+
+
+@pytest.mark.django_db
+def test_cascaded_progress_deletes_write_tombstones_in_bulk(
+    user_alice, user_bob, syllabus
+):
+    for user in (user_alice, user_bob):
+        for lesson in syllabus:
+            Progress.objects.create(user=user, lesson=lesson)
+    deleted = set(
+        Progress.objects.filter(user=user_alice).values_list("id", flat=True)
+    ) | set(Progress.objects.filter(lesson=syllabus[0]).values_list("id", flat=True))
+    table = ProgressTombstone._meta.db_table
+
+    with CaptureQueriesContext(connection) as ctx:
+        syllabus[0].delete()
+        user_alice.delete()
+
+    inserts = [q for q in ctx.captured_queries if q["sql"].startswith("INSERT")]
+    assert [table in q["sql"] for q in inserts] == [True, True]
+    assert set(ProgressTombstone.objects.values_list("id", flat=True)) == deleted
@@ -0,0 +1,128 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from common.enums import LessonType, ProgressStatus, SubmissionStatus
+from courses import services
+from courses.models import Lesson, Progress
+from judge.models import Problem, Submission, TestCase
+from quizzes.models import Choice, Question, Quiz
+
+
+@pytest.fixture
+def large_course(course_python, language_python):
+    """A course with 40 lessons alternating between judge problems and quizzes."""
+    for i in range(1, 41):
+        if i % 2:
+            problem = Problem.objects.create(title=f"Problem {i}", slug=f"p-{i}")
+            problem.allowed_languages.add(language_python)
+            TestCase.objects.create(
+                problem=problem, input_data="1", expected_output="1", hidden=False
+            )
+            TestCase.objects.create(
+                problem=problem, input_data="2", expected_output="2", hidden=True
+            )
+            Lesson.objects.create(
+                course=course_python, title=f"Lesson {i}", order=i, problem=problem
+            )
+        else:
+            quiz = Quiz.objects.create(title=f"Quiz {i}")
+            for q in range(3):
+                question = Question.objects.create(quiz=quiz, text=f"Q{q}")
+                Choice.objects.create(question=question, text="yes", is_answer=True)
+                Choice.objects.create(question=question, text="no")
+            Lesson.objects.create(
+                course=course_python,
+                title=f"Lesson {i}",
+                order=i,
+                type=LessonType.QUIZ,
+                quiz=quiz,
+            )
+    return course_python
+
+
+@pytest.mark.django_db
+def test_course_detail_query_budget(api_client, user_alice, large_course, query_budget):
+    api_client.force_authenticate(user=user_alice)
+
+    with query_budget("course-detail"):
+        resp = api_client.get(f"/api/v1/{large_course.slug}/")
+
+    assert resp.status_code == 200
+    lessons = resp.data["lessons"]
+    assert len(lessons) == 40
+    assert len(lessons[0]["problem"]["sample_testcases"]) == 1
+    assert lessons[0]["problem"]["allowed_languages"][0]["key"] == "python"
+    assert len(lessons[1]["quiz"]["questions"][0]["choices"]) == 2
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("lesson_slug", ["01", "02"])
+def test_lesson_detail_query_budget(
+    api_client, user_alice, large_course, query_budget, lesson_slug
+):
+    api_client.force_authenticate(user=user_alice)
+    url = f"/api/v1/{large_course.slug}/{lesson_slug}/"
+    api_client.get(url)  # warm the lesson route cache
+
+    with query_budget("lesson-detail"):
+        resp = api_client.get(url)
+
+    assert resp.status_code == 200
+
+
+@pytest.mark.django_db
+def test_lesson_detail_user_state_and_revalidation(
+    api_client, user_alice, large_course, language_python, django_assert_num_queries
+):
+    lesson = Lesson.objects.get(course=large_course, slug="01")
+    Progress.objects.create(
+        user=user_alice, lesson=lesson, status=ProgressStatus.COMPLETED
+    )
+    Submission.objects.create(
+        user=user_alice,
+        problem=lesson.problem,
+        language=language_python,
+        code="print(1)",
+        status=SubmissionStatus.ACCEPTED,
+        summary={"passed": 2, "total": 2},
+    )
+    api_client.force_authenticate(user=user_alice)
+    url = f"/api/v1/{large_course.slug}/01/"
+
+    resp = api_client.get(url)
+    assert resp.data["progress"]["status"] == ProgressStatus.COMPLETED
+    assert resp.data["latest_submission"]["status"] == SubmissionStatus.ACCEPTED
+    assert resp.data["latest_submission"]["summary"] == {"passed": 2, "total": 2}
+
+    with django_assert_num_queries(1):
+        assert api_client.get(url, HTTP_IF_NONE_MATCH=resp["ETag"]).status_code == 304
+
+
+@pytest.mark.django_db
+def test_lesson_user_state_reads_latest_submission_once(
+    user_alice, user_bob, large_course, language_python
+):
+    lesson = Lesson.objects.get(course=large_course, slug="01")
+    for user, status in (
+        (user_alice, SubmissionStatus.WRONG_ANSWER),
+        (user_alice, SubmissionStatus.ACCEPTED),
+        (user_bob, SubmissionStatus.QUEUED),
+    ):
+        Submission.objects.create(
+            user=user,
+            problem=lesson.problem,
+            language=language_python,
+            code="print(1)",
+            status=status,
+        )
+    lessons = services.annotate_user_state(
+        Lesson.objects.filter(pk=lesson.pk), user_alice
+    )
+
+    with CaptureQueriesContext(connection) as ctx:
+        lesson = lessons.get()
+
+    assert ctx.captured_queries[0]["sql"].count("SELECT") == 2
+    progress, submission = services.user_state_from_annotations(lesson)
+    assert progress is None
+    assert submission.status == SubmissionStatus.ACCEPTED
@@ -0,0 +1,98 @@
+import pytest
+from courses.models import Lesson
+from courses.tasks import render_lessons
+
+
+@pytest.mark.django_db
+def test_lesson_markdown_rendered_and_sanitized_on_save(course_python):
+    lesson = Lesson.objects.create(
+        course=course_python,
+        title="Rendering",
+        content_md="# Title\n\nSome **bold** text.<script>alert(1)</script>",
+    )
+
+    assert "<h1>Title</h1>" in lesson.content_html
+    assert "<strong>bold</strong>" in lesson.content_html
+    assert "<script>" not in lesson.content_html
+    assert lesson.content_excerpt == "Title Some bold text."
+
+
+@pytest.mark.django_db
+def test_lesson_rerendered_only_when_content_changes(course_python, monkeypatch):
+    lesson = Lesson.objects.create(course=course_python, title="L", content_md="one")
+    calls = []
+    monkeypatch.setattr(
+        "courses.rendering.render_markdown", lambda md: calls.append(md) or md
+    )
+
+    lesson.title = "Renamed"
+    lesson.save()
+    assert calls == []
+
+    lesson.content_md = "two"
+    lesson.save(update_fields=["content_md"])
+    lesson.refresh_from_db()
+    assert calls == ["two"]
+    assert lesson.content_html == "two"
+
+
+@pytest.mark.django_db
+def test_render_task_renders_bulk_created_lessons(course_python):
+    Lesson.objects.bulk_create(
+        [
+            Lesson(course=course_python, title=f"L{i}", order=i, content_md=f"*{i}*")
+            for i in range(1, 4)
+        ]
+    )
+
+    assert render_lessons() == 3
+
+    assert [lesson.content_html for lesson in Lesson.objects.all()] == [
+        "<p><em>1</em></p>",
+        "<p><em>2</em></p>",
+        "<p><em>3</em></p>",
+    ]
+
+
+@pytest.mark.django_db
+def test_render_task_invalidates_cached_course_detail(
+    api_client, course_python, lesson_decorators
+):
+    url = f"/api/v1/{course_python.slug}/"
+    first = api_client.get(url)
+    Lesson.objects.filter(pk=lesson_decorators.pk).update(
+        content_md="Rewritten", content_hash=""
+    )
+
+    render_lessons()
+
+    resp = api_client.get(url, HTTP_IF_NONE_MATCH=first["ETag"])
+    assert resp.status_code == 200
+    assert resp.data["lessons"][0]["excerpt"] == "Rewritten"
+
+
+@pytest.mark.django_db
+def test_course_detail_ships_excerpts_and_lesson_detail_html(
+    api_client, course_python, lesson_decorators
+):
+    lesson = api_client.get(f"/api/v1/{course_python.slug}/").data["lessons"][0]
+    assert lesson["excerpt"] == "Decorators"
+    assert "content_md" not in lesson
+    assert "content_html" not in lesson
+
+    url = f"/api/v1/{course_python.slug}/{lesson_decorators.slug}/"
+    detail = api_client.get(f"{url}?content=html")
+    assert detail.data["content_html"] == "<h1>Decorators</h1>"
+    assert "content_md" not in detail.data
+    assert "excerpt" not in detail.data
+
+    md = api_client.get(url)
+    assert md.data["content_md"] == "# Decorators"
+    assert "content_html" not in md.data
+    assert md["ETag"] != detail["ETag"]
+
+    excerpt = api_client.get(f"{url}?content=excerpt")
+    assert excerpt.data["excerpt"] == "Decorators"
+    assert "content_html" not in excerpt.data
+
+    assert api_client.get(f"{url}?content=pdf").status_code == 400
@@ -0,0 +1,82 @@
+import pytest
+from courses import search
+from courses.models import Course, Lesson, Tag
+
+
+@pytest.mark.django_db
+def test_search_finds_lesson_content_with_snippet(
+    api_client, course_python, lesson_decorators
+):
+    lesson_decorators.content_md = "A decorator wraps a function with closures."
+    lesson_decorators.save()
+
+    resp = api_client.get("/api/v1/courses/search/?q=closures")
+
+    assert resp.status_code == 200
+    assert len(resp.data) == 1
+    result = resp.data[0]
+    assert result["type"] == "lesson"
+    assert result["course_slug"] == course_python.slug
+    assert result["lesson_slug"] == lesson_decorators.slug
+    assert "<mark>closures</mark>" in result["snippet"]
+
+
+@pytest.mark.django_db
+def test_search_snippet_escapes_stored_html(api_client):
+    Course.objects.create(
+        title="Images",
+        slug="images",
+        description="<img src=x onerror=alert(1)> images everywhere",
+    )
+
+    resp = api_client.get("/api/v1/courses/search/?q=everywhere")
+
+    snippet = resp.data[0]["snippet"]
+    assert "<img" not in snippet
+    assert "&lt;img src=x onerror=alert(1)&gt;" in snippet
+    assert "<mark>everywhere</mark>" in snippet
+
+
+@pytest.mark.django_db
+def test_search_ranks_title_matches_first(api_client, course_python):
+    Lesson.objects.create(
+        course=course_python, title="Iterators", content_md="Generators build iterators"
+    )
+    Lesson.objects.create(course=course_python, title="Generators", content_md="yield")
+
+    titles = [
+        r["title"] for r in api_client.get("/api/v1/courses/search/?q=generator").data
+    ]
+
+    assert titles == ["Generators", "Iterators"]
+
+
+@pytest.mark.django_db
+def test_search_covers_course_tags_and_follows_updates(api_client, course_python):
+    assert search.search("python")[0]["course_slug"] == course_python.slug
+
+    course_python.tags.add(Tag.objects.create(name="Metaprogramming"))
+    assert [r["type"] for r in search.search("metaprogramming")] == ["course"]
+
+    course_python.delete()
+    assert search.search("metaprogramming") == []
+
+
+@pytest.mark.django_db
+def test_search_ignores_query_syntax(api_client, course_python):
+    resp = api_client.get('/api/v1/courses/search/?q="python" OR (NEAR')
+    assert resp.status_code == 200
+
+
+@pytest.mark.django_db
+def test_search_requires_query(api_client):
+    assert api_client.get("/api/v1/courses/search/").status_code == 400
+
+
+@pytest.mark.django_db
+def test_course_list_search_uses_full_text_index(api_client, course_python):
+    Course.objects.create(title="Rust", slug="rust", description="Ownership")
+
+    resp = api_client.get("/api/v1/courses/?search=ownership")
+
+    assert [c["slug"] for c in resp.data["results"]] == ["rust"]
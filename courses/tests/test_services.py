@@ -1,6 +1,7 @@
 import pytest
 from courses import services
 from common.enums import ProgressStatus
+from courses.models import Progress
 
 
 @pytest.mark.django_db
@@ -27,3 +28,49 @@ def test_complete_lesson_for_user(user_alice, lesson_decorators):
     assert progress.status == ProgressStatus.COMPLETED
     assert progress.user == user_alice
     assert progress.lesson == lesson_decorators
+
+
+@pytest.mark.django_db
+def test_progress_upserts_are_single_statements(
+    user_alice, lesson_decorators, django_assert_num_queries
+):
+    with django_assert_num_queries(1):
+        services.get_or_create_progress(user_alice, lesson_decorators.id)
+    with django_assert_num_queries(1):
+        progress = services.complete_lesson_for_user(user_alice, lesson_decorators.id)
+
+    assert progress.status == ProgressStatus.COMPLETED
+    assert Progress.objects.get(user=user_alice, lesson=lesson_decorators) == progress
+
+
+@pytest.mark.django_db
+def test_progress_upsert_keeps_existing_row(user_alice, lesson_decorators):
+    completed = services.complete_lesson_for_user(user_alice, lesson_decorators.id)
+
+    again = services.complete_lesson_for_user(user_alice, lesson_decorators.id)
+    progress, created = services.get_or_create_progress(
+        user_alice, lesson_decorators.id
+    )
+
+    assert created is False
+    assert progress.status == ProgressStatus.COMPLETED
+    assert progress.id == again.id == completed.id
+    assert again.updated_at == completed.updated_at
+
+
+@pytest.mark.django_db
+def test_get_or_create_progress_never_writes_existing_rows(
+    user_alice, lesson_decorators, django_assert_num_queries
+):
+    services.get_or_create_progress(user_alice, lesson_decorators.id)
+
+    with django_assert_num_queries(2) as ctx:
+        progress, created = services.get_or_create_progress(
+            user_alice, lesson_decorators.id
+        )
+
+    assert created is False
+    assert progress.user == user_alice
+    insert, select = (query["sql"] for query in ctx.captured_queries)
+    assert "DO NOTHING" in insert
+    assert select.startswith("SELECT")
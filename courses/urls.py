@@ -1,5 +1,5 @@
 from django.urls import path
-from .views import CourseViewSet, LessonProgressView, LessonView
+from .views import CourseViewSet, LessonProgressView, LessonView, SearchView
 
 course_list = CourseViewSet.as_view({"get": "list", "post": "create"})
 course_detail = CourseViewSet.as_view(
@@ -11,16 +11,33 @@ course_detail = CourseViewSet.as_view(
     }
 )
 course_resume = CourseViewSet.as_view({"get": "resume"})
+course_reorder = CourseViewSet.as_view({"post": "reorder"})
 course_my = CourseViewSet.as_view({"get": "my_courses"})
 
 urlpatterns = [
     path("courses/my/", course_my, name="course-my"),
+    path("courses/search/", SearchView.as_view(), name="course-search"),
     path("courses/", course_list, name="course-list"),
     path(
         "lessons/progress/",
         LessonProgressView.as_view({"get": "list"}),
         name="progress-list",
     ),
+    path(
+        "lessons/progress/batch/",
+        LessonProgressView.as_view({"get": "batch"}),
+        name="progress-batch",
+    ),
+    path(
+        "lessons/progress/sync/",
+        LessonProgressView.as_view({"get": "sync"}),
+        name="progress-sync",
+    ),
+    path(
+        "lessons/progress/complete/",
+        LessonProgressView.as_view({"post": "complete_batch"}),
+        name="progress-complete-batch",
+    ),
     path(
         "lessons/by-lesson/<uuid:lesson_id>/",
         LessonProgressView.as_view({"get": "by_lesson"}),
@@ -32,6 +49,7 @@ urlpatterns = [
         name="lesson-complete",
     ),
     path("<slug:slug>/resume/", course_resume, name="course-resume"),
+    path("<slug:slug>/reorder/", course_reorder, name="course-reorder"),
     path("<slug:slug>/", course_detail, name="course-detail"),
     path(
         "<slug:course_slug>/<slug:lesson_slug>/",
@@ -8,7 +8,8 @@ from rest_framework import (
     serializers,
 )
 from django_filters.rest_framework import DjangoFilterBackend
-from django.db.models import Prefetch
+from django.db.models import Prefetch, prefetch_related_objects
+from django.http import Http404
 from django.shortcuts import get_object_or_404
 from rest_framework.views import APIView
 from rest_framework.response import Response
@@ -19,21 +20,36 @@ from .models import Course, Lesson, Progress
 from .serializers import (
     CourseListSer,
     CourseDetailSer,
+    ProgressBatchCompleteSer,
+    ProgressBatchQuerySer,
     ProgressSer,
     ProgressLiteSer,
+    ProgressSyncQuerySer,
+    ProgressSyncSer,
+    LessonContentQuerySer,
     LessonLiteSer,
     LessonSerializer,
+    LessonOrderSer,
     MyCourseSerializer,
+    ReorderLessonsSer,
+    SearchQuerySer,
+    SearchResultSer,
+    lesson_content_prefetches,
 )
-from .filters import CourseFilter
-from . import services
+from .filters import CourseFilter, FullTextSearchFilter
+from . import search, services
+from . import cache as course_cache
+from common import conditional
+from common.pagination import OptionalKeysetPagination
 from common.permissions import IsTeacherOrReadOnly
 from common.enums import LessonType, ProgressStatus
 
-from judge.models import Language, Submission
+from judge import cache as judge_cache
+from judge.models import Submission
 from judge.serializers import SubmitSer
 from judge.tasks import run_submission
-from quizzes.serializers import AttemptSubmitSer
+from quizzes import attempts, grading
+from quizzes.serializers import AttemptSubmitSer, QuizAnswerSer
 from rest_framework import status
 from rest_framework.permissions import IsAuthenticated
 import logging
@@ -42,6 +58,21 @@ from celery.exceptions import TimeoutError
 logger = logging.getLogger(__name__)
 
 
+def content_validators(request, *parts, stamps=()):
+    """
+    Returns (etag, last_modified) for a content response from the shared
+    content version plus any per-user (count, updated_at) `stamps`.
+    """
+    version, last_modified = course_cache.get_content_stamp()
+    parts = [*parts, version]
+    if request.user.is_authenticated:
+        parts.append(request.user.pk)
+    for count, updated_at in stamps:
+        parts += [count, updated_at]
+        last_modified = max(last_modified, updated_at)
+    return conditional.make_etag(*parts), last_modified
+
+
 class CourseViewSet(viewsets.ModelViewSet):
     queryset = Course.objects.all().order_by("title")
     permission_classes = [IsTeacherOrReadOnly]
@@ -49,12 +80,14 @@ class CourseViewSet(viewsets.ModelViewSet):
 
     filter_backends = [
         DjangoFilterBackend,
-        filters.SearchFilter,
+        FullTextSearchFilter,
         filters.OrderingFilter,
     ]
     filterset_class = CourseFilter
     search_fields = ["title", "description"]
     ordering_fields = ["title", "created_at"]
+    pagination_class = OptionalKeysetPagination
+    keyset_ordering = "title"
 
     def get_serializer_class(self):
         return CourseDetailSer if self.action == "retrieve" else CourseListSer
@@ -62,15 +95,18 @@ class CourseViewSet(viewsets.ModelViewSet):
     def get_queryset(self):
         qs = super().get_queryset()
         if self.action == "retrieve":
-            qs = qs.prefetch_related("lessons", "lessons__problem", "lessons__quiz")
-            if self.request.user.is_authenticated:
-                qs = qs.prefetch_related(
-                    Prefetch(
-                        "lessons__progress_set",
-                        queryset=Progress.objects.filter(user=self.request.user),
-                        to_attr="user_progress",
-                    )
-                )
+            qs = qs.prefetch_related(
+                "tags",
+                Prefetch(
+                    "lessons",
+                    queryset=Lesson.objects.defer(
+                        "content_md", "content_html", "search_vector"
+                    ),
+                ),
+                "lessons__problem",
+                "lessons__quiz",
+                *lesson_content_prefetches("lessons__"),
+            )
         return qs
 
     @extend_schema(
@@ -79,7 +115,12 @@ class CourseViewSet(viewsets.ModelViewSet):
         description="Returns a paginated list of all available courses. Supports filtering by publication status and searching by title or description.",
     )
     def list(self, request, *args, **kwargs):
-        return super().list(request, *args, **kwargs)
+        etag, last_modified = content_validators(request, request.get_full_path())
+        not_modified = conditional.not_modified(request, etag, last_modified)
+        if not_modified is not None:
+            return not_modified
+        resp = super().list(request, *args, **kwargs)
+        return conditional.set_validators(resp, etag, last_modified)
 
     @extend_schema(
         tags=["Courses"],
@@ -95,18 +136,44 @@ class CourseViewSet(viewsets.ModelViewSet):
         description="Returns detailed information about a single course, including its list of lessons. If the user is authenticated, it also includes their progress for each lesson.",
     )
     def retrieve(self, request, *args, **kwargs):
-        instance = self.get_object()
-        progress_map = {}
-
+        # The lesson tree is identical for every user, so it is served from the
+        # shared cache; only the caller's progress is looked up per request.
+        slug = kwargs[self.lookup_field]
+        stamps = []
         if request.user.is_authenticated:
-            for lesson in instance.lessons.all():
-                if hasattr(lesson, "user_progress") and lesson.user_progress:
-                    progress_map[lesson.id] = lesson.user_progress[0]
+            stamps.append(services.get_progress_stamp(request.user, course__slug=slug))
+        etag, last_modified = content_validators(
+            request, "course-detail", slug, stamps=stamps
+        )
+        not_modified = conditional.not_modified(request, etag, last_modified)
+        if not_modified is not None:
+            return not_modified
 
-        context = self.get_serializer_context()
-        context["progress_map"] = progress_map
-        serializer = self.get_serializer(instance, context=context)
-        return response.Response(serializer.data)
+        cache_key = course_cache.course_detail_key(slug)
+        data = course_cache.get_course_detail(cache_key)
+        if data is None:
+            serializer = self.get_serializer(self.get_object())
+            data = serializer.data
+            course_cache.set_course_detail(cache_key, data)
+
+        if request.user.is_authenticated:
+            status_map = services.get_course_status_map(request.user, data["id"])
+            data = {
+                **data,
+                "lessons": [
+                    {
+                        **lesson,
+                        "progress": (
+                            {"status": status_map[lesson["id"]]}
+                            if lesson["id"] in status_map
+                            else None
+                        ),
+                    }
+                    for lesson in data["lessons"]
+                ],
+            }
+        resp = response.Response(data)
+        return conditional.set_validators(resp, etag, last_modified)
 
     @extend_schema(
         tags=["Courses"],
@@ -224,6 +291,40 @@ class CourseViewSet(viewsets.ModelViewSet):
 
         return Response({"lesson_slug": next_lesson.slug})
 
+    @extend_schema(
+        tags=["Courses"],
+        summary="Reorder lessons",
+        description="Renumbers all lessons of a course in the given order within one transaction. Lesson slugs follow their new positions. Restricted to teachers/staff.",
+        request=ReorderLessonsSer,
+        responses={200: LessonOrderSer(many=True)},
+    )
+    @decorators.action(detail=True, methods=["post"])
+    def reorder(self, request, slug=None):
+        course = self.get_object()
+        ser = ReorderLessonsSer(data=request.data, context={"course": course})
+        ser.is_valid(raise_exception=True)
+        lessons = services.reorder_lessons(course, ser.validated_data["lessons"])
+        return Response(LessonOrderSer(lessons, many=True).data)
+
+
+class SearchView(APIView):
+    permission_classes = [AllowAny]
+
+    @extend_schema(
+        tags=["Courses"],
+        parameters=[SearchQuerySer],
+        responses={200: SearchResultSer(many=True)},
+        summary="Search courses and lessons",
+        description="Full-text search over course titles, descriptions and tags and over lesson titles and content. Results are ranked by relevance and include a snippet with matching terms wrapped in <mark> tags.",
+    )
+    def get(self, request):
+        params = SearchQuerySer(data=request.query_params)
+        params.is_valid(raise_exception=True)
+        results = search.search(
+            params.validated_data["q"], limit=params.validated_data["limit"]
+        )
+        return Response(SearchResultSer(results, many=True).data)
+
 
 class LessonProgressView(
     mixins.ListModelMixin,
@@ -234,6 +335,9 @@ class LessonProgressView(
     queryset = Progress.objects.all()
     serializer_class = ProgressSer
     permission_classes = [permissions.IsAuthenticated]
+    pagination_class = OptionalKeysetPagination
+    ordering_fields = ["created_at", "updated_at"]
+    keyset_ordering = "-created_at"
 
     def get_queryset(self):
         return Progress.objects.filter(user=self.request.user)
@@ -263,6 +367,64 @@ class LessonProgressView(
         prg = services.complete_lesson_for_user(user=request.user, lesson_id=lesson_id)
         return response.Response(ProgressSer(prg).data)
 
+    @extend_schema(
+        tags=["Progress"],
+        parameters=[ProgressBatchQuerySer],
+        responses={200: ProgressSer(many=True)},
+        summary="Get progress for many lessons",
+        description="Returns the authenticated user's progress on the given lessons, or on every lesson of a course, in one request. Lessons without progress are omitted; no progress is created.",
+    )
+    @decorators.action(detail=False, methods=["get"])
+    def batch(self, request):
+        params = ProgressBatchQuerySer(data=request.query_params)
+        params.is_valid(raise_exception=True)
+        if "course" in params.validated_data:
+            lesson_filter = {"lesson__course__slug": params.validated_data["course"]}
+        else:
+            lesson_filter = {"lesson_id__in": params.validated_data["lesson_ids"]}
+        progress = self.get_queryset().filter(**lesson_filter)
+        return response.Response(ProgressSer(progress, many=True).data)
+
+    @extend_schema(
+        tags=["Progress"],
+        parameters=[ProgressSyncQuerySer],
+        responses={200: ProgressSyncSer},
+        summary="Sync progress changes",
+        description="Returns the authenticated user's progress rows changed or deleted since `cursor`, oldest first. Without a cursor every row is returned. Call again with the returned cursor while `has_more` is true, and keep the last cursor for the next sync. Responds 410 when the cursor is older than the deletion history; the client must then sync from scratch.",
+    )
+    @decorators.action(detail=False, methods=["get"])
+    def sync(self, request):
+        params = ProgressSyncQuerySer(data=request.query_params)
+        params.is_valid(raise_exception=True)
+        cursor = params.validated_data.get("cursor")
+        if cursor is not None:
+            _, (deleted_since, _) = cursor
+            if deleted_since < services.tombstone_horizon():
+                return response.Response(
+                    {"detail": "Sync cursor expired; sync from scratch."},
+                    status=status.HTTP_410_GONE,
+                )
+        result = services.sync_progress(
+            request.user, cursor, limit=params.validated_data["limit"]
+        )
+        return response.Response(ProgressSyncSer(result).data)
+
+    @extend_schema(
+        tags=["Progress"],
+        request=ProgressBatchCompleteSer,
+        responses={200: ProgressSer(many=True)},
+        summary="Mark many lessons as complete",
+        description="Marks every given lesson as completed for the authenticated user with a single bulk upsert.",
+    )
+    @decorators.action(detail=False, methods=["post"])
+    def complete_batch(self, request):
+        ser = ProgressBatchCompleteSer(data=request.data)
+        ser.is_valid(raise_exception=True)
+        progress = services.complete_lessons_for_user(
+            request.user, ser.validated_data["lesson_ids"]
+        )
+        return response.Response(ProgressSer(progress, many=True).data)
+
 
 class LessonView(APIView):
     serializer_class = LessonSerializer
@@ -277,41 +439,54 @@ class LessonView(APIView):
     @extend_schema(
         tags=["Courses"],
         operation_id="v1_lesson_detail",
+        parameters=[LessonContentQuerySer],
         responses={200: LessonLiteSer},
         summary="Retrieve lesson details",
-        description="Returns the full content of a lesson, including the associated problem or quiz. Includes user-specific progress if authenticated.",
+        description="Returns the content of a lesson, including the associated problem or quiz. The content comes as markdown (`content_md`, the default), sanitized HTML (`content_html`) or a short excerpt (`excerpt`), selected with `?content=`. Includes user-specific progress if authenticated.",
     )
     def get(self, request, course_slug=None, lesson_slug=None):
-        course = get_object_or_404(Course, slug=course_slug)
-        lesson = get_object_or_404(
-            Lesson.objects.select_related("problem", "quiz"),
-            course=course,
-            slug=lesson_slug,
+        params = LessonContentQuerySer(data=request.query_params)
+        params.is_valid(raise_exception=True)
+        content = params.validated_data["content"]
+
+        # The slugs resolve from the route cache; the caller's progress and
+        # latest submission ride along with the lesson as subquery annotations.
+        route = course_cache.resolve_lesson(course_slug, lesson_slug)
+        lessons = Lesson.objects.select_related("problem", "quiz").filter(
+            pk=route.lesson_id
         )
+        if request.user.is_authenticated:
+            lessons = services.annotate_user_state(lessons, request.user)
+        lesson = get_object_or_404(lessons)
 
         progress_map = {}
         submission_map = {}
+        stamps = []
         if request.user.is_authenticated:
-            progress_obj = Progress.objects.filter(
-                user=request.user, lesson=lesson
-            ).first()
-            if progress_obj:
-                progress_map[lesson.id] = progress_obj
-
-            if lesson.problem:
-                sub = (
-                    Submission.objects.filter(user=request.user, problem=lesson.problem)
-                    .order_by("-created_at")
-                    .first()
-                )
-                if sub:
-                    submission_map[lesson.id] = sub
+            progress, submission = services.user_state_from_annotations(lesson)
+            if progress:
+                progress_map[lesson.id] = progress
+            if submission:
+                submission_map[lesson.id] = submission
+            stamps = services.user_state_stamps(lesson)
+        etag, last_modified = content_validators(
+            request, "lesson-detail", course_slug, lesson_slug, content, stamps=stamps
+        )
+        not_modified = conditional.not_modified(request, etag, last_modified)
+        if not_modified is not None:
+            return not_modified
 
+        prefetch_related_objects([lesson], *lesson_content_prefetches())
         serializer = LessonLiteSer(
             lesson,
-            context={"progress_map": progress_map, "submission_map": submission_map},
+            context={
+                "progress_map": progress_map,
+                "submission_map": submission_map,
+                "content": content,
+            },
         )
-        return Response(serializer.data)
+        resp = Response(serializer.data)
+        return conditional.set_validators(resp, etag, last_modified)
 
     @extend_schema(
         tags=["Courses"],
@@ -321,7 +496,7 @@ class LessonView(APIView):
             fields={
                 "language": serializers.CharField(required=False),
                 "code": serializers.CharField(required=False),
-                "answers": serializers.ListField(required=False),
+                "answers": QuizAnswerSer(many=True, required=False),
             },
         ),
         responses={
@@ -334,6 +509,8 @@ class LessonView(APIView):
                     "status": serializers.CharField(required=False),
                     "summary": serializers.JSONField(required=False),
                     "attempt_id": serializers.CharField(required=False),
+                    "score": serializers.FloatField(required=False),
+                    "total": serializers.IntegerField(required=False),
                 },
             )
         },
@@ -341,12 +518,12 @@ class LessonView(APIView):
         description="Processes a submission for a lesson. For JUDGE lessons, it evaluates code in a sandbox. For QUIZ lessons, it grades the provided answers. If the submission passes, the lesson is marked as completed.",
     )
     def post(self, request, course_slug=None, lesson_slug=None):
-        course = get_object_or_404(Course, slug=course_slug)
+        route = course_cache.resolve_lesson(course_slug, lesson_slug)
         lesson = get_object_or_404(
-            Lesson.objects.select_related("problem", "quiz"),
-            course=course,
-            slug=lesson_slug,
+            Lesson.objects.select_related("course", "problem", "quiz", "next_lesson"),
+            pk=route.lesson_id,
         )
+        course = lesson.course
 
         if lesson.type == LessonType.JUDGE:
             return self.handle_judge(request, course, lesson)
@@ -376,13 +553,13 @@ class LessonView(APIView):
         ser = SubmitSer(data=request.data)
         ser.is_valid(raise_exception=True)
 
-        lang = get_object_or_404(Language, key=ser.validated_data["language"])
+        # Languages and allow-lists come from the in-process judge cache.
+        lang = judge_cache.get_language(ser.validated_data["language"])
+        if lang is None:
+            raise Http404("No Language matches the given query.")
         problem = lesson.problem
 
-        if (
-            problem.allowed_languages.exists()
-            and not problem.allowed_languages.filter(id=lang.id).exists()
-        ):
+        if not judge_cache.is_language_allowed(problem.id, lang):
             return Response(
                 {"language": ["This language is not allowed for this problem."]},
                 status=status.HTTP_400_BAD_REQUEST,
@@ -446,41 +623,28 @@ class LessonView(APIView):
 
         answers_data = ser.validated_data["answers"]
 
-        # Fetch questions and choices
+        # Grade against the quiz's cached answer key; no per-question queries.
         quiz = lesson.quiz
-        questions_map = {
-            str(q.id): q for q in quiz.questions.prefetch_related("choices").all()
+        selections = {
+            str(ans["question"]): [str(c) for c in ans["selected_choice_ids"]]
+            for ans in answers_data
         }
-
-        total_questions = len(questions_map)
-        correct_count = 0
-
-        # Create a map of user answers for easier lookup
-        user_answers_map = {
-            str(ans["question"]): str(ans["selected_choice_id"]) for ans in answers_data
-        }
-
-        for q_id, question in questions_map.items():
-            # Get the correct answer ID (there should be exactly one)
-            correct_choice = question.choices.filter(is_answer=True).first()
-            if not correct_choice:
-                logger.warning(
-                    f"Question {q_id} in quiz {quiz.id} has no correct answer set."
-                )
-                continue
-
-            correct_choice_id = str(correct_choice.id)
-            user_selected_id = user_answers_map.get(q_id)
-
-            # Check if user selection matches correct choice
-            if user_selected_id and user_selected_id == correct_choice_id:
-                correct_count += 1
+        answer_key = grading.get_answer_key(quiz.id)
+        grade = grading.grade(answer_key, selections, quiz.partial_credit)
+        for q_id in grade.unanswerable:
+            logger.warning(
+                f"Question {q_id} in quiz {quiz.id} has no correct answer set."
+            )
 
         # Determine pass/fail (Require 100% correctness for now, or could use threshold)
-        passed = (correct_count == total_questions) and (total_questions > 0)
+        passed = (grade.correct == grade.total) and (grade.total > 0)
 
         logger.info(
-            f"Quiz for lesson {lesson.id} passed: {passed} ({correct_count}/{total_questions})"
+            f"Quiz for lesson {lesson.id} passed: {passed} ({grade.correct}/{grade.total})"
+        )
+
+        attempt_id = attempts.record_attempt(
+            request.user, quiz.id, lesson.id, grade, selections, passed
         )
 
         if passed:
@@ -493,6 +657,9 @@ class LessonView(APIView):
                 "passed": passed,
                 "progress": ProgressLiteSer(progress_obj).data,
                 "next_url": next_url,
+                "attempt_id": str(attempt_id),
+                "score": grade.score,
+                "total": grade.total,
             },
             status=status.HTTP_201_CREATED,
         )
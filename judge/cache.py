@@ -0,0 +1,49 @@
+from django.conf import settings
+from common.cache import VersionedLRUCache, bump_version_on_commit
+from .models import Language, Problem
+
+# Bumped whenever a language or a problem's allowed languages change.
+LANGUAGE_VERSION_KEY = "judge:language-version"
+
+_languages = VersionedLRUCache(
+    LANGUAGE_VERSION_KEY,
+    maxsize=getattr(settings, "JUDGE_LANGUAGE_CACHE_SIZE", 4096),
+    ttl=getattr(settings, "JUDGE_LANGUAGE_CACHE_TIMEOUT", 10 * 60),
+)
+
+
+def get_languages():
+    """Returns {key: Language} for every language, cached in process."""
+    return _languages.get_or_set(
+        "languages", lambda: {lang.key: lang for lang in Language.objects.all()}
+    )
+
+
+def get_language(key):
+    """Returns the Language with `key`, or None."""
+    return get_languages().get(key)
+
+
+def get_allowed_language_ids(problem_id):
+    """
+    Returns the ids of the languages a problem accepts, cached in process.
+    An empty set means every language is allowed.
+    """
+    return _languages.get_or_set(
+        ("allowed", problem_id),
+        lambda: frozenset(
+            Problem.allowed_languages.through.objects.filter(
+                problem_id=problem_id
+            ).values_list("language_id", flat=True)
+        ),
+    )
+
+
+def is_language_allowed(problem_id, language):
+    allowed = get_allowed_language_ids(problem_id)
+    return not allowed or language.id in allowed
+
+
+def invalidate_languages():
+    """Drops every process's cached languages and allow-lists, now and on commit."""
+    bump_version_on_commit(LANGUAGE_VERSION_KEY)
@@ -0,0 +1,14 @@
+import django_filters
+from .models import Submission
+
+
+class SubmissionFilter(django_filters.FilterSet):
+    """
+    Filters a user's submission history by problem slug and status.
+    """
+
+    problem = django_filters.CharFilter(field_name="problem__slug")
+
+    class Meta:
+        model = Submission
+        fields = ["problem", "status"]
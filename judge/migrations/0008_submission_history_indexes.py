@@ -0,0 +1,27 @@
+# Generated by Django 5.2.18 on 2026-10-19 11:43
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('judge', '0007_remove_language_version'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='submission',
+            name='judge_submi_user_id_9d8d20_idx',
+        ),
+        migrations.AddIndex(
+            model_name='submission',
+            index=models.Index(fields=['user', 'problem', '-created_at'], name='judge_submi_user_id_138dc8_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='submission',
+            index=models.Index(fields=['user', '-created_at'], name='judge_submi_user_id_07b851_idx'),
+        ),
+    ]
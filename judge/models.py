@@ -66,7 +66,9 @@ class Submission(UUIDModel, TimeStamped):
     class Meta:
         ordering = ("-created_at",)
         indexes = [
-            models.Index(fields=("user", "problem")),
+            # Latest-first history per user and problem, and per user
+            models.Index(fields=("user", "problem", "-created_at")),
+            models.Index(fields=("user", "-created_at")),
             models.Index(fields=("problem", "status")),
         ]
 
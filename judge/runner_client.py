@@ -29,6 +29,23 @@ LANGUAGE_CONFIG: Dict[str, Dict[str, Any]] = {
 }
 
 
+def sandbox_images() -> Dict[str, bool]:
+    """Reports which sandbox images are present on this host."""
+    images = {}
+    for cfg in LANGUAGE_CONFIG.values():
+        try:
+            result = subprocess.run(
+                [DOCKER_BIN, "image", "inspect", cfg["image"]],
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.DEVNULL,
+                timeout=10,
+            )
+            images[cfg["image"]] = result.returncode == 0
+        except (OSError, subprocess.TimeoutExpired):
+            images[cfg["image"]] = False
+    return images
+
+
 class DockerSandbox:
     def __init__(self, language: Language, code: str, memory_limit_mb: int):
         self.language = language
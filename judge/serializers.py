@@ -1,5 +1,5 @@
 from rest_framework import serializers
-from .models import Language, TestCase
+from .models import Language, Submission, TestCase
 
 
 class LanguageSer(serializers.ModelSerializer):
@@ -22,3 +22,51 @@ class SubmitSer(serializers.Serializer):
         if not value.strip():
             raise serializers.ValidationError("Code cannot be blank.")
         return value
+
+
+class SubmissionHistorySer(serializers.ModelSerializer):
+    """
+    A lightweight submission row. `code` and `summary` are only included
+    when listed in the `include` context entry.
+    """
+
+    problem = serializers.SlugRelatedField(slug_field="slug", read_only=True)
+    language = serializers.SlugRelatedField(slug_field="key", read_only=True)
+
+    class Meta:
+        model = Submission
+        fields = (
+            "id",
+            "problem",
+            "language",
+            "status",
+            "created_at",
+            "code",
+            "summary",
+        )
+
+    def get_fields(self):
+        fields = super().get_fields()
+        include = self.context.get("include", ())
+        for name in ("code", "summary"):
+            if name not in include:
+                fields.pop(name)
+        return fields
+
+
+class SubmissionDetailSer(serializers.ModelSerializer):
+    problem = serializers.SlugRelatedField(slug_field="slug", read_only=True)
+    language = serializers.SlugRelatedField(slug_field="key", read_only=True)
+
+    class Meta:
+        model = Submission
+        fields = (
+            "id",
+            "problem",
+            "language",
+            "status",
+            "code",
+            "summary",
+            "created_at",
+            "updated_at",
+        )
@@ -0,0 +1,17 @@
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import receiver
+from .cache import invalidate_languages
+from .models import Language, Problem
+
+
+@receiver(post_save, sender=Language)
+@receiver(post_delete, sender=Language)
+@receiver(post_delete, sender=Problem)
+def invalidate_languages_on_change(sender, **kwargs):
+    invalidate_languages()
+
+
+@receiver(m2m_changed, sender=Problem.allowed_languages.through)
+def invalidate_languages_on_allow_list_change(sender, action, **kwargs):
+    if action in ("post_add", "post_remove", "post_clear"):
+        invalidate_languages()
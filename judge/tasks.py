@@ -1,6 +1,7 @@
 from config.celery import app
+from common.health import record_worker_heartbeat
 from .models import Submission
-from .runner_client import run_in_sandbox
+from .runner_client import run_in_sandbox, sandbox_images
 
 
 @app.task(bind=True, acks_late=True)
@@ -11,8 +12,14 @@ def run_submission(self, submission_id):
     if sub.status != "queued":
         return
     sub.status = "running"
-    sub.save(update_fields=["status"])
+    sub.save(update_fields=["status", "updated_at"])
     result = run_in_sandbox(sub)
     sub.status = result["final_status"]
     sub.summary = result
-    sub.save(update_fields=["status", "summary"])
+    sub.save(update_fields=["status", "summary", "updated_at"])
+
+
+@app.task(expires=30)
+def worker_heartbeat():
+    """Publishes this worker's liveness and sandbox images. Run periodically."""
+    record_worker_heartbeat(sandbox_images())
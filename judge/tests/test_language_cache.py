@@ -0,0 +1,47 @@
+import pytest
+from judge import cache as judge_cache
+from judge.models import Language, Problem
+
+
+@pytest.mark.django_db
+def test_language_lookups_are_served_from_memory(
+    lang_python, problem_sum, django_assert_num_queries
+):
+    judge_cache.get_language("python")
+    judge_cache.is_language_allowed(problem_sum.id, lang_python)
+
+    with django_assert_num_queries(0):
+        assert judge_cache.get_language("python") == lang_python
+        assert judge_cache.get_language("cobol") is None
+        assert judge_cache.is_language_allowed(problem_sum.id, lang_python)
+
+
+@pytest.mark.django_db
+def test_allow_list_follows_m2m_changes(lang_python, problem_sum):
+    cpp = Language.objects.create(key="cpp")
+    assert judge_cache.get_language("cpp") == cpp
+    assert not judge_cache.is_language_allowed(problem_sum.id, cpp)
+
+    problem_sum.allowed_languages.add(cpp)
+    assert judge_cache.is_language_allowed(problem_sum.id, cpp)
+
+    problem_sum.allowed_languages.clear()
+    assert judge_cache.is_language_allowed(problem_sum.id, cpp)
+
+
+@pytest.mark.django_db
+def test_problem_without_allow_list_accepts_any_language(lang_python):
+    problem = Problem.objects.create(title="Open", slug="open")
+    assert judge_cache.is_language_allowed(problem.id, lang_python)
+
+
+@pytest.mark.django_db
+def test_languages_cached_before_commit_are_dropped_on_commit(
+    lang_python, django_capture_on_commit_callbacks
+):
+    with django_capture_on_commit_callbacks(execute=True):
+        Language.objects.create(key="cpp")
+        # A concurrent reader caches the pre-commit language list
+        judge_cache._languages.get_or_set("languages", lambda: {"stale": None})
+
+    assert "stale" not in judge_cache.get_languages()
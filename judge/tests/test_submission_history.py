@@ -0,0 +1,51 @@
+import pytest
+from judge.models import Problem, Submission
+
+
+@pytest.fixture
+def history(user_student, problem_sum, lang_python):
+    other = Problem.objects.create(title="Other", slug="other")
+    return [
+        Submission.objects.create(
+            user=user_student,
+            problem=problem_sum if i % 2 else other,
+            language=lang_python,
+            code=f"print({i})",
+            summary={"run": i},
+        )
+        for i in range(5)
+    ]
+
+
+@pytest.mark.django_db
+def test_submission_history_is_lightweight_and_newest_first(
+    api_client, user_student, history
+):
+    api_client.force_authenticate(user=user_student)
+
+    resp = api_client.get("/api/v1/submissions/?problem=sum-two")
+
+    assert resp.status_code == 200
+    rows = resp.data["results"]
+    assert [row["id"] for row in rows] == [str(history[3].id), str(history[1].id)]
+    assert rows[0]["problem"] == "sum-two"
+    assert rows[0]["language"] == "python"
+    assert "code" not in rows[0] and "summary" not in rows[0]
+
+    resp = api_client.get("/api/v1/submissions/?include=summary&limit=2")
+    assert [row["summary"] for row in resp.data["results"]] == [{"run": 4}, {"run": 3}]
+    assert resp.data["next"]
+
+
+@pytest.mark.django_db
+def test_submission_detail_is_owner_only(api_client, user_student, history):
+    other = type(user_student).objects.create_user(username="other", password="x")
+    url = f"/api/v1/submissions/{history[0].id}/"
+
+    api_client.force_authenticate(user=user_student)
+    resp = api_client.get(url)
+    assert resp.status_code == 200
+    assert resp.data["code"] == "print(0)"
+
+    api_client.force_authenticate(user=other)
+    assert api_client.get(url).status_code == 404
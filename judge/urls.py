@@ -0,0 +1,15 @@
+from django.urls import path
+from .views import SubmissionViewSet
+
+urlpatterns = [
+    path(
+        "submissions/",
+        SubmissionViewSet.as_view({"get": "list"}),
+        name="submission-list",
+    ),
+    path(
+        "submissions/<uuid:pk>/",
+        SubmissionViewSet.as_view({"get": "retrieve"}),
+        name="submission-detail",
+    ),
+]
@@ -0,0 +1,69 @@
+from django_filters.rest_framework import DjangoFilterBackend
+from drf_spectacular.types import OpenApiTypes
+from drf_spectacular.utils import OpenApiParameter, extend_schema
+from rest_framework import mixins, permissions, viewsets
+from common.pagination import KeysetPagination
+from .filters import SubmissionFilter
+from .models import Submission
+from .serializers import SubmissionDetailSer, SubmissionHistorySer
+
+HISTORY_FIELDS = ("code", "summary")
+
+
+class SubmissionViewSet(
+    mixins.ListModelMixin, mixins.RetrieveModelMixin, viewsets.GenericViewSet
+):
+    queryset = Submission.objects.all()
+    permission_classes = [permissions.IsAuthenticated]
+    filter_backends = [DjangoFilterBackend]
+    filterset_class = SubmissionFilter
+    pagination_class = KeysetPagination
+    keyset_ordering = "-created_at"
+
+    def get_queryset(self):
+        qs = self.queryset.filter(user=self.request.user).select_related(
+            "problem", "language"
+        )
+        if self.action == "list":
+            # Large columns are only read when asked for.
+            qs = qs.defer(
+                *(name for name in HISTORY_FIELDS if name not in self.get_include())
+            )
+        return qs
+
+    def get_serializer_class(self):
+        return (
+            SubmissionDetailSer if self.action == "retrieve" else SubmissionHistorySer
+        )
+
+    def get_serializer_context(self):
+        context = super().get_serializer_context()
+        context["include"] = self.get_include()
+        return context
+
+    def get_include(self):
+        requested = self.request.query_params.get("include", "")
+        return {name for name in requested.split(",") if name in HISTORY_FIELDS}
+
+    @extend_schema(
+        tags=["Submissions"],
+        parameters=[
+            OpenApiParameter(
+                "include",
+                OpenApiTypes.STR,
+                description="Comma-separated extra fields: code, summary.",
+            )
+        ],
+        summary="List my submissions",
+        description="Returns the authenticated user's submissions, newest first, optionally filtered by problem slug or status. Rows omit `code` and `summary` unless requested through `include`.",
+    )
+    def list(self, request, *args, **kwargs):
+        return super().list(request, *args, **kwargs)
+
+    @extend_schema(
+        tags=["Submissions"],
+        summary="Retrieve a submission",
+        description="Returns one of the authenticated user's submissions with its code and judge summary.",
+    )
+    def retrieve(self, request, *args, **kwargs):
+        return super().retrieve(request, *args, **kwargs)
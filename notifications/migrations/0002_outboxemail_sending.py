@@ -0,0 +1,26 @@
+# Generated by Django 5.2.18 on 2026-10-19 12:12
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('notifications', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.RemoveConstraint(
+            model_name='outboxemail',
+            name='outbox_email_pending_dedup',
+        ),
+        migrations.AlterField(
+            model_name='outboxemail',
+            name='status',
+            field=models.CharField(choices=[('pending', 'Pending'), ('sending', 'Sending'), ('sent', 'Sent'), ('failed', 'Failed')], default='pending', max_length=10),
+        ),
+        migrations.AddConstraint(
+            model_name='outboxemail',
+            constraint=models.UniqueConstraint(condition=models.Q(('status__in', ['pending', 'sending']), models.Q(('dedup_key', ''), _negated=True)), fields=('to_email', 'dedup_key'), name='outbox_email_pending_dedup'),
+        ),
+    ]
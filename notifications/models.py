@@ -0,0 +1,42 @@
+from django.db import models
+from django.db.models import Q
+from django.utils import timezone
+from common.enums import EmailStatus
+from common.models import UUIDModel, TimeStamped
+
+
+class OutboxEmail(UUIDModel, TimeStamped):
+    """
+    A transactional email waiting to be sent, or the record of one that was.
+    Rows are queued by notifications.outbox.queue_email() and delivered in
+    batches by the send_outbox_emails task.
+    """
+
+    to_email = models.EmailField()
+    from_email = models.CharField(max_length=254, blank=True)
+    subject = models.CharField(max_length=255)
+    body = models.TextField()
+    # Pending emails sharing a recipient and key collapse into one, including
+    # into an email claimed for sending that may still go back to pending
+    dedup_key = models.CharField(max_length=100, blank=True)
+    status = models.CharField(
+        max_length=10, choices=EmailStatus.choices, default=EmailStatus.PENDING
+    )
+    attempts = models.PositiveSmallIntegerField(default=0)
+    send_after = models.DateTimeField(default=timezone.now)
+    sent_at = models.DateTimeField(null=True, blank=True)
+    last_error = models.TextField(blank=True)
+
+    class Meta:
+        indexes = [models.Index(fields=("status", "send_after"))]
+        constraints = [
+            models.UniqueConstraint(
+                fields=("to_email", "dedup_key"),
+                condition=Q(status__in=[EmailStatus.PENDING, EmailStatus.SENDING])
+                & ~Q(dedup_key=""),
+                name="outbox_email_pending_dedup",
+            )
+        ]
+
+    def __str__(self):
+        return f"{self.subject} -> {self.to_email}"
@@ -0,0 +1,164 @@
+from datetime import timedelta
+from django.conf import settings
+from django.core.mail import EmailMessage, get_connection
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+from common.enums import EmailStatus
+from .models import OutboxEmail
+
+
+def queue_email(to_email, subject, body, from_email=None, dedup_key=""):
+    """
+    Records an email for delivery and schedules a send once the surrounding
+    transaction commits. A new email supersedes a pending one with the same
+    recipient and `dedup_key`: that row takes the new content and is due
+    immediately, with its attempts reset. An email already being sent absorbs
+    the new one. Returns True if the new content was queued.
+    """
+    from .tasks import send_outbox_emails
+
+    content = {
+        "from_email": from_email or "",
+        "subject": subject,
+        "body": body,
+    }
+    created = OutboxEmail.objects.bulk_create(
+        [OutboxEmail(to_email=to_email, dedup_key=dedup_key, **content)],
+        ignore_conflicts=True,
+    )
+    # ignore_conflicts doesn't report skipped rows; check it was written
+    queued = OutboxEmail.objects.filter(pk=created[0].pk).exists()
+    if not queued and dedup_key:
+        queued = bool(
+            OutboxEmail.objects.filter(
+                to_email=to_email, dedup_key=dedup_key, status=EmailStatus.PENDING
+            ).update(
+                **content,
+                attempts=0,
+                send_after=timezone.now(),
+                last_error="",
+                updated_at=timezone.now(),
+            )
+        )
+    if queued:
+        transaction.on_commit(send_outbox_emails.delay)
+    return queued
+
+
+def retry_delay(attempts):
+    """Exponential backoff between delivery attempts, capped at an hour."""
+    return timedelta(seconds=min(30 * 2 ** (attempts - 1), 60 * 60))
+
+
+def _message(email, connection):
+    return EmailMessage(
+        subject=email.subject,
+        body=email.body,
+        from_email=email.from_email or None,
+        to=[email.to_email],
+        connection=connection,
+    )
+
+
+def _due():
+    # Claimed emails whose claim expired belong to a worker that died mid-batch
+    return OutboxEmail.objects.filter(
+        status__in=[EmailStatus.PENDING, EmailStatus.SENDING],
+        send_after__lte=timezone.now(),
+    )
+
+
+def claim_batch(batch_size):
+    """
+    Marks up to `batch_size` due emails as sending in a short transaction and
+    returns them. The claim expires after EMAIL_OUTBOX_CLAIM_TIMEOUT seconds,
+    after which another worker may pick the email up again.
+    """
+    timeout = getattr(settings, "EMAIL_OUTBOX_CLAIM_TIMEOUT", 600)
+    claimed_until = timezone.now() + timedelta(seconds=timeout)
+    with transaction.atomic():
+        emails = list(
+            _due()
+            .select_for_update(skip_locked=True)
+            .order_by("send_after")[:batch_size]
+        )
+        OutboxEmail.objects.filter(pk__in=[email.pk for email in emails]).update(
+            status=EmailStatus.SENDING,
+            attempts=F("attempts") + 1,
+            send_after=claimed_until,
+        )
+    for email in emails:
+        email.attempts += 1
+    return emails
+
+
+def _reconnect(connection):
+    try:
+        connection.close()
+        connection.open()
+    except Exception:
+        # Left closed; the next send opens a connection of its own
+        pass
+
+
+def send_batch(connection, batch_size):
+    """
+    Claims up to `batch_size` due emails and sends them over `connection`,
+    recording each result as soon as it is known. No rows are locked while
+    sending. Returns the number of emails claimed.
+    """
+    max_attempts = getattr(settings, "EMAIL_OUTBOX_MAX_ATTEMPTS", 5)
+    emails = claim_batch(batch_size)
+    for email in emails:
+        try:
+            _message(email, connection).send()
+        except Exception as exc:
+            # The SMTP session may be unusable now; don't fail the rest with it
+            _reconnect(connection)
+            result = {"last_error": f"{type(exc).__name__}: {exc}"}
+            if email.attempts >= max_attempts:
+                result["status"] = EmailStatus.FAILED
+            else:
+                result["status"] = EmailStatus.PENDING
+                result["send_after"] = timezone.now() + retry_delay(email.attempts)
+        else:
+            result = {
+                "status": EmailStatus.SENT,
+                "sent_at": timezone.now(),
+                "last_error": "",
+            }
+        OutboxEmail.objects.filter(pk=email.pk).update(**result)
+    return len(emails)
+
+
+def send_pending(batch_size=None):
+    """
+    Sends every due email in batches over a single SMTP connection.
+    Returns the number of emails processed.
+    """
+    batch_size = batch_size or getattr(settings, "EMAIL_OUTBOX_BATCH_SIZE", 100)
+    if not _due().exists():
+        return 0
+    processed = 0
+    with get_connection() as connection:
+        while True:
+            count = send_batch(connection, batch_size)
+            processed += count
+            if count < batch_size:
+                return processed
+
+
+def purge_finished(days=None):
+    """
+    Deletes sent and failed emails created more than `days` ago (default
+    EMAIL_OUTBOX_RETENTION_DAYS), so bodies such as password reset links
+    aren't kept. Returns the number of emails deleted.
+    """
+    if days is None:
+        days = getattr(settings, "EMAIL_OUTBOX_RETENTION_DAYS", 7)
+    deleted, _ = OutboxEmail.objects.filter(
+        status__in=[EmailStatus.SENT, EmailStatus.FAILED],
+        created_at__lt=timezone.now() - timedelta(days=days),
+    ).delete()
+    return deleted
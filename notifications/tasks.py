@@ -0,0 +1,14 @@
+from config.celery import app
+from .outbox import purge_finished, send_pending
+
+
+@app.task(acks_late=True)
+def send_outbox_emails():
+    """Delivers queued emails. Also run periodically to pick up retries."""
+    return send_pending()
+
+
+@app.task
+def purge_outbox_emails():
+    """Deletes sent and failed emails past the retention window."""
+    return purge_finished()
@@ -0,0 +1,193 @@
+from datetime import timedelta
+from unittest.mock import patch
+import pytest
+from django.core import mail
+from django.db import connection
+from django.utils import timezone
+from common.enums import EmailStatus
+from notifications.models import OutboxEmail
+from notifications.outbox import (
+    claim_batch,
+    purge_finished,
+    queue_email,
+    send_pending,
+)
+
+
+@pytest.mark.django_db
+def test_queue_email_dedups_pending_per_recipient():
+    assert queue_email("a@example.com", "Reset", "one", dedup_key="reset")
+    assert queue_email("a@example.com", "Reset", "two", dedup_key="reset")
+    assert queue_email("b@example.com", "Reset", "one", dedup_key="reset")
+    assert queue_email("a@example.com", "Hello", "no key")
+    assert queue_email("a@example.com", "Hello", "no key")
+
+    assert OutboxEmail.objects.count() == 4
+    # The later email superseded the pending one
+    reset = OutboxEmail.objects.get(to_email="a@example.com", dedup_key="reset")
+    assert reset.body == "two"
+
+
+@pytest.mark.django_db
+def test_queue_email_schedules_send_on_commit(django_capture_on_commit_callbacks):
+    with patch("notifications.tasks.send_outbox_emails.delay") as delay:
+        with django_capture_on_commit_callbacks(execute=True):
+            queue_email("a@example.com", "Subject", "Body")
+
+    delay.assert_called_once()
+    assert mail.outbox == []
+
+
+@pytest.mark.django_db
+def test_send_pending_delivers_batches_over_one_connection():
+    for i in range(5):
+        queue_email(f"user{i}@example.com", "Subject", "Body")
+
+    with patch(
+        "notifications.outbox.get_connection", wraps=mail.get_connection
+    ) as get_connection:
+        assert send_pending(batch_size=2) == 5
+
+    get_connection.assert_called_once()
+    assert sorted(m.to[0] for m in mail.outbox) == [
+        f"user{i}@example.com" for i in range(5)
+    ]
+    assert not OutboxEmail.objects.exclude(status=EmailStatus.SENT).exists()
+
+    # A sent email no longer blocks a new one with the same key
+    assert queue_email("user0@example.com", "Subject", "Body", dedup_key="k")
+    assert queue_email("user1@example.com", "Subject", "Body", dedup_key="k")
+
+
+@pytest.mark.django_db
+def test_send_failure_backs_off_then_gives_up(settings):
+    settings.EMAIL_OUTBOX_MAX_ATTEMPTS = 2
+    queue_email("a@example.com", "Subject", "Body")
+
+    with patch("notifications.outbox.EmailMessage.send", side_effect=OSError("down")):
+        send_pending()
+        email = OutboxEmail.objects.get()
+        assert email.status == EmailStatus.PENDING
+        assert email.attempts == 1
+        assert email.send_after > timezone.now()
+        assert "down" in email.last_error
+
+        # Not due yet
+        assert send_pending() == 0
+
+        OutboxEmail.objects.update(send_after=timezone.now())
+        send_pending()
+
+    email.refresh_from_db()
+    assert email.status == EmailStatus.FAILED
+    assert email.attempts == 2
+
+
+@pytest.mark.django_db
+def test_forgot_password_queues_reset_email(api_client, user):
+    for _ in range(2):
+        resp = api_client.post(
+            "/api/v1/password/forgot/", {"email": user.email}, format="json"
+        )
+        assert resp.status_code == 200
+
+    email = OutboxEmail.objects.get()
+    assert email.to_email == user.email
+    assert "reset" in email.body
+    assert mail.outbox == []
+
+
+@pytest.mark.django_db(transaction=True)
+def test_emails_are_claimed_before_sending_outside_a_transaction():
+    with patch("notifications.tasks.send_outbox_emails.delay"):
+        queue_email("a@example.com", "Subject", "Body")
+    seen = []
+
+    def send(message):
+        email = OutboxEmail.objects.get()
+        seen.append((email.status, email.attempts, connection.in_atomic_block))
+        return 1
+
+    with patch("notifications.outbox.EmailMessage.send", autospec=True) as mock:
+        mock.side_effect = send
+        assert send_pending() == 1
+
+    assert seen == [(EmailStatus.SENDING, 1, False)]
+    assert OutboxEmail.objects.get().status == EmailStatus.SENT
+
+
+@pytest.mark.django_db
+def test_expired_claims_are_picked_up_again():
+    queue_email("a@example.com", "Subject", "Body", dedup_key="k")
+    claimed = claim_batch(10)
+    assert [e.status for e in OutboxEmail.objects.all()] == [EmailStatus.SENDING]
+
+    # A claimed email still absorbs duplicates, and isn't due until it expires
+    assert not queue_email("a@example.com", "Subject", "Body", dedup_key="k")
+    assert send_pending() == 0
+
+    OutboxEmail.objects.update(send_after=timezone.now())
+    assert send_pending() == 1
+    email = OutboxEmail.objects.get(pk=claimed[0].pk)
+    assert email.status == EmailStatus.SENT
+    assert email.attempts == 2
+
+
+@pytest.mark.django_db
+def test_new_email_supersedes_one_in_backoff():
+    queue_email("a@example.com", "Reset", "old link", dedup_key="reset")
+    with patch("notifications.outbox.EmailMessage.send", side_effect=OSError("down")):
+        send_pending()
+    assert OutboxEmail.objects.get().send_after > timezone.now()
+
+    assert queue_email("a@example.com", "Reset", "new link", dedup_key="reset")
+
+    email = OutboxEmail.objects.get()
+    assert (email.body, email.attempts, email.last_error) == ("new link", 0, "")
+    assert send_pending() == 1
+    assert [m.body for m in mail.outbox] == ["new link"]
+
+
+@pytest.mark.django_db
+def test_send_failure_reopens_the_connection_for_the_rest_of_the_batch():
+    for i in range(3):
+        queue_email(f"user{i}@example.com", "Subject", "Body")
+    connection = mail.get_connection()
+
+    with (
+        patch("notifications.outbox.get_connection", return_value=connection),
+        patch.object(connection, "open", wraps=connection.open) as reopen,
+        patch(
+            "notifications.outbox.EmailMessage.send",
+            side_effect=[OSError("reset by peer"), 1, 1],
+        ),
+    ):
+        assert send_pending() == 3
+
+    # Opened once for the batch and once after the failure
+    assert reopen.call_count == 2
+    statuses = sorted(OutboxEmail.objects.values_list("status", flat=True))
+    assert statuses == [EmailStatus.PENDING, EmailStatus.SENT, EmailStatus.SENT]
+
+
+@pytest.mark.django_db
+def test_purge_finished_deletes_old_sent_and_failed_emails():
+    for status in (EmailStatus.SENT, EmailStatus.FAILED, EmailStatus.PENDING):
+        queue_email(f"{status}@example.com", "Subject", "Body")
+        OutboxEmail.objects.filter(to_email=f"{status}@example.com").update(
+            status=status
+        )
+    queue_email("recent@example.com", "Subject", "Body")
+    OutboxEmail.objects.filter(to_email="recent@example.com").update(
+        status=EmailStatus.SENT
+    )
+    OutboxEmail.objects.exclude(to_email="recent@example.com").update(
+        created_at=timezone.now() - timedelta(days=8)
+    )
+
+    assert purge_finished() == 2
+
+    assert sorted(OutboxEmail.objects.values_list("to_email", flat=True)) == [
+        "pending@example.com",
+        "recent@example.com",
+    ]
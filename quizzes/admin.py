@@ -1,6 +1,7 @@
 from django.contrib import admin
 from django import forms
-from .models import Quiz, Question, Choice
+from common.enums import QuestionType
+from .models import Quiz, Question, Choice, QuizAnswer, QuizAttempt
 
 
 class ChoiceInlineFormSet(forms.BaseInlineFormSet):
@@ -15,7 +16,7 @@ class ChoiceInlineFormSet(forms.BaseInlineFormSet):
             ):
                 is_answer_count += 1
 
-        if is_answer_count > 1:
+        if is_answer_count > 1 and self.instance.type == QuestionType.SINGLE:
             raise forms.ValidationError(
                 "Only one choice can be marked as the correct answer."
             )
@@ -29,8 +30,8 @@ class ChoiceInline(admin.TabularInline):
 
 @admin.register(Question)
 class QuestionAdmin(admin.ModelAdmin):
-    list_display = ("text", "quiz")
-    list_filter = ("quiz",)
+    list_display = ("text", "quiz", "type")
+    list_filter = ("quiz", "type")
     search_fields = ("text",)
     inlines = [ChoiceInline]
 
@@ -44,6 +45,37 @@ class QuestionInline(admin.StackedInline):
 
 @admin.register(Quiz)
 class QuizAdmin(admin.ModelAdmin):
-    list_display = ("title", "id", "created_at")
+    list_display = ("title", "id", "partial_credit", "created_at")
     search_fields = ("title",)
     inlines = [QuestionInline]
+
+
+class QuizAnswerInline(admin.TabularInline):
+    model = QuizAnswer
+    extra = 0
+    can_delete = False
+    readonly_fields = ("question", "selected_choices", "is_correct")
+
+
+@admin.register(QuizAttempt)
+class QuizAttemptAdmin(admin.ModelAdmin):
+    list_display = (
+        "quiz",
+        "user",
+        "correct_count",
+        "total_questions",
+        "passed",
+        "submitted_at",
+    )
+    list_filter = ("passed", "quiz")
+    search_fields = ("user__username", "quiz__title")
+    readonly_fields = (
+        "user",
+        "quiz",
+        "lesson",
+        "correct_count",
+        "total_questions",
+        "passed",
+        "submitted_at",
+    )
+    inlines = [QuizAnswerInline]
@@ -0,0 +1,12 @@
+from django.apps import AppConfig
+
+
+class QuizzesConfig(AppConfig):
+    default_auto_field = "django.db.models.BigAutoField"
+    name = "quizzes"
+
+    def ready(self):
+        from . import signals  # noqa
+        from .attempts import attempt_buffer
+
+        attempt_buffer.check_backend()
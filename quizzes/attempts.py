@@ -0,0 +1,119 @@
+import uuid
+from django.conf import settings
+from django.utils import timezone
+from common.cache import WriteBehindBuffer
+from .models import Choice, Question, Quiz, QuizAnswer, QuizAttempt
+
+attempt_buffer = WriteBehindBuffer("quizzes:attempt-buffer")
+
+
+def _flush_batch_size():
+    return getattr(settings, "QUIZ_ATTEMPT_FLUSH_BATCH", 500)
+
+
+def record_attempt(user, quiz_id, lesson_id, grade, selections, passed):
+    """
+    Queues a graded attempt for persistence and returns its id. The attempt
+    is written by the flush_quiz_attempts task, not in the request.
+    """
+    from .tasks import flush_quiz_attempts
+
+    attempt_id = uuid.uuid4()
+    pending = attempt_buffer.append(
+        {
+            "id": attempt_id,
+            "user_id": user.pk,
+            "quiz_id": quiz_id,
+            "lesson_id": lesson_id,
+            "correct_count": grade.correct,
+            "total_questions": grade.total,
+            "score": grade.score,
+            "passed": passed,
+            "submitted_at": timezone.now(),
+            "answers": [
+                (question_id, list(selections.get(question_id, ())), is_correct)
+                for question_id, is_correct in grade.results.items()
+            ],
+        }
+    )
+    if pending >= _flush_batch_size():
+        flush_quiz_attempts.delay()
+    return attempt_id
+
+
+def save_attempts(items):
+    """
+    Persists buffered attempts with bulk inserts. Attempts whose user or quiz
+    has since been deleted are dropped; re-delivered attempts are ignored.
+    """
+    from accounts.models import User
+    from courses.models import Lesson
+
+    def existing(model, ids):
+        return {
+            str(pk)
+            for pk in model.objects.filter(pk__in=ids).values_list("pk", flat=True)
+        }
+
+    users = existing(User, {item["user_id"] for item in items})
+    quizzes = existing(Quiz, {item["quiz_id"] for item in items})
+    lessons = existing(Lesson, {item["lesson_id"] for item in items} - {None})
+    answers = [answer for item in items for answer in item["answers"]]
+    questions = existing(Question, {question_id for question_id, _, _ in answers})
+    choices = existing(
+        Choice, {choice_id for _, choice_ids, _ in answers for choice_id in choice_ids}
+    )
+
+    attempts = []
+    attempt_answers = []
+    selected_choices = []
+    for item in items:
+        if str(item["user_id"]) not in users or str(item["quiz_id"]) not in quizzes:
+            continue
+        lesson_id = item["lesson_id"]
+        attempts.append(
+            QuizAttempt(
+                id=item["id"],
+                user_id=item["user_id"],
+                quiz_id=item["quiz_id"],
+                lesson_id=lesson_id if str(lesson_id) in lessons else None,
+                correct_count=item["correct_count"],
+                total_questions=item["total_questions"],
+                score=item["score"],
+                passed=item["passed"],
+                submitted_at=item["submitted_at"],
+            )
+        )
+        for question_id, choice_ids, is_correct in item["answers"]:
+            if question_id not in questions:
+                continue
+            # Derived ids keep a redelivered batch from duplicating answers.
+            answer_id = uuid.uuid5(item["id"], question_id)
+            attempt_answers.append(
+                QuizAnswer(
+                    id=answer_id,
+                    attempt_id=item["id"],
+                    question_id=question_id,
+                    is_correct=is_correct,
+                )
+            )
+            selected_choices += [
+                QuizAnswer.selected_choices.through(
+                    quizanswer_id=answer_id, choice_id=choice_id
+                )
+                for choice_id in choice_ids
+                if choice_id in choices
+            ]
+    QuizAttempt.objects.bulk_create(attempts, ignore_conflicts=True)
+    QuizAnswer.objects.bulk_create(
+        attempt_answers, batch_size=_flush_batch_size(), ignore_conflicts=True
+    )
+    QuizAnswer.selected_choices.through.objects.bulk_create(
+        selected_choices, batch_size=_flush_batch_size(), ignore_conflicts=True
+    )
+    return len(attempts)
+
+
+def flush_attempts():
+    """Persists every buffered attempt. Returns how many were drained."""
+    return attempt_buffer.drain(save_attempts, batch_size=_flush_batch_size())
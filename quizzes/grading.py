@@ -0,0 +1,137 @@
+from typing import NamedTuple
+from django.conf import settings
+from common.cache import bump_version_on_commit, content_cache, versioned_key
+from common.enums import QuestionType
+from .models import Choice, Question
+
+# Bump when the cached answer key layout changes.
+ANSWER_KEY_FORMAT = 2
+
+
+class QuestionKey(NamedTuple):
+    """
+    A question's answer set as a bitmask: each choice owns one bit in
+    `choice_bits`, and `correct_mask` has the bits of the correct choices.
+    """
+
+    type: str
+    choice_bits: dict
+    correct_mask: int
+
+
+class Grade(NamedTuple):
+    correct: int
+    score: float
+    total: int
+    # {question_id: answered fully correctly}
+    results: dict
+    # Questions with no correct choice configured
+    unanswerable: list
+
+
+def _answer_key_version_key(quiz_id):
+    return f"quiz-answer-key-version:{quiz_id}"
+
+
+def _answer_key_cache_key(quiz_id):
+    return versioned_key(
+        "quiz-answer-key", _answer_key_version_key(quiz_id), quiz_id, ANSWER_KEY_FORMAT
+    )
+
+
+def build_answer_key(quiz_id):
+    """Returns {question_id: QuestionKey} for a quiz, keyed by string ids."""
+    questions = Question.objects.filter(quiz_id=quiz_id).values_list("id", "type")
+    choices = (
+        Choice.objects.filter(question__quiz_id=quiz_id)
+        .order_by("question_id", "id")
+        .values_list("question_id", "id", "is_answer")
+    )
+    bits = {str(question_id): {} for question_id, _ in questions}
+    masks = dict.fromkeys(bits, 0)
+    for question_id, choice_id, is_answer in choices:
+        question_bits = bits[str(question_id)]
+        bit = 1 << len(question_bits)
+        question_bits[str(choice_id)] = bit
+        if is_answer:
+            masks[str(question_id)] |= bit
+    return {
+        str(question_id): QuestionKey(
+            type, bits[str(question_id)], masks[str(question_id)]
+        )
+        for question_id, type in questions
+    }
+
+
+def get_answer_key(quiz_id):
+    """
+    Returns the cached answer key of a quiz, building it on a miss. The key
+    is versioned before the rows are read, so a key built from rows an edit
+    is replacing is stored under the version that edit bumps away from.
+    """
+    cache_key = _answer_key_cache_key(quiz_id)
+    answer_key = content_cache.get(cache_key)
+    if answer_key is None:
+        answer_key = build_answer_key(quiz_id)
+        timeout = getattr(settings, "QUIZ_ANSWER_KEY_CACHE_TIMEOUT", 24 * 60 * 60)
+        content_cache.set(cache_key, answer_key, timeout=timeout)
+    return answer_key
+
+
+def invalidate_answer_key(quiz_id):
+    """Moves a quiz's answer key to a new version now and on commit."""
+    bump_version_on_commit(_answer_key_version_key(quiz_id))
+
+
+def selection_mask(question_key, choice_ids):
+    """
+    Folds selected choice ids into a bitmask. A choice that doesn't belong
+    to the question sets a bit outside the question's range, so it can only
+    count against the answer.
+    """
+    stray = 1 << len(question_key.choice_bits)
+    mask = 0
+    for choice_id in choice_ids:
+        mask |= question_key.choice_bits.get(choice_id, stray)
+    return mask
+
+
+def question_score(question_key, mask, partial_credit=False):
+    """
+    Scores one question between 0 and 1. Exact matches score 1. With partial
+    credit, a multi-select answer scores (right picks - wrong picks) over the
+    number of correct choices, floored at 0.
+    """
+    correct_mask = question_key.correct_mask
+    if mask == correct_mask:
+        return 1.0
+    if not partial_credit or question_key.type != QuestionType.MULTI:
+        return 0.0
+    hits = (mask & correct_mask).bit_count()
+    misses = (mask & ~correct_mask).bit_count()
+    return max(hits - misses, 0) / correct_mask.bit_count()
+
+
+def grade(answer_key, selections, partial_credit=False):
+    """
+    Grades `selections` ({question_id: [selected_choice_id, ...]}) against
+    an answer key.
+    """
+    results = {}
+    score = 0.0
+    unanswerable = []
+    for question_id, question_key in answer_key.items():
+        if not question_key.correct_mask:
+            unanswerable.append(question_id)
+            results[question_id] = False
+            continue
+        mask = selection_mask(question_key, selections.get(question_id, ()))
+        results[question_id] = mask == question_key.correct_mask
+        score += question_score(question_key, mask, partial_credit)
+    return Grade(
+        correct=sum(results.values()),
+        score=score,
+        total=len(answer_key),
+        results=results,
+        unanswerable=unanswerable,
+    )
@@ -0,0 +1,62 @@
+# Generated by Django 5.2.18 on 2026-10-19 11:36
+
+from django.db import migrations, models
+
+
+def copy_selected_choices(apps, schema_editor):
+    QuizAnswer = apps.get_model("quizzes", "QuizAnswer")
+    QuizAttempt = apps.get_model("quizzes", "QuizAttempt")
+    Through = QuizAnswer.selected_choices.through
+    Through.objects.bulk_create(
+        [
+            Through(quizanswer_id=answer_id, choice_id=choice_id)
+            for answer_id, choice_id in QuizAnswer.objects.filter(
+                selected_choice__isnull=False
+            ).values_list("id", "selected_choice_id")
+        ]
+    )
+    QuizAttempt.objects.update(score=models.F("correct_count"))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('quizzes', '0009_quiz_attempts'),
+    ]
+
+    operations = [
+        migrations.RemoveConstraint(
+            model_name='choice',
+            name='unique_answer_per_question',
+        ),
+        migrations.AddField(
+            model_name='question',
+            name='type',
+            field=models.CharField(choices=[('single', 'Single'), ('multi', 'Multi')], default='single', max_length=10),
+        ),
+        migrations.AddField(
+            model_name='quiz',
+            name='partial_credit',
+            field=models.BooleanField(default=False),
+        ),
+        migrations.AddField(
+            model_name='quizanswer',
+            name='selected_choices',
+            field=models.ManyToManyField(blank=True, related_name='+', to='quizzes.choice'),
+        ),
+        migrations.AddField(
+            model_name='quizattempt',
+            name='score',
+            field=models.FloatField(default=0),
+        ),
+        migrations.RunPython(copy_selected_choices, migrations.RunPython.noop),
+        migrations.RemoveField(
+            model_name='quizanswer',
+            name='selected_choice',
+        ),
+        migrations.AlterField(
+            model_name='quizanswer',
+            name='selected_choices',
+            field=models.ManyToManyField(blank=True, related_name='attempt_answers', to='quizzes.choice'),
+        ),
+    ]
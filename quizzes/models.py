@@ -1,9 +1,12 @@
 from django.db import models
+from common.enums import QuestionType
 from common.models import UUIDModel, TimeStamped
 
 
 class Quiz(UUIDModel, TimeStamped):
     title = models.CharField(max_length=200, default="Untitled Quiz")
+    # Give multi-select questions fractional credit instead of all-or-nothing
+    partial_credit = models.BooleanField(default=False)
 
     def __str__(self):
         return self.title
@@ -12,6 +15,9 @@ class Quiz(UUIDModel, TimeStamped):
 class Question(UUIDModel, TimeStamped):
     quiz = models.ForeignKey(Quiz, on_delete=models.CASCADE, related_name="questions")
     text = models.TextField()
+    type = models.CharField(
+        max_length=10, choices=QuestionType.choices, default=QuestionType.SINGLE
+    )
 
 
 class Choice(UUIDModel, TimeStamped):
@@ -21,19 +27,52 @@ class Choice(UUIDModel, TimeStamped):
     text = models.CharField(max_length=500)
     is_answer = models.BooleanField(default=False)
 
-    class Meta:
-        constraints = [
-            models.UniqueConstraint(
-                fields=["question"],
-                condition=models.Q(is_answer=True),
-                name="unique_answer_per_question",
-            )
-        ]
-
     def save(self, *args, **kwargs):
-        if self.is_answer:
+        if self.is_answer and self.question.type == QuestionType.SINGLE:
             # Set all other choices for this question to not be the answer
             Choice.objects.filter(question=self.question, is_answer=True).exclude(
                 pk=self.pk
             ).update(is_answer=False)
         super().save(*args, **kwargs)
+
+
+class QuizAttempt(UUIDModel, TimeStamped):
+    """
+    A graded quiz submission. Written in batches by quizzes.attempts, so
+    `submitted_at` (grading time) can precede `created_at` (persist time).
+    """
+
+    user = models.ForeignKey(
+        "accounts.User", on_delete=models.CASCADE, related_name="quiz_attempts"
+    )
+    quiz = models.ForeignKey(Quiz, on_delete=models.CASCADE, related_name="attempts")
+    lesson = models.ForeignKey(
+        "courses.Lesson",
+        null=True,
+        blank=True,
+        on_delete=models.SET_NULL,
+        related_name="quiz_attempts",
+    )
+    correct_count = models.PositiveIntegerField()
+    total_questions = models.PositiveIntegerField()
+    passed = models.BooleanField()
+    # Equals correct_count unless the quiz gives partial credit
+    score = models.FloatField(default=0)
+    submitted_at = models.DateTimeField()
+
+    class Meta:
+        ordering = ("-submitted_at",)
+        indexes = [models.Index(fields=("user", "quiz", "-submitted_at"))]
+
+
+class QuizAnswer(UUIDModel):
+    attempt = models.ForeignKey(
+        QuizAttempt, on_delete=models.CASCADE, related_name="answers"
+    )
+    question = models.ForeignKey(
+        Question, on_delete=models.CASCADE, related_name="attempt_answers"
+    )
+    selected_choices = models.ManyToManyField(
+        Choice, blank=True, related_name="attempt_answers"
+    )
+    is_correct = models.BooleanField()
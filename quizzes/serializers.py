@@ -13,7 +13,7 @@ class QuestionSer(serializers.ModelSerializer):
 
     class Meta:
         model = Question
-        fields = ("id", "text", "choices")
+        fields = ("id", "text", "type", "choices")
 
 
 class QuizSer(serializers.ModelSerializer):
@@ -21,12 +21,30 @@ class QuizSer(serializers.ModelSerializer):
 
     class Meta:
         model = Quiz
-        fields = ("id", "questions")
+        fields = ("id", "partial_credit", "questions")
 
 
 class QuizAnswerSer(serializers.Serializer):
+    """
+    One answer: `selected_choice_ids` for multi-select questions, or the
+    single `selected_choice_id`. Validated data always carries the list.
+    """
+
     question = serializers.UUIDField()
-    selected_choice_id = serializers.UUIDField()
+    selected_choice_id = serializers.UUIDField(required=False, write_only=True)
+    selected_choice_ids = serializers.ListField(
+        child=serializers.UUIDField(), required=False, max_length=64
+    )
+
+    def validate(self, attrs):
+        single = attrs.pop("selected_choice_id", None)
+        if (single is None) == ("selected_choice_ids" not in attrs):
+            raise serializers.ValidationError(
+                "Provide exactly one of selected_choice_id or selected_choice_ids."
+            )
+        if single is not None:
+            attrs["selected_choice_ids"] = [single]
+        return attrs
 
 
 class AttemptSubmitSer(serializers.Serializer):
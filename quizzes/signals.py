@@ -0,0 +1,22 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from .grading import invalidate_answer_key
+from .models import Choice, Question
+
+
+@receiver(post_save, sender=Question)
+@receiver(post_delete, sender=Question)
+def invalidate_key_on_question_change(sender, instance, **kwargs):
+    invalidate_answer_key(instance.quiz_id)
+
+
+@receiver(post_save, sender=Choice)
+@receiver(post_delete, sender=Choice)
+def invalidate_key_on_choice_change(sender, instance, **kwargs):
+    quiz_id = (
+        Question.objects.filter(pk=instance.question_id)
+        .values_list("quiz_id", flat=True)
+        .first()
+    )
+    if quiz_id is not None:
+        invalidate_answer_key(quiz_id)
@@ -0,0 +1,8 @@
+from config.celery import app
+from .attempts import flush_attempts
+
+
+@app.task(acks_late=True)
+def flush_quiz_attempts():
+    """Persists quiz attempts buffered by record_attempt(). Run periodically."""
+    return flush_attempts()